@@ -5,11 +5,13 @@ This script demonstrates how to build an end-to-end workflow for question answer
 
 Workflow Overview:
 - Loads environment variables and API keys from a .env file.
-- Downloads and chunks a PDF from a specified URL.
-- Embeds the PDF content using Gemini embeddings and stores them in a Chroma vector database.
+- Embeds the PDF content using Gemini embeddings and stores them in a Chroma (or, with VECTOR_DB_BACKEND=numpy, an in-process NumPy) vector database.
+- Indexes the same chunks for BM25 keyword search, so questions quoting exact terms (section numbers, product codes) find them.
+- Keeps the vector database on disk. At startup a background thread checks the
+  ingestion manifest against it and only downloads and chunks the PDF (page by page) if it is missing or incomplete.
 - Defines a workflow class that:
-    - Accepts user questions.
-    - Searches the vector database for relevant information.
+    - Accepts user questions, holding them until the knowledge base is ready.
+    - Searches the knowledge base (vector and keyword rankings, fused) for relevant information.
     - Uses a Gemini-powered agent to answer questions based on the PDF content.
     - Caches answers for repeated questions.
     - Handles API quota errors with exponential backoff and retry logic.
@@ -17,13 +19,13 @@ Workflow Overview:
 - Launches an interactive Agno Playground web UI for users to ask questions about the PDF.
 """
 import os
+import sys
 import time
 from typing import  Dict
 from dotenv import load_dotenv
 from agno.agent import Agent
 from agno.models.google.gemini import Gemini
 from agno.knowledge.pdf_url import PDFUrlKnowledgeBase,PDFUrlReader
-from agno.vectordb.chroma import ChromaDb
 from agno.embedder.google import GeminiEmbedder
 from agno.playground import Playground, serve_playground_app
 from agno.run.response import RunEvent, RunResponse
@@ -32,24 +34,36 @@ from agno.utils.log import logger
 from agno.workflow.workflow import Workflow
 from google.genai.errors import ClientError  
 
+# Shared helpers from the Level5 MultiSource Application
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Level5", "MultiSource Application"))
+from utils.embedding_cache import CachedEmbedder  # noqa: E402
+from utils.hybrid_search import HybridVectorDb  # noqa: E402
+from utils.numpy_vectordb import create_vector_db  # noqa: E402
+from utils.warm_start import BackgroundKnowledgeLoader  # noqa: E402
+
 # Load environment variables from .env file
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 agno_api_key = os.getenv("AGNO_API_KEY")
 
-# Set up the embedder using Gemini
-embedder = GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY"))
+# Set up the embedder using Gemini; chunks embedded before (by any app sharing the cache) are reused
+embedder = CachedEmbedder(GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY")))
+
+# Persistent vector db, with a BM25 index next to it unless HYBRID_SEARCH=false
+vector_db = create_vector_db(os.getenv("VECTOR_DB_BACKEND", "chroma"), "doc", embedder,
+                             path=os.getenv("VECTOR_DB_PATH", "tmp/vectordb"))
+if os.getenv("HYBRID_SEARCH", "true").lower() == "true":
+    vector_db = HybridVectorDb(vector_db)
 
-# Load PDF into the vector database
-logger.info("Loading and chunking PDF into vector DB...")
 knowledge_base = PDFUrlKnowledgeBase(
     urls=["https://www.adobe.com/support/products/enterprise/knowledgecenter/media/c4611_sample_explain.pdf"],
-    vector_db=ChromaDb(collection="doc", embedder=embedder),
+    vector_db=vector_db,
     embedder=embedder,
     reader=PDFUrlReader(),
 )
-knowledge_base.load(recreate=False)
-logger.info("Knowledge base loaded successfully.")
+# Validates the stored knowledge base (ingesting only what is missing) without delaying startup
+logger.info("Loading knowledge base in the background...")
+knowledge_loader = BackgroundKnowledgeLoader(knowledge_base).start()
 
 
 class DocumentQnAWorkflow(Workflow):
@@ -61,12 +75,15 @@ class DocumentQnAWorkflow(Workflow):
         description (str): A short description of the workflow.
         cache (Dict[str, str]): A simple in-memory cache to store previously answered questions
             to avoid redundant processing.
+        knowledge_wait_seconds (float): How long a question waits for the knowledge base to
+            finish loading before it is turned away with a "still loading" message.
         question_agent (Agent): An Agent configured to answer questions using the Gemini model
             with access to the knowledge base.
     """
 
     description: str = "Process document from URL, perform OCR if needed, and answer questions."
     cache: Dict[str, str] = {}
+    knowledge_wait_seconds: float = float(os.getenv("KNOWLEDGE_WAIT_SECONDS", "10"))
 
     question_agent: Agent = Agent(
         name="Question Answering Agent",
@@ -95,6 +112,8 @@ class DocumentQnAWorkflow(Workflow):
 
         Behavior:
             - Checks if the answer exists in the cache, returns cached answer if available.
+            - Waits (up to knowledge_wait_seconds) for the knowledge base to finish loading, and says
+              so instead of answering if it is still loading or failed to load.
             - Otherwise, sends the question to the agent for processing.
             - Handles Google API quota exhaustion by retrying after a wait.
             - Logs relevant info and errors during execution.
@@ -107,6 +126,22 @@ class DocumentQnAWorkflow(Workflow):
             cached_answer = self.cache[user_question]
             return RunResponse(run_id=self.run_id, event=RunEvent.workflow_completed, content=cached_answer)
 
+        # Never answer without the document: the agent would reply with no PDF context.
+        # A load that failed (e.g. the download timed out at startup) is started again.
+        knowledge_loader.retry()
+        knowledge_loader.wait(self.knowledge_wait_seconds)
+        if knowledge_loader.status == "loading":
+            logger.warning(f"Knowledge base still loading after {self.knowledge_wait_seconds}s; question not answered.")
+            return RunResponse(run_id=self.run_id, event=RunEvent.workflow_failed,
+                               content="The knowledge base is still loading the document. "
+                                       "Please ask again in a moment.")
+        if knowledge_loader.status != "ready":
+            logger.error(f"Knowledge base failed to load ({knowledge_loader.error}); question not answered.")
+            return RunResponse(run_id=self.run_id, event=RunEvent.workflow_failed,
+                               content=f"The knowledge base failed to load the document ({knowledge_loader.error}), "
+                                       f"so the question cannot be answered from it. Loading is retried on the next "
+                                       f"question; if it keeps failing, check the logs.")
+
         try:
             logger.debug("Cache miss: processing through agent.")
             qa_response: RunResponse = self.question_agent.run(user_question)
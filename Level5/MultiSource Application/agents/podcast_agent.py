@@ -3,10 +3,16 @@ from agno.models.google import Gemini
 from agno.tools import tool
 from textwrap import dedent
 from utils.audio_utils import AudioUtilsWorkflow
+from utils.conversation_stream import team_content_stream
 from teams.podcast_team import create_podcast_team
+import os
 import json
 from agno.utils.log import logger
 
+# Stream the podcast team's script into audio synthesis (generate_podcast) instead of
+# waiting for the whole conversation before the first TTS request
+PODCAST_STREAMING = os.getenv("PODCAST_STREAMING", "true").lower() == "true"
+
 # Initialize global podcast_team and audio_workflow
 # This is necessary to ensure they are created only once and can be reused across invocations
 try:
@@ -68,10 +74,42 @@ def invoke_audio_workflow(input_data: dict) -> str:
         logger.error(f"Failed to invoke audio workflow: {str(e)}", exc_info=True)
         raise
 
+# This tool streams the podcast team's conversation straight into the audio workflow.
+@tool(show_result=True, stop_after_tool_call=True)
+def generate_podcast(topic: str) -> str:
+    """Generate a 100-word podcast conversation for the given topic and turn it into an MP3 podcast.
+    Args:
+        topic (str): The topic for the podcast (e.g., 'podcast on https://example.com').
+    Returns:
+        str: Path to the generated MP3 file.
+    """
+    logger.debug(f"Streaming podcast team with topic: {topic}")
+    try:
+        events = podcast_team.run(topic, stream=True)
+        result = audio_workflow.run_streaming(team_content_stream(events), "podcast_episode")
+        logger.debug(f"Audio workflow result: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to generate podcast: {str(e)}", exc_info=True)
+        raise
+
 # Create the podcast agent
 # This agent is designed to generate a podcast episode based on a user-provided topic.
 def podcast_agent():
     """Initialize the podcast agent."""
+    if PODCAST_STREAMING:
+        steps = dedent("""
+                2. Use `generate_podcast` with the topic to generate a 100-word conversation between two speakers labeled SPEAKER_A and SPEAKER_B and turn it into a final podcast; audio generation starts while the conversation is still being written.
+                3. Return the path to the final podcast audio file.
+        """)
+        tools = [generate_podcast]
+    else:
+        steps = dedent("""
+                2. Use `invoke_podcast_team` with the topic to generate a 100-word conversation between two speakers labeled SPEAKER_A and SPEAKER_B. Log the conversation.
+                3. Use `invoke_audio_workflow` with a dict containing 'conversation' (the generated conversation) and 'output_filename' ('podcast_episode') to parse the conversation, generate audio segments, and combine them into a final podcast. Log the audio workflow input.
+                4. Return the path to the final podcast audio file.
+        """)
+        tools = [invoke_podcast_team, invoke_audio_workflow]
     return Agent(
         name="Podcast Conversation Agent",
         model=Gemini(),
@@ -79,16 +117,10 @@ def podcast_agent():
             dedent("""
                 You are responsible for generating a short podcast based on a user-provided input, which may be a topic string or a JSON object with 'remaining_text' and 'web_urls'.
                 Step-by-step (All steps must be followed and executed in order compulsorily):
-        
-                2. Use `invoke_podcast_team` with the topic to generate a 100-word conversation between two speakers labeled SPEAKER_A and SPEAKER_B. Log the conversation.
-                3. Use `invoke_audio_workflow` with a dict containing 'conversation' (the generated conversation) and 'output_filename' ('podcast_episode') to parse the conversation, generate audio segments, and combine them into a final podcast. Log the audio workflow input.
-                4. Return the path to the final podcast audio file.
-                Log each step for debugging. Handle errors gracefully and log them.
             """)
+            + steps
+            + "Log each step for debugging. Handle errors gracefully and log them.",
         ],
-        tools=[
-            invoke_podcast_team,
-            invoke_audio_workflow
-        ],
+        tools=tools,
         debug_mode=True,
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,99 @@
+"""
+Benchmark: pooled SQLiteCacheBackend vs. the previous connect-per-call cache code.
+
+Runs a get/save/evict mix against a temporary database, single-threaded and with a
+thread pool, and prints ops/sec for both implementations.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_cache_backend.py --ops 5000 --threads 8
+"""
+import os
+import sys
+import time
+import json
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_backend import SQLiteCacheBackend  # noqa: E402
+from utils.cache_keys import canonical_cache_key  # noqa: E402
+
+TABLE = "workflow_cache"
+RESPONSE = json.dumps({"content": "x" * 2000, "audio": None})
+
+
+class LegacyCache:
+    """The cache code as it was before the pooled backend: one connection per call."""
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        conn = sqlite3.connect(db_file)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (prompt TEXT PRIMARY KEY, response TEXT, "
+                     f"timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.commit()
+        conn.close()
+
+    def get(self, prompt):
+        conn = sqlite3.connect(self.db_file)
+        row = conn.execute(f"SELECT response FROM {TABLE} WHERE prompt = ?", (prompt,)).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def save(self, prompt, response):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute(f"INSERT OR REPLACE INTO {TABLE} (prompt, response) VALUES (?, ?)", (prompt, response))
+        conn.commit()
+        conn.close()
+
+    def evict_older_than(self, cutoff):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute(f"DELETE FROM {TABLE} WHERE timestamp < ?", (cutoff.strftime("%Y-%m-%d %H:%M:%S"),))
+        conn.commit()
+        conn.close()
+
+
+def run_mix(cache, ops: int, offset: int = 0):
+    """One simulated run() per iteration: a lookup, a save and an eviction pass."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+    for i in range(ops // 3):
+        prompt = f"summarize https://example.com/doc-{(offset + i) % 500}.pdf"
+        cache.get(prompt)
+        cache.save(prompt, RESPONSE)
+        cache.evict_older_than(cutoff)
+
+
+def measure(cache, ops: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads <= 1:
+        run_mix(cache, ops)
+    else:
+        per_thread = ops // threads
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda t: run_mix(cache, per_thread, t * per_thread), range(threads)))
+    return ops / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for threads in (1, args.threads):
+            legacy = LegacyCache(os.path.join(tmp, f"legacy-{threads}.db"))
+            pooled = SQLiteCacheBackend(os.path.join(tmp, f"pooled-{threads}.db"), TABLE, key_fn=canonical_cache_key)
+            legacy_ops = measure(legacy, args.ops, threads)
+            pooled_ops = measure(pooled, args.ops, threads)
+            pooled.close()
+            print(f"threads={threads:<3} legacy={legacy_ops:>10.0f} ops/s  pooled={pooled_ops:>10.0f} ops/s  "
+                  f"speedup={pooled_ops / legacy_ops:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
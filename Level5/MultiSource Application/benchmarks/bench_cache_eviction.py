@@ -0,0 +1,86 @@
+"""
+Benchmark: eviction cost on the request path and budget enforcement.
+
+Fills a cache table with --rows entries, then compares the old per-run
+"DELETE ... WHERE timestamp < ?" (no index, full table scan) with one pass of the
+indexed CacheEvictor, and prints the evictor's stats after enforcing a row budget.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_cache_eviction.py --rows 200000 --max-rows 50000
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_backend import SQLITE_TIMESTAMP_FORMAT, SQLiteCacheBackend  # noqa: E402
+from utils.cache_eviction import CacheEvictor  # noqa: E402
+
+TABLE = "workflow_cache"
+
+
+def fill(conn: sqlite3.Connection, rows: int, with_eviction_columns: bool):
+    now = datetime.now(timezone.utc)
+    data = []
+    for i in range(rows):
+        written = (now - timedelta(minutes=i)).strftime(SQLITE_TIMESTAMP_FORMAT)
+        payload = "x" * (500 + i % 1500)
+        if with_eviction_columns:
+            data.append((f"key-{i}", f"prompt {i}", payload, written, written, len(payload)))
+        else:
+            data.append((f"key-{i}", payload, written))
+    if with_eviction_columns:
+        conn.executemany(f"INSERT INTO {TABLE} (cache_key, prompt, response, timestamp, last_access, size_bytes) "
+                         f"VALUES (?, ?, ?, ?, ?, ?)", data)
+    else:
+        conn.executemany(f"INSERT INTO {TABLE} (prompt, response, timestamp) VALUES (?, ?, ?)", data)
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--max-rows", type=int, default=25000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = sqlite3.connect(os.path.join(tmp, "legacy.db"))
+        legacy.execute(f"CREATE TABLE {TABLE} (prompt TEXT PRIMARY KEY, response TEXT, "
+                       f"timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        fill(legacy, args.rows, with_eviction_columns=False)
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=365)).strftime(SQLITE_TIMESTAMP_FORMAT)
+        start = time.perf_counter()
+        for _ in range(20):
+            legacy.execute(f"DELETE FROM {TABLE} WHERE timestamp < ?", (cutoff,))
+            legacy.commit()
+        legacy_ms = (time.perf_counter() - start) / 20 * 1000
+        legacy.close()
+
+        backend = SQLiteCacheBackend(os.path.join(tmp, "pooled.db"), TABLE, key_fn=lambda prompt: prompt)
+        fill(backend.connection(), args.rows, with_eviction_columns=True)
+        evictor = CacheEvictor(backend, policy="lru", ttl=timedelta(days=365))
+        start = time.perf_counter()
+        for _ in range(20):
+            evictor.run_once()
+        indexed_ms = (time.perf_counter() - start) / 20 * 1000
+
+        print(f"rows={args.rows}")
+        print(f"legacy per-request DELETE (full scan): {legacy_ms:.2f} ms on every run()")
+        print(f"indexed eviction pass (nothing expired): {indexed_ms:.2f} ms, in the background, 0 ms on run()")
+
+        evictor.max_rows = args.max_rows
+        evictor.run_once()
+        stats = evictor.stats()
+        print(f"budget max_rows={args.max_rows}: evicted={stats['over_budget']} "
+              f"bytes_reclaimed={stats['bytes_reclaimed']} rows_left={stats['rows']} "
+              f"bytes_left={stats['bytes']} pass={stats['last_run_ms']:.1f} ms")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: cache hit rate with raw prompt keys vs. canonical digest keys.
+
+Replays a corpus of prompt variants (whitespace, casing, URL order, tracking parameters)
+against two caches, one keyed by the raw prompt and one by canonical_cache_key, and
+prints the hit-rate counters of each.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_cache_keys.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_backend import SQLiteCacheBackend  # noqa: E402
+from utils.cache_keys import canonical_cache_key  # noqa: E402
+
+BASE_PROMPTS = [
+    ("Summarize", "https://example.com/report.pdf", "https://youtu.be/69tPv5xZJjc"),
+    ("Podcast on", "https://notebooklm.google", "https://www.adobe.com/sample.pdf"),
+    ("Mindmap of", "https://en.wikipedia.org/wiki/Agent", "https://www.youtube.com/watch?v=abc123"),
+]
+
+
+def variants(verb: str, first: str, second: str):
+    """Yield prompts a user would consider identical."""
+    yield f"{verb} {first} and {second}"
+    yield f"{verb.lower()}   {first}  and {second}  "
+    yield f"{verb.upper()} {first} and {second}"
+    yield f"{verb} {second} and {first}"
+    yield f"{verb} {first}?utm_source=newsletter&utm_medium=email and {second}"
+    yield f"{verb} {first} and {second}{'&' if '?' in second else '?'}si=Xy12ab"
+    yield f"{verb} {first}. and {second}"
+
+
+def replay(cache: SQLiteCacheBackend, prompts):
+    for prompt in prompts:
+        if cache.get(prompt) is None:
+            cache.save(prompt, "{}")
+    return cache.stats()
+
+
+def main():
+    prompts = [prompt for base in BASE_PROMPTS for prompt in variants(*base)]
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = SQLiteCacheBackend(os.path.join(tmp, "raw.db"), "workflow_cache", key_fn=lambda prompt: prompt)
+        canonical = SQLiteCacheBackend(os.path.join(tmp, "canonical.db"), "workflow_cache", key_fn=canonical_cache_key)
+        for name, cache in (("raw prompt", raw), ("canonical", canonical)):
+            stats = replay(cache, prompts)
+            print(f"{name:<11} lookups={stats['hits'] + stats['misses']:<4} hits={stats['hits']:<4} "
+                  f"hit_rate={stats['hit_rate']:.1%}  normalized_hits={stats['normalized_hits']}")
+            cache.close()
+
+    start = time.perf_counter()
+    for _ in range(200):
+        for prompt in prompts:
+            canonical_cache_key(prompt)
+    per_key = (time.perf_counter() - start) / (200 * len(prompts))
+    print(f"canonical_cache_key: {per_key * 1e6:.1f} us per prompt")
+
+
+if __name__ == "__main__":
+    main()
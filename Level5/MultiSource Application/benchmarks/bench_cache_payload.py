@@ -0,0 +1,85 @@
+"""
+Benchmark: cache row size and decode time, full to_dict() JSON vs. the compact format.
+
+Builds responses shaped like the workflow's real ones (nested member messages, tool
+calls and optionally inline base64 podcast audio), then compares the stored row size
+and the time to turn a row back into RunResponse keyword arguments.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_cache_payload.py --messages 40 --audio-kb 400
+"""
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.artifact_store import ArtifactStore  # noqa: E402
+from utils.cache_payload import decode_payload, encode_payload  # noqa: E402
+
+
+class FakeAudio:
+    def __init__(self, data: bytes):
+        self.base64_audio = base64.b64encode(data).decode("ascii")
+
+
+class FakeRunResponse:
+    """Carries the same fields RunResponse.to_dict() emits for a routed team run."""
+
+    def __init__(self, messages: int, audio_kb: int):
+        self.content = "Summary paragraph. " * 80
+        self.content_type = "str"
+        self.event = "RunResponse"
+        self.workflow_id = "multi_source_processor_podcast"
+        self.created_at = 1760000000
+        self.metadata = {"warnings": []}
+        self.messages = [
+            {"role": "assistant" if i % 2 else "user", "content": "Member response text. " * 60,
+             "tool_calls": [{"id": f"call_{i}", "function": {"name": "transfer_task", "arguments": "{}"}}],
+             "metrics": {"input_tokens": 1200, "output_tokens": 300, "time": 1.7}}
+            for i in range(messages)
+        ]
+        self.audio = [FakeAudio(os.urandom(audio_kb * 1024))] if audio_kb else None
+
+    def to_dict(self):
+        data = {key: value for key, value in vars(self).items() if key != "audio"}
+        if self.audio:
+            data["audio"] = [{"base64_audio": artifact.base64_audio} for artifact in self.audio]
+        return data
+
+
+def time_decode(raw, store, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode_payload(raw, store)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=30)
+    parser.add_argument("--audio-kb", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArtifactStore(os.path.join(tmp, "artifacts"))
+        for audio_kb in (0, args.audio_kb):
+            response = FakeRunResponse(args.messages, audio_kb)
+            legacy = json.dumps(response.to_dict())
+            compact = encode_payload(response, store)
+            legacy_us = time_decode(legacy, store, args.repeat)
+            compact_us = time_decode(compact, store, args.repeat)
+            label = f"audio={audio_kb}KB" if audio_kb else "text only"
+            print(f"{label:<12} row size: json={len(legacy.encode()):>9} B  compact={len(compact):>7} B  "
+                  f"({len(legacy.encode()) / len(compact):.0f}x smaller)   "
+                  f"decode: json={legacy_us:>8.1f} us  compact={compact_us:>8.1f} us")
+        print("note: compact decode with audio includes reading the artifact back from disk")
+
+
+if __name__ == "__main__":
+    main()
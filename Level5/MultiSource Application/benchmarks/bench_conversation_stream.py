@@ -0,0 +1,105 @@
+"""
+Benchmark: time to first audio with batch vs. streamed conversation parsing.
+
+Streams a synthetic SPEAKER_A/SPEAKER_B podcast script word by word at --tokens-per-second
+(standing in for the podcast team's streamed response) and synthesizes it through
+TTSScheduler and DirectTTSBackend against a local fake ElevenLabs server (--latency
+seconds per request):
+  - batch: wait for the whole script, parse it, then synthesize every segment;
+  - streamed: ConversationParser emits each segment when the next speaker label arrives,
+    and it starts synthesizing while the rest of the script is still streaming.
+Prints time to first audio (the opening segment's audio is ready) and total time, and
+checks both paths produce the same segments and audio.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_conversation_stream.py --segments 10 --tokens-per-second 40
+"""
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.utils.log import logger  # noqa: E402
+from fixtures import fake_audio, page_text, serve_tts  # noqa: E402
+from utils.conversation_stream import iter_conversation_segments, parse_conversation_segments  # noqa: E402
+from utils.tts_backend import DirectTTSBackend  # noqa: E402
+from utils.tts_scheduler import TTSScheduler  # noqa: E402
+
+VOICES = {"SPEAKER_A": "JBFqnCBsd6RMkjVDRZzb", "SPEAKER_B": "21m00Tcm4TlvDq8ikWAM"}
+
+
+def script(count: int, words: int) -> str:
+    """A podcast script; some turns run over two lines, as model output does."""
+    lines = []
+    for i in range(count):
+        text = page_text(i, words, seed=1)
+        lines.append(f"SPEAKER_{'AB'[i % 2]}: {text[0]}")
+        lines.extend(text[1:])
+    return "\n".join(lines) + "\n"
+
+
+def token_stream(text: str, tokens_per_second: float):
+    for token in re.findall(r"\S+\s*|\s+", text):
+        time.sleep(1 / tokens_per_second)
+        yield token
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10)
+    parser.add_argument("--words", type=int, default=20, help="Words per segment")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per TTS request")
+    parser.add_argument("--concurrency", type=int, default=3)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    url, server = serve_tts(latency=args.latency, char_latency=0.0)
+    backend = DirectTTSBackend(api_key="bench", base_url=url)
+    conversation = script(args.segments, args.words)
+    expected = parse_conversation_segments(conversation, VOICES)
+    tokens = len(re.findall(r"\S+\s*|\s+", conversation))
+    print(f"{len(expected)} segments, {tokens} tokens at {args.tokens_per_second:g}/s "
+          f"({tokens / args.tokens_per_second:.1f} s of generation), TTS latency={args.latency}s, "
+          f"{args.concurrency} at a time")
+
+    def run(label: str, streamed: bool):
+        scheduler = TTSScheduler(lambda text, speaker: backend.synthesize(text, VOICES[speaker]),
+                                 max_concurrency=args.concurrency)
+        first_audio = []
+        segments = []
+        start = time.perf_counter()
+
+        def on_segment(index, audio):
+            if index == 0:
+                first_audio.append(time.perf_counter() - start)
+
+        def collect(parsed):
+            for segment in parsed:
+                segments.append(segment)
+                yield segment
+
+        chunks = token_stream(conversation, args.tokens_per_second)
+        if streamed:
+            parsed = iter_conversation_segments(chunks, VOICES)
+        else:
+            parsed = parse_conversation_segments("".join(chunks), VOICES)
+        audio = scheduler.synthesize_all(collect(parsed), on_segment=on_segment)
+        elapsed = time.perf_counter() - start
+        scheduler.close()
+        if segments != expected or audio != [fake_audio(VOICES[s["speaker"]], s["text"]) for s in expected]:
+            raise RuntimeError(f"{label}: segments or audio differ from the batch parse")
+        print(f"  {label:<9} first audio {first_audio[0]:6.2f} s   total {elapsed:6.2f} s")
+
+    run("batch", streamed=False)
+    run("streamed", streamed=True)
+    backend.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
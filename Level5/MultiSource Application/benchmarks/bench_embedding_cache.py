@@ -0,0 +1,62 @@
+"""
+Benchmark: cold ingestion of previously seen content with and without the embedding cache.
+
+Ingests the same synthetic chunks into two different Chroma collections (like the same
+PDF loaded by Level4's "doc" and Level5's "pdf_content" knowledge bases), embedding through
+a fake remote embedder wrapped in CachedEmbedder. The second collection's ingestion is
+served from the cache. Prints wall time, provider requests and the cache hit-rate report.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_embedding_cache.py [--dtype float16]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.vectordb.chroma import ChromaDb  # noqa: E402
+from fixtures import FakeRemoteEmbedder, make_documents  # noqa: E402
+from utils.embedding_cache import CachedEmbedder, EmbeddingCache, text_digest  # noqa: E402
+from utils.embedding_pipeline import EmbeddingPipeline  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--request-latency", type=float, default=0.05, help="Seconds per embedding request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        remote = FakeRemoteEmbedder(args.request_latency, 0.0005)
+        cache = EmbeddingCache(os.path.join(tmp, "embeddings"), dtype=args.dtype)
+        embedder = CachedEmbedder(remote, cache)
+        documents = make_documents(args.chunks, seed=3)
+
+        for collection in ("pdf_content", "doc"):
+            vector_db = ChromaDb(collection=collection, embedder=embedder, path=os.path.join(tmp, "chroma"),
+                                 persistent_client=True)
+            vector_db.create()
+            pipeline = EmbeddingPipeline(embedder, batch_size=100, max_concurrency=4)
+            requests = remote.requests
+            stats = pipeline.insert_documents(vector_db, documents)
+            pipeline.close()
+            print(f"{collection:<12}: {stats['seconds'] * 1000:8.1f} ms  {stats['chunks_per_sec']:9.1f} chunks/s  "
+                  f"provider requests={remote.requests - requests}")
+
+        # Raw lookup cost once everything is cached
+        digests = [text_digest(document.content) for document in documents]
+        start = time.perf_counter()
+        cache.get_many(embedder.space, embedder.dimensions, digests)
+        per_vector = (time.perf_counter() - start) / len(digests)
+        report = embedder.stats()
+        print(f"cache lookup: {per_vector * 1e6:.1f} us per vector ({args.dtype})")
+        print(f"cache report: hit_rate={report['hit_rate']:.1%} hits={report['hits']} misses={report['misses']} "
+              f"entries={report['entries']} bytes={report['bytes']}")
+
+
+if __name__ == "__main__":
+    main()
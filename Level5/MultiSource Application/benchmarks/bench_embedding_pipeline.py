@@ -0,0 +1,66 @@
+"""
+Benchmark: ChromaDb.insert (one embedding request per chunk) vs. EmbeddingPipeline.
+
+Embeds synthetic chunks into a temporary Chroma collection with a fake embedder that
+sleeps a fixed time per request plus a small time per text, like a remote embedding API
+(no network or API key needed). Prints chunks/sec for the serial agno insert and for the
+batched pipeline at several concurrency levels, with and without a token-bucket limit.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_embedding_pipeline.py
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.vectordb.chroma import ChromaDb  # noqa: E402
+from fixtures import FakeRemoteEmbedder, make_documents  # noqa: E402
+from utils.embedding_pipeline import EmbeddingPipeline  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=600)
+    parser.add_argument("--serial-chunks", type=int, default=100, help="Chunks for the (slow) serial baseline")
+    parser.add_argument("--request-latency", type=float, default=0.05, help="Seconds per embedding request")
+    parser.add_argument("--text-latency", type=float, default=0.0005, help="Extra seconds per embedded text")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def vector_db(name, embedder):
+            db = ChromaDb(collection=name, embedder=embedder, path=os.path.join(tmp, "chroma"), persistent_client=True)
+            db.create()
+            return db
+
+        embedder = FakeRemoteEmbedder(args.request_latency, args.text_latency)
+        documents = make_documents(args.serial_chunks, seed=1)
+        start = time.perf_counter()
+        vector_db("serial", embedder).insert(documents)
+        elapsed = time.perf_counter() - start
+        print(f"ChromaDb.insert (serial)       : {len(documents) / elapsed:8.1f} chunks/s  "
+              f"requests={embedder.requests}  ({len(documents)} chunks)")
+
+        runs = [(1, None), (4, None), (8, None), (8, 20.0)]
+        for index, (concurrency, requests_per_second) in enumerate(runs):
+            embedder = FakeRemoteEmbedder(args.request_latency, args.text_latency)
+            limiter = TokenBucket(requests_per_second, capacity=1) if requests_per_second else None
+            pipeline = EmbeddingPipeline(embedder, batch_size=args.batch_size, max_concurrency=concurrency,
+                                         rate_limiter=limiter)
+            documents = make_documents(args.chunks, seed=10 + index)
+            db = vector_db(f"pipeline{index}", embedder)
+            stats = pipeline.insert_documents(db, documents)
+            pipeline.close()
+            assert db.get_count() == stats["chunks"]
+            label = f"pipeline x{concurrency}" + (f", {requests_per_second:.0f} req/s cap" if limiter else "")
+            print(f"{label:<31}: {stats['chunks_per_sec']:8.1f} chunks/s  requests={embedder.requests}  "
+                  f"({stats['chunks']} chunks in {stats['batches']} batches)")
+
+
+if __name__ == "__main__":
+    main()
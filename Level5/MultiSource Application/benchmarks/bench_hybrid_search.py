@@ -0,0 +1,119 @@
+"""
+Benchmark: BM25 index cost and exact-term retrieval of vector-only vs. hybrid search.
+
+Builds synthetic chunks from a Zipf-distributed vocabulary, each quoting one section number
+and product code. First indexes --chunks of them into a BM25Index batch by batch (as the
+ingestor writes them) and reports indexing rate and per-query BM25 latency. Then ingests
+--quality-chunks into a HybridVectorDb over NumpyVectorDb through the embedding pipeline
+and asks questions that quote one chunk's section number or product code, reporting
+hit@k of the vector ranking alone and of the fused ranking, and the fused query latency.
+Embeddings come from LocalHashEmbedder, so no API is called.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_hybrid_search.py --chunks 50000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.document import Document  # noqa: E402
+from utils.embedding_pipeline import EmbeddingPipeline  # noqa: E402
+from utils.hybrid_search import BM25Index, HybridVectorDb  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.numpy_vectordb import NumpyVectorDb  # noqa: E402
+
+VOCABULARY = 20000
+BATCH_SIZE = 100
+
+
+def make_chunks(count: int, words: int, seed: int):
+    """(text, section, code) per chunk; text words follow a Zipf distribution."""
+    rng = np.random.default_rng(seed)
+    ranks = (rng.zipf(1.1, size=(count, words)) - 1) % VOCABULARY + 1
+    chunks = []
+    for i in range(count):
+        section = f"{i % 40 + 1}.{i // 40 % 30 + 1}.{i // 1200 + 1}"
+        code = f"px-{100000 + i * 7919 % 900000}"
+        text = " ".join(f"w{rank}" for rank in ranks[i])
+        chunks.append((f"Section {section}. {text} Product {code.upper()} {text[:200]}", section, code))
+    return chunks
+
+
+def question(chunk, rng: random.Random) -> str:
+    text, section, code = chunk
+    words = [word for word in text.split() if word.startswith("w")]
+    topic = " ".join(rng.sample(words, 2))
+    if rng.random() < 0.5:
+        return f"What does section {section} say about {topic}?"
+    return f"Which limits apply to product {code.upper()} and {topic}?"
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50000, help="Chunks in the BM25 latency run")
+    parser.add_argument("--quality-chunks", type=int, default=5000, help="Chunks in the hit@k run")
+    parser.add_argument("--words", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    # BM25 alone at full size
+    chunks = make_chunks(args.chunks, args.words, seed=0)
+    index = BM25Index()
+    start = time.perf_counter()
+    for i in range(0, len(chunks), BATCH_SIZE):
+        batch = chunks[i:i + BATCH_SIZE]
+        index.add([f"chunk-{i + j}" for j in range(len(batch))], [text for text, _, _ in batch])
+    build = time.perf_counter() - start
+    queries = [question(chunks[rng.randrange(len(chunks))], rng) for _ in range(args.queries)]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, args.top_k * 4)
+        timings.append(time.perf_counter() - start)
+    print(f"BM25 over {args.chunks} chunks: indexed {args.chunks / build:.0f} chunks/s in batches of {BATCH_SIZE} "
+          f"({len(index._segments)} segments)")
+    print(f"  query: mean={np.mean(timings) * 1000:.3f} ms  p50={percentile(timings, 50):.3f} ms  "
+          f"p99={percentile(timings, 99):.3f} ms")
+
+    # Vector-only vs. fused ranking on exact-term questions
+    chunks = make_chunks(args.quality_chunks, args.words, seed=1)
+    embedder = LocalHashEmbedder()
+    with tempfile.TemporaryDirectory() as tmp:
+        vector_db = NumpyVectorDb("bench", embedder=embedder, path=tmp)
+        hybrid = HybridVectorDb(vector_db)
+        pipeline = EmbeddingPipeline(embedder)
+        pipeline.insert_documents(hybrid, [Document(content=text, meta_data={"n": n})
+                                           for n, (text, _, _) in enumerate(chunks)])
+        pipeline.close()
+
+        hits = {"vector": 0, "hybrid": 0}
+        fused_timings = []
+        for _ in range(args.queries):
+            target = rng.randrange(len(chunks))
+            query = question(chunks[target], rng)
+            vector_results = vector_db.search(query, limit=args.top_k)
+            start = time.perf_counter()
+            hybrid_results = hybrid.search(query, limit=args.top_k)
+            fused_timings.append(time.perf_counter() - start)
+            hits["vector"] += any(document.meta_data.get("n") == target for document in vector_results)
+            hits["hybrid"] += any(document.meta_data.get("n") == target for document in hybrid_results)
+        print(f"Exact-term questions over {args.quality_chunks} chunks, hit@{args.top_k}:")
+        print(f"  vector only: {hits['vector'] / args.queries:.3f}")
+        print(f"  hybrid (RRF): {hits['hybrid'] / args.queries:.3f}  "
+              f"query mean={np.mean(fused_timings) * 1000:.2f} ms (embedding, vector and BM25 search, fusion)")
+
+
+if __name__ == "__main__":
+    main()
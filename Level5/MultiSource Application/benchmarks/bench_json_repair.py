@@ -0,0 +1,73 @@
+"""
+Benchmark: local JSON repair of URL Handler output vs. the JSON Corrector agent.
+
+Feeds repair_json a corpus of URL Handler outputs with the defects seen in practice
+(Markdown fences, surrounding prose, trailing commas, truncation, nesting, missing keys)
+and prints how many it recovers and the per-output latency. Every recovered output
+saves one JSON Corrector LLM round trip.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_json_repair.py
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_repair import repair_json  # noqa: E402
+
+VALID = ('{"pdf_urls":["https://example.com/doc.pdf"],"youtube_urls":["https://www.youtube.com/watch?v=abc"],'
+         '"web_urls":[],"remaining_text":"summarize","errors":[]}')
+
+# (label, URL Handler output, expected pdf_urls or None when repair should give up)
+CORPUS = [
+    ("valid", VALID, ["https://example.com/doc.pdf"]),
+    ("fenced", f"```json\n{VALID}\n```", ["https://example.com/doc.pdf"]),
+    ("fenced, no newline", f"```{VALID}```", ["https://example.com/doc.pdf"]),
+    ("prose around", f"Here is the JSON you asked for:\n{VALID}\nLet me know!", ["https://example.com/doc.pdf"]),
+    ("trailing commas", '{"pdf_urls":["https://example.com/doc.pdf",],"youtube_urls":[],"web_urls":[],'
+                        '"remaining_text":"summarize","errors":[],}', ["https://example.com/doc.pdf"]),
+    ("unclosed string", '{"pdf_urls":["https://example.com/doc.pdf"],"youtube_urls":[],"web_urls":[],'
+                        '"remaining_text":"summa', ["https://example.com/doc.pdf"]),
+    ("truncated, lists done", '{"pdf_urls":["https://example.com/doc.pdf"],"youtube_urls":[],"web_urls":["https://exa',
+     None),
+    # Truncated before every URL list was written: the JSON Corrector has to handle these
+    ("truncated in list", '{"pdf_urls":["https://example.com/doc.pdf","https://exa', None),
+    ("truncated after key", '{"pdf_urls":["https://example.com/doc.pdf"],"youtube_urls"', None),
+    ("truncated before lists", '{"remaining_text":"summarize th', None),
+    ("missing keys", '{"pdf_urls":["https://example.com/doc.pdf"]}', ["https://example.com/doc.pdf"]),
+    ("nested", '{"result":{"pdf_urls":["https://example.com/doc.pdf"],"errors":"none"}}', ["https://example.com/doc.pdf"]),
+    ("string instead of list", '{"pdf_urls":"https://example.com/doc.pdf"}', ["https://example.com/doc.pdf"]),
+    ("no JSON", "I could not find any URLs in that prompt.", None),
+    ("array", '["https://example.com/doc.pdf"]', None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="Timing rounds over the corpus")
+    args = parser.parse_args()
+
+    correct = 0
+    for label, text, expected in CORPUS:
+        result = repair_json(text)
+        got = None if result is None else result["pdf_urls"]
+        ok = got == expected
+        correct += ok
+        print(f"  {label:<24} {'ok' if ok else 'FAIL'}  {got}")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for _, text, _ in CORPUS:
+            repair_json(text)
+    per_output = (time.perf_counter() - start) / (args.rounds * len(CORPUS))
+
+    recoverable = sum(1 for *_, expected in CORPUS if expected is not None)
+    print(f"outputs={len(CORPUS)}  correct={correct}/{len(CORPUS)}  corrector calls avoided={recoverable}/{len(CORPUS)}")
+    print(f"repair_json: {per_output * 1e6:.1f} us per output (JSON Corrector: 1 LLM call per output)")
+
+
+if __name__ == "__main__":
+    main()
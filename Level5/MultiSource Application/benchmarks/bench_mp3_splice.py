@@ -0,0 +1,99 @@
+"""
+Benchmark: combining podcast segments by MP3 frame splicing vs. pydub.
+
+Builds synthetic TTS-shaped segments (64 kbps CBR, 44.1 kHz mono, with ID3 tags and an
+Info frame; see fixtures.make_mp3) for podcasts of several lengths and combines them
+with 500 ms pauses:
+  - splice: splice_mp3, copying frames straight to the output file;
+  - pcm +=: pydub's accumulation alone (`combined += segment` on 16-bit PCM of the same
+    duration, no decoding or encoding), the part of the old path that grows quadratically;
+  - pydub: the full previous path (decode, +=, export). The synthetic frames are not real
+    speech, so this runs only with --pydub on real MP3s (--segment-file) and needs
+    pydub and ffmpeg.
+Checks the spliced output parses as one stream with the expected frame count.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_mp3_splice.py --segments 20 100 200 --seconds 6
+"""
+import os
+import sys
+import math
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import make_mp3  # noqa: E402
+from utils.mp3_splice import parse_mp3, splice_mp3  # noqa: E402
+
+SAMPLE_RATE = 44100
+# Silent frames in a 500 ms pause at 1152 samples per frame
+PAUSE_FRAMES = math.ceil(0.5 * SAMPLE_RATE / 1152)
+
+
+def pcm_accumulate(segments, pause_ms: int = 500) -> float:
+    # 16-bit mono PCM of each segment's duration, built outside the timing
+    pcm = [bytes(parse_mp3(data).frames * 1152 * 2) for data in segments]
+    pause = bytes(SAMPLE_RATE * pause_ms // 1000 * 2)
+    start = time.perf_counter()
+    combined = b""
+    for i, samples in enumerate(pcm):
+        combined += samples
+        if i < len(pcm) - 1:
+            combined += pause
+    return time.perf_counter() - start
+
+
+def pydub_combine(segments, output_path: str):
+    from io import BytesIO
+    from pydub import AudioSegment
+
+    combined = AudioSegment.empty()
+    pause = AudioSegment.silent(duration=500)
+    for i, data in enumerate(segments):
+        combined += AudioSegment.from_file(BytesIO(data), format="mp3")
+        if i < len(segments) - 1:
+            combined += pause
+    combined.export(output_path, format="mp3")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, nargs="+", default=[20, 100, 200])
+    parser.add_argument("--seconds", type=float, default=6.0, help="Audio per segment")
+    parser.add_argument("--segment-file", action="append", default=[], help="Real MP3 segment(s) to cycle through")
+    parser.add_argument("--pydub", action="store_true", help="Also time the full pydub path")
+    args = parser.parse_args()
+    if args.pydub and not args.segment_file:
+        parser.error("--pydub needs real MP3 segments (--segment-file)")
+
+    real = []
+    for path in args.segment_file:
+        with open(path, "rb") as f:
+            real.append(f.read())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "podcast.mp3")
+        for count in args.segments:
+            if real:
+                segments = [real[i % len(real)] for i in range(count)]
+            else:
+                segments = [make_mp3(args.seconds, seed=i) for i in range(count)]
+            start = time.perf_counter()
+            stats = splice_mp3(segments, output)
+            splice_s = time.perf_counter() - start
+            expected = sum(parse_mp3(data).frames for data in segments) + (count - 1) * PAUSE_FRAMES
+            if parse_mp3(open(output, "rb").read()).frames != expected or stats["frames"] != expected:
+                raise RuntimeError("spliced output does not have the expected frames")
+            line = (f"  {count:4d} segments ({stats['seconds'] / 60:5.1f} min): splice {splice_s * 1000:8.1f} ms  "
+                    f"pcm += {pcm_accumulate(segments) * 1000:8.1f} ms")
+            if args.pydub:
+                start = time.perf_counter()
+                pydub_combine(segments, output)
+                line += f"  pydub {(time.perf_counter() - start) * 1000:9.1f} ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
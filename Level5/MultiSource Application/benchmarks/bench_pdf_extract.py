@@ -0,0 +1,74 @@
+"""
+Benchmark: PDF page text extraction on the calling thread vs. ParallelPDFExtractor.
+
+Writes a synthetic PDF (400 pages by default) and extracts every page's text in-process,
+then through ParallelPDFExtractor with each worker count in --workers. Prints pages/sec and
+the longest stall seen by a concurrent thread that ticks every millisecond (a stand-in for
+other Playground requests competing for the GIL). Extraction is checked to return the same
+text as the in-process path. Pages/sec can only scale up to the machine's core count.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_pdf_extract.py --pages 400 --workers 1 2 4 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import make_pdf  # noqa: E402
+from utils.pdf_extract import ParallelPDFExtractor  # noqa: E402
+from utils.pdf_stream import iter_page_texts  # noqa: E402
+
+
+def measure(label: str, extract, expected=None):
+    stalls = []
+    stop = threading.Event()
+
+    def ticker():
+        last = time.perf_counter()
+        while not stop.is_set():
+            time.sleep(0.001)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    thread = threading.Thread(target=ticker, daemon=True)
+    thread.start()
+    start = time.perf_counter()
+    texts = list(extract())
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    if expected is not None and texts != expected:
+        raise RuntimeError(f"{label}: extracted text differs from the in-process extraction")
+    print(f"  {label:<12} {len(texts) / elapsed:8.1f} pages/s  ({elapsed:6.2f} s)  "
+          f"concurrent thread max stall={max(stalls) * 1000:7.1f} ms")
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "doc.pdf")
+        with open(path, "wb") as f:
+            f.write(make_pdf(args.pages))
+        print(f"{args.pages}-page PDF, {os.cpu_count()} CPUs")
+        expected = measure("in-process", lambda: iter_page_texts(path))
+        for workers in args.workers:
+            extractor = ParallelPDFExtractor(max_workers=workers, min_parallel_pages=0)
+            # Start the worker processes outside the measurement
+            list(extractor.iter_page_texts(path))
+            measure(f"{workers} worker{'s' if workers > 1 else ''}", lambda: extractor.iter_page_texts(path), expected)
+            extractor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: sequential per-PDF downloads vs. the pooled, concurrent PDF fetcher.
+
+Serves synthetic PDFs from two local HTTP/1.1 servers (two "hosts") that add a simulated
+connection setup cost and per-response latency, then downloads all of them:
+  - sequential: one after another with a fresh client each (the previous fetch path);
+  - pooled: one after another through PooledPDFFetcher's shared connection pool;
+  - concurrent: all at once through PooledPDFFetcher (per-host limit --per-host);
+  - revalidate: all at once again, as conditional requests with the validators from the
+    first download, so the servers answer 304 Not Modified.
+Prints wall time, new connections and requests per mode.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_pdf_fetch.py --pdfs 8 --latency 0.1 --connect-latency 0.1
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import make_pdf, serve_directory  # noqa: E402
+from utils.pdf_fetch import PooledPDFFetcher, conditional_headers  # noqa: E402
+from utils.pdf_stream import spool_download  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdfs", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds before each response")
+    parser.add_argument("--connect-latency", type=float, default=0.1, help="Seconds per new connection")
+    parser.add_argument("--per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.pdfs):
+            with open(os.path.join(tmp, f"doc{i}.pdf"), "wb") as f:
+                f.write(make_pdf(args.pages, seed=i))
+        servers = [serve_directory(tmp, latency=args.latency, connect_latency=args.connect_latency, keep_alive=True)
+                   for _ in range(2)]
+        urls = [f"{servers[i % 2][0]}/doc{i}.pdf" for i in range(args.pdfs)]
+        print(f"{args.pdfs} PDFs of {args.pages} pages on 2 hosts, latency={args.latency}s, "
+              f"connect latency={args.connect_latency}s")
+
+        def run(label: str, fetch_all):
+            for _, server in servers:
+                server.stats.update(connections=0, requests=0)
+            start = time.perf_counter()
+            downloads = fetch_all()
+            elapsed = time.perf_counter() - start
+            for download in downloads.values():
+                if download.path:
+                    os.remove(download.path)
+            connections = sum(server.stats["connections"] for _, server in servers)
+            requests = sum(server.stats["requests"] for _, server in servers)
+            statuses = sorted({download.status_code for download in downloads.values()})
+            print(f"  {label:<11} {elapsed * 1000:8.1f} ms  connections={connections:3d}  requests={requests:3d}  "
+                  f"status={statuses}")
+            return downloads
+
+        run("sequential", lambda: {url: spool_download(url) for url in urls})
+        with PooledPDFFetcher(per_host=args.per_host) as fetcher:
+            run("pooled", lambda: {url: fetcher.fetch(url) for url in urls})
+            first = run("concurrent", lambda: {url: future.result()
+                                               for url, future in fetcher.fetch_all(dict.fromkeys(urls)).items()})
+            validators = {
+                url: conditional_headers(download.headers.get("etag"), download.headers.get("last-modified"))
+                for url, download in first.items()
+            }
+            run("revalidate", lambda: {url: future.result() for url, future in fetcher.fetch_all(validators).items()})
+        for _, server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
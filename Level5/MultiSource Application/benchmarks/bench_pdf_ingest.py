@@ -0,0 +1,102 @@
+"""
+Benchmark: repeated PDFUrlKnowledgeBase.load() vs. IncrementalPDFIngestor.
+
+Serves synthetic PDFs from a local HTTP server and loads the same URL set several times,
+once through knowledge_base.load(recreate=False) (download, parse, chunk and existence
+checks on every call) and once through the manifest-based ingestor (conditional GET,
+skip when unchanged). Finally one page of one PDF is edited to show that only its
+chunks are re-embedded. Embeddings come from LocalHashEmbedder, so no API is called.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_pdf_ingest.py
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.knowledge.pdf_url import PDFUrlKnowledgeBase, PDFUrlReader  # noqa: E402
+from agno.vectordb.chroma import ChromaDb  # noqa: E402
+from fixtures import make_pdf, serve_directory  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.pdf_ingest import IncrementalPDFIngestor  # noqa: E402
+
+
+class CountingEmbedder(LocalHashEmbedder):
+    """LocalHashEmbedder that counts how many texts it embedded."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def get_embedding(self, text):
+        self.calls += 1
+        return super().get_embedding(text)
+
+
+def make_knowledge_base(path: str, collection: str, embedder) -> PDFUrlKnowledgeBase:
+    vector_db = ChromaDb(collection=collection, embedder=embedder, path=path, persistent_client=True)
+    vector_db.create()
+    return PDFUrlKnowledgeBase(urls=[], vector_db=vector_db, embedder=embedder, reader=PDFUrlReader())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3, help="Loads of the same URL set")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        site = os.path.join(tmp, "site")
+        os.makedirs(site)
+        for i in range(args.documents):
+            with open(os.path.join(site, f"doc{i}.pdf"), "wb") as f:
+                f.write(make_pdf(args.pages, seed=i))
+        base_url, server = serve_directory(site)
+        urls = [f"{base_url}/doc{i}.pdf" for i in range(args.documents)]
+
+        naive_embedder = CountingEmbedder()
+        knowledge_base = make_knowledge_base(os.path.join(tmp, "chroma"), "naive", naive_embedder)
+        print(f"{args.documents} PDFs x {args.pages} pages, {args.rounds} loads of the same URL set")
+        for round_number in range(1, args.rounds + 1):
+            calls = naive_embedder.calls
+            start = time.perf_counter()
+            knowledge_base.urls = urls
+            knowledge_base.load(recreate=False)
+            elapsed = time.perf_counter() - start
+            print(f"  load()      round {round_number}: {elapsed * 1000:8.1f} ms  embeddings={naive_embedder.calls - calls}")
+
+        embedder = CountingEmbedder()
+        ingestor = IncrementalPDFIngestor(
+            make_knowledge_base(os.path.join(tmp, "chroma"), "incremental", embedder),
+            manifest_path=os.path.join(tmp, "manifest.json"),
+        )
+        for round_number in range(1, args.rounds + 1):
+            calls = embedder.calls
+            start = time.perf_counter()
+            statuses = ingestor.ingest(urls)
+            elapsed = time.perf_counter() - start
+            print(f"  ingestor    round {round_number}: {elapsed * 1000:8.1f} ms  embeddings={embedder.calls - calls}  "
+                  f"statuses={sorted(set(statuses.values()))}")
+
+        # Edit one page of the first PDF; bump the mtime so Last-Modified changes
+        edited = os.path.join(site, "doc0.pdf")
+        with open(edited, "wb") as f:
+            f.write(make_pdf(args.pages, seed=0, changed_pages={3}))
+        os.utime(edited, (time.time() + 10, time.time() + 10))
+        calls = embedder.calls
+        start = time.perf_counter()
+        statuses = ingestor.ingest(urls)
+        elapsed = time.perf_counter() - start
+        print(f"  ingestor    1 page edited: {elapsed * 1000:6.1f} ms  embeddings={embedder.calls - calls}  "
+              f"doc0={statuses[urls[0]]}")
+        print(f"  ingestor stats: {ingestor.stats()}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: peak memory of PDFUrlReader.read vs. the streaming page-wise reader.
+
+Serves a synthetic PDF (1000 pages by default) from a local HTTP server and reads it
+twice under tracemalloc: once with agno's PDFUrlReader.read, which downloads into memory
+and returns every chunk at once, and once by spooling the download to a temporary file and
+pulling chunks from StreamingPDFReader in embedding-sized batches. Each batch is embedded
+with LocalHashEmbedder and dropped, as the embedding pipeline does.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_pdf_streaming.py --pages 1000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.document.reader.pdf_reader import PDFUrlReader  # noqa: E402
+from fixtures import make_pdf, serve_directory  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.pdf_stream import StreamingPDFReader, doc_name_for, spool_download  # noqa: E402
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = fn()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed:7.2f} s  peak={peak / 2**20:7.1f} MiB  retained={current / 2**20:6.1f} MiB  "
+          f"chunks={chunks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=100, help="Chunks per embedding batch when streaming")
+    args = parser.parse_args()
+
+    embedder = LocalHashEmbedder()
+    reader = PDFUrlReader()
+
+    def read_in_memory() -> int:
+        documents = reader.read(url)
+        embedder.get_embeddings([document.content for document in documents[:args.batch_size]])
+        return len(documents)
+
+    def read_streaming() -> int:
+        download = spool_download(url)
+        try:
+            count = 0
+            batch = []
+            for document in StreamingPDFReader(reader).iter_documents(download.path, doc_name_for(url)):
+                batch.append(document.content)
+                if len(batch) == args.batch_size:
+                    embedder.get_embeddings(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                embedder.get_embeddings(batch)
+            return count + len(batch)
+        finally:
+            os.remove(download.path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = make_pdf(args.pages)
+        with open(os.path.join(tmp, "big.pdf"), "wb") as f:
+            f.write(data)
+        del data
+        base_url, server = serve_directory(tmp)
+        url = f"{base_url}/big.pdf"
+        print(f"{args.pages}-page PDF ({os.path.getsize(os.path.join(tmp, 'big.pdf')) / 2**20:.1f} MiB)")
+        measure("in-memory", read_in_memory)
+        measure("streaming", read_streaming)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: unscoped vs. per-document scoped retrieval in a growing shared collection.
+
+Fills one Chroma collection (like pdf_content) with tagged chunks from more and more
+synthetic PDFs, and at each size runs queries taken from a random page of one target
+document. Each query is searched across the whole collection, with a Chroma doc_id filter,
+and through a ScopedRetriever over the target's chunk ids (built per query, as each agent
+run builds its own). Prints query latency and top-k precision, i.e. the share of returned
+chunks that belong to the target document. Embeddings come from LocalHashEmbedder, so no
+API is called.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_scoped_retrieval.py --sizes 10 100 500
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.document import Document  # noqa: E402
+from agno.vectordb.chroma import ChromaDb  # noqa: E402
+from fixtures import page_text  # noqa: E402
+from utils.embedding_pipeline import EmbeddingPipeline, chunk_id  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.pdf_ingest import document_tags  # noqa: E402
+from utils.scoped_retrieval import ScopedRetriever  # noqa: E402
+
+MODES = ("unscoped", "filter", "scoped")
+
+
+def pdf_chunks(number: int, pages: int):
+    url = f"https://example.com/papers/doc{number}.pdf"
+    tags = document_tags(url)
+    return url, [Document(name=f"doc{number}", content=" ".join(page_text(page, 150, seed=number)),
+                          meta_data={"page": page, **tags}) for page in range(1, pages + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="Documents in the collection")
+    parser.add_argument("--pages", type=int, default=10, help="Chunks per document")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    embedder = LocalHashEmbedder()
+    with tempfile.TemporaryDirectory() as tmp:
+        vector_db = ChromaDb(collection="pdf_content", embedder=embedder, path=tmp, persistent_client=True)
+        vector_db.create()
+        pipeline = EmbeddingPipeline(embedder)
+        urls, chunk_ids = [], []
+        print(f"{args.pages} chunks per document, {args.queries} queries, top-{args.top_k}")
+        for size in sorted(args.sizes):
+            while len(urls) < size:
+                url, documents = pdf_chunks(len(urls), args.pages)
+                pipeline.insert_documents(vector_db, documents)
+                urls.append(url)
+                chunk_ids.append([chunk_id(document.content) for document in documents])
+
+            timings = dict.fromkeys(MODES, 0.0)
+            precision = dict.fromkeys(MODES, 0.0)
+            for _ in range(args.queries):
+                target = rng.randrange(size)
+                page = rng.randint(1, args.pages)
+                query = " ".join(" ".join(page_text(page, 150, seed=target)).split()[:40])
+                doc_id = document_tags(urls[target])["doc_id"]
+
+                searches = {
+                    "unscoped": lambda: vector_db.search(query, limit=args.top_k),
+                    "filter": lambda: vector_db.search(query, limit=args.top_k, filters={"doc_id": doc_id}),
+                    "scoped": lambda: ScopedRetriever(vector_db, ids=chunk_ids[target]).search(query, args.top_k),
+                }
+                for mode, search in searches.items():
+                    start = time.perf_counter()
+                    results = search()
+                    timings[mode] += time.perf_counter() - start
+                    precision[mode] += sum(document.meta_data.get("doc_id") == doc_id for document in results) / args.top_k
+
+            for mode in MODES:
+                print(f"  {size:5d} docs ({size * args.pages:6d} chunks) {mode:<9}: "
+                      f"{timings[mode] / args.queries * 1000:6.2f} ms/query  "
+                      f"precision@{args.top_k}={precision[mode] / args.queries:.2f}")
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: semantic cache hit rate and lookup latency.
+
+Fills a SemanticCache with prompts over many URL sets, then replays paraphrases and
+unrelated prompts. Uses the offline LocalHashEmbedder so it runs without API keys;
+pass --gemini to embed with GeminiEmbedder instead (requires GOOGLE_API_KEY).
+The hashing embedder only sees shared word stems, so it needs a lower threshold than
+the 0.92 the workflow uses with Gemini embeddings.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_semantic_cache.py --entries 20000 --threshold 0.6
+"""
+import os
+import sys
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache_backend import SQLiteCacheBackend  # noqa: E402
+from utils.cache_keys import canonical_cache_key  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.semantic_cache import SemanticCache  # noqa: E402
+
+REQUESTS = [
+    ("summarize this pdf", "give me a summary of this pdf"),
+    ("create a podcast on this", "create a podcast about this please"),
+    ("make a mindmap of the key ideas", "make a mindmap of key ideas"),
+    ("what are the main findings", "what are the main findings reported"),
+]
+UNRELATED = ["translate the introduction to french", "list every table in the appendix"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--gemini", action="store_true")
+    args = parser.parse_args()
+
+    if args.gemini:
+        from agno.embedder.google import GeminiEmbedder
+        embedder = GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY"))
+    else:
+        embedder = LocalHashEmbedder()
+
+    rng = random.Random(7)
+    url_sets = max(1, args.entries // len(REQUESTS))
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteCacheBackend(os.path.join(tmp, "cache.db"), "workflow_cache", key_fn=canonical_cache_key)
+        cache = SemanticCache(embedder, backend, threshold=args.threshold)
+        for i in range(url_sets):
+            for original, _ in REQUESTS:
+                prompt = f"{original} https://example.com/doc-{i}.pdf"
+                cache.add(prompt, canonical_cache_key(prompt))
+
+        expected_hits = 0
+        for _ in range(args.queries):
+            i = rng.randrange(url_sets)
+            if rng.random() < 0.75:
+                text = rng.choice(REQUESTS)[1]
+                expected_hits += 1
+            else:
+                text = rng.choice(UNRELATED)
+            cache.lookup(f"{text} https://example.com/doc-{i}.pdf")
+
+        stats = cache.stats()
+        print(f"entries={stats['entries']} url_sets={url_sets} threshold={args.threshold}")
+        print(f"hit_rate={stats['hit_rate']:.1%} (paraphrase share {expected_hits / args.queries:.1%})")
+        print(f"lookup p50={stats['lookup_ms_p50']:.3f} ms  p95={stats['lookup_ms_p95']:.3f} ms")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: sequential route-mode dispatch vs. concurrent per-source dispatch.
+
+Simulates source processor agents with fixed latencies (no LLM calls) and compares
+the wall time of processing a prompt's sources one at a time through a routing leader
+with running them concurrently on a bounded pool via run_with_timeouts. One source is
+made to hang, which shows that its timeout does not hold up the others.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_source_dispatch.py
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parallel import run_with_timeouts  # noqa: E402
+
+
+def fake_agent(latency: float, label: str):
+    def run():
+        time.sleep(latency)
+        return f"summary of {label}"
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leader-latency", type=float, default=0.4, help="Seconds the routing leader adds per source")
+    parser.add_argument("--source-latency", type=float, default=1.0, help="Seconds per source agent run")
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=2.0, help="Per-source timeout")
+    args = parser.parse_args()
+
+    sources = [f"source-{i}" for i in range(args.sources)]
+
+    start = time.perf_counter()
+    for source in sources:
+        time.sleep(args.leader_latency)
+        fake_agent(args.source_latency, source)()
+    route_s = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        calls = {source: fake_agent(args.source_latency, source) for source in sources}
+        start = time.perf_counter()
+        outcomes = run_with_timeouts(executor, calls, args.timeout)
+        concurrent_s = time.perf_counter() - start
+        assert all(error is None for _, error in outcomes.values())
+
+        # One hanging source: the others still finish on time
+        calls = {source: fake_agent(args.source_latency, source) for source in sources}
+        calls["hanging"] = fake_agent(args.timeout * 3, "hanging")
+        start = time.perf_counter()
+        outcomes = run_with_timeouts(executor, calls, args.timeout)
+        hanging_s = time.perf_counter() - start
+        failed = [key for key, (_, error) in outcomes.items() if error is not None]
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"sources={args.sources}  source latency={args.source_latency}s  leader latency={args.leader_latency}s")
+    print(f"route (sequential)    : {route_s:.2f} s")
+    print(f"concurrent            : {concurrent_s:.2f} s  ({route_s / concurrent_s:.1f}x faster)")
+    print(f"concurrent + hanging  : {hanging_s:.2f} s  timed out={failed}  order={list(outcomes)}")
+
+
+if __name__ == "__main__":
+    main()
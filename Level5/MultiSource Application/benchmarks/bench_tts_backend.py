@@ -0,0 +1,78 @@
+"""
+Benchmark: per-segment latency of DirectTTSBackend vs. the agent TTS path.
+
+Synthesizes a conversation's segments one at a time against a local fake ElevenLabs
+server (--latency seconds per request, plus a little per character):
+  - agent: a stand-in for AgentTTSBackend / l5-2's per-segment agent. Gemini cannot be
+    called here, so each segment waits --llm-latency twice (the model's tool call, then
+    its reply to the tool result) around a TTS request on a fresh HTTP client, as the
+    per-segment ElevenLabsTools client makes;
+  - direct: DirectTTSBackend, one request per segment over a pooled client.
+Prints each segment's latency and the mean and max per backend.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_tts_backend.py --segments 10 --latency 0.5 --llm-latency 0.8
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.utils.log import logger  # noqa: E402
+from fixtures import fake_audio, page_text, serve_tts  # noqa: E402
+from utils.tts_backend import DEFAULT_MODEL_ID, DirectTTSBackend  # noqa: E402
+
+VOICES = ("JBFqnCBsd6RMkjVDRZzb", "21m00Tcm4TlvDq8ikWAM")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per TTS request")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Seconds per simulated Gemini round trip")
+    args = parser.parse_args()
+    # Latencies are printed below; keep the backend's per-segment log lines out of the table
+    logger.setLevel(logging.WARNING)
+
+    url, server = serve_tts(latency=args.latency)
+    segments = [(VOICES[i % 2], " ".join(page_text(i, 10 + 15 * (i % 4)))) for i in range(args.segments)]
+
+    def agent_synthesize(text: str, voice_id: str) -> bytes:
+        time.sleep(args.llm_latency)  # model decides to call text_to_speech
+        with httpx.Client(base_url=url, timeout=30) as client:
+            response = client.post(f"/v1/text-to-speech/{voice_id}", json={"text": text, "model_id": DEFAULT_MODEL_ID})
+            response.raise_for_status()
+        time.sleep(args.llm_latency)  # model answers after the tool result
+        return response.content
+
+    direct = DirectTTSBackend(api_key="bench", base_url=url)
+    results = {}
+    for label, synthesize in (("agent", agent_synthesize), ("direct", direct.synthesize)):
+        latencies = []
+        for voice_id, text in segments:
+            start = time.perf_counter()
+            audio = synthesize(text, voice_id)
+            latencies.append(time.perf_counter() - start)
+            if audio != fake_audio(voice_id, text):
+                raise RuntimeError(f"{label}: unexpected audio")
+        results[label] = latencies
+    direct.close()
+    server.shutdown()
+
+    print(f"{args.segments} segments, TTS latency={args.latency}s, simulated LLM round trip={args.llm_latency}s")
+    print(f"  {'segment':>7} {'chars':>6} " + " ".join(f"{label:>10}" for label in results))
+    for index, (_, text) in enumerate(segments):
+        print(f"  {index + 1:>7} {len(text):>6} "
+              + " ".join(f"{latencies[index] * 1000:8.0f}ms" for latencies in results.values()))
+    for label, latencies in results.items():
+        print(f"  {label:<7} mean={sum(latencies) / len(latencies) * 1000:7.0f} ms  max={max(latencies) * 1000:7.0f} ms  "
+              f"total={sum(latencies):6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: podcast synthesis with and without the TTS segment cache.
+
+Builds conversations that reuse stock lines ("Great point.", "Welcome back!") between
+unique ones and synthesizes them through TTSScheduler and DirectTTSBackend against a
+local fake ElevenLabs server (--latency seconds per request):
+  - uncached: every segment is a TTS request;
+  - cold cache: an empty TTSSegmentCache, so only the first use of each line per voice
+    is a request;
+  - warm cache: the same conversation again after a restart, as when a podcast is
+    regenerated after a workflow cache eviction;
+  - bounded: --conversations different conversations through a cache capped at
+    --max-bytes, to show LRU eviction.
+Prints wall time, TTS requests, hit rate, evictions and bytes on disk.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_tts_cache.py --segments 20 --latency 0.5
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.utils.log import logger  # noqa: E402
+from fixtures import fake_audio, page_text, serve_tts  # noqa: E402
+from utils.tts_backend import DirectTTSBackend  # noqa: E402
+from utils.tts_cache import CachedTTSBackend, TTSSegmentCache  # noqa: E402
+from utils.tts_scheduler import TTSScheduler  # noqa: E402
+
+VOICES = {"SPEAKER_A": "JBFqnCBsd6RMkjVDRZzb", "SPEAKER_B": "21m00Tcm4TlvDq8ikWAM"}
+STOCK_LINES = ("Welcome back!", "Great point.", "Exactly.", "That's fascinating.", "Let's dig into that.",
+               "Absolutely.", "Thanks for joining us.")
+
+
+def conversation(count: int, seed: int):
+    rng = random.Random(seed)
+    speakers = ("SPEAKER_A", "SPEAKER_B")
+    return [{"speaker": speakers[i % 2],
+             "text": rng.choice(STOCK_LINES) if i % 2 else " ".join(page_text(i, 20, seed))}
+            for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per TTS request")
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--max-bytes", type=int, default=8192)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    url, server = serve_tts(latency=args.latency, char_latency=0.0)
+    direct = DirectTTSBackend(api_key="bench", base_url=url)
+    segments = conversation(args.segments, seed=0)
+    print(f"{args.segments} segments ({len({s['text'] for s in segments})} distinct lines), "
+          f"latency={args.latency}s, {args.concurrency} at a time")
+
+    def run(label: str, backend, conversations):
+        server.stats.update(requests=0)
+        scheduler = TTSScheduler(lambda text, speaker: backend.synthesize(text, VOICES[speaker]),
+                                 max_concurrency=args.concurrency)
+        start = time.perf_counter()
+        for segments in conversations:
+            audio = scheduler.synthesize_all(segments)
+            if audio != [fake_audio(VOICES[s["speaker"]], s["text"]) for s in segments]:
+                raise RuntimeError(f"{label}: unexpected audio")
+        elapsed = time.perf_counter() - start
+        scheduler.close()
+        line = f"  {label:<12} {elapsed:7.2f} s  tts requests={server.stats['requests']:3d}"
+        if isinstance(backend, CachedTTSBackend):
+            stats = backend.stats()
+            line += (f"  hit rate={stats['hit_rate']:.2f}  evicted={stats['evicted']:3d}  "
+                     f"entries={stats['entries']:3d}  bytes={stats['bytes']}")
+        print(line)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("uncached", direct, [segments])
+        directory = os.path.join(tmp, "unbounded")
+        run("cold cache", CachedTTSBackend(direct, TTSSegmentCache(directory, max_bytes=None)), [segments])
+        # A new cache on the same directory, as after a restart
+        run("warm cache", CachedTTSBackend(direct, TTSSegmentCache(directory, max_bytes=None)), [segments])
+        bounded = CachedTTSBackend(direct, TTSSegmentCache(os.path.join(tmp, "bounded"), max_bytes=args.max_bytes))
+        run(f"bounded x{args.conversations}", bounded,
+            [conversation(args.segments, seed) for seed in range(args.conversations)])
+    direct.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
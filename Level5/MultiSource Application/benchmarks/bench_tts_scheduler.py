@@ -0,0 +1,103 @@
+"""
+Benchmark: one-at-a-time podcast segment synthesis vs. TTSScheduler.
+
+Synthesizes a conversation's segments against a local fake TTS server that takes
+--latency seconds (plus a little per character) per request, answers 429 beyond
+--server-concurrency requests in flight, and fails --failure-rate of requests with 500:
+  - sequential: the previous path, one segment at a time with a --sleep pause after
+    each and up to 3 attempts per segment;
+  - TTSScheduler at each concurrency in --concurrency, optionally paced by --rps.
+Prints wall time, requests, 429s, 500s and retries, and checks the audio comes back in
+segment order.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_tts_scheduler.py --segments 10 --sleep 5 --concurrency 1 2 4 8
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.utils.log import logger  # noqa: E402
+from fixtures import fake_audio, page_text, serve_tts  # noqa: E402
+from utils.rate_limit import TokenBucket  # noqa: E402
+from utils.tts_backend import DirectTTSBackend  # noqa: E402
+from utils.tts_scheduler import TTSScheduler  # noqa: E402
+
+VOICES = {"SPEAKER_A": "JBFqnCBsd6RMkjVDRZzb", "SPEAKER_B": "21m00Tcm4TlvDq8ikWAM"}
+
+
+def conversation(count: int):
+    speakers = ("SPEAKER_A", "SPEAKER_B")
+    return [{"speaker": speakers[i % 2], "text": " ".join(page_text(i, 10 + 15 * (i % 4)))} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per TTS request")
+    parser.add_argument("--server-concurrency", type=int, default=4, help="Requests in flight before 429")
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--sleep", type=float, default=5.0, help="Pause after each segment in the sequential path")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rps", type=float, default=None, help="TTSScheduler requests/second cap")
+    parser.add_argument("--retry-delay", type=float, default=0.5)
+    args = parser.parse_args()
+    # Failed attempts are expected here; keep their log lines out of the table
+    logger.setLevel(logging.CRITICAL)
+
+    url, server = serve_tts(latency=args.latency, max_concurrent=args.server_concurrency,
+                            failure_rate=args.failure_rate)
+    backend = DirectTTSBackend(api_key="bench", base_url=url, max_connections=32)
+    segments = conversation(args.segments)
+    expected = [fake_audio(VOICES[s["speaker"]], s["text"]) for s in segments]
+
+    def synthesize(text: str, speaker: str) -> bytes:
+        return backend.synthesize(text, VOICES[speaker])
+
+    def sequential():
+        audio = []
+        for segment in segments:
+            for attempt in range(3):
+                try:
+                    audio.append(synthesize(segment["text"], segment["speaker"]))
+                    time.sleep(args.sleep)
+                    break
+                except Exception:
+                    if attempt == 2:
+                        raise
+                    time.sleep(args.retry_delay)
+        return audio
+
+    def run(label: str, synthesize_all, retries=lambda: 0):
+        server.stats.update(requests=0, rejected=0, failed=0, max_in_flight=0)
+        start = time.perf_counter()
+        try:
+            audio, outcome = synthesize_all(), ""
+        except RuntimeError as e:
+            audio, outcome = None, f"  FAILED: {str(e)[:60]}"
+        elapsed = time.perf_counter() - start
+        if audio is not None and audio != expected:
+            raise RuntimeError(f"{label}: audio is not in segment order")
+        stats = server.stats
+        print(f"  {label:<16} {elapsed:7.2f} s  requests={stats['requests']:3d}  429s={stats['rejected']:3d}  "
+              f"500s={stats['failed']:3d}  retries={retries():3d}  max in flight={stats['max_in_flight']}{outcome}")
+
+    print(f"{args.segments} segments, latency={args.latency}s, server limit={args.server_concurrency} in flight, "
+          f"failure rate={args.failure_rate}")
+    run(f"sequential+{args.sleep:g}s", sequential)
+    for concurrency in args.concurrency:
+        scheduler = TTSScheduler(synthesize, max_concurrency=concurrency, retry_delay=args.retry_delay,
+                                 rate_limiter=TokenBucket(args.rps) if args.rps else None)
+        run(f"scheduler x{concurrency}", lambda: scheduler.synthesize_all(segments),
+            lambda: scheduler.stats()["retries"])
+        scheduler.close()
+    backend.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
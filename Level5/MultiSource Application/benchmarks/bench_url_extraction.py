@@ -0,0 +1,83 @@
+"""
+Benchmark: local URL extraction vs. the URL Handler + JSON Corrector agents.
+
+Runs extract_urls_locally over a corpus of realistic prompts with hand-labelled
+expected output and prints the per-prompt latency, the share of prompts handled
+locally (no agent fallback) and the accuracy of the confident results. Every prompt
+handled locally saves two LLM round trips in Step 1 of the workflow.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_url_extraction.py
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.url_utils import extract_urls_locally  # noqa: E402
+
+# (prompt, expected pdf_urls, youtube_urls, web_urls); None marks prompts that should fall back
+CORPUS = [
+    ("summarize https://example.com/doc.pdf", ["https://example.com/doc.pdf"], [], []),
+    ("summarize the", [], [], []),
+    ("Create a podcast from https://www.youtube.com/watch?v=69tPv5xZJjc",
+     [], ["https://www.youtube.com/watch?v=69tPv5xZJjc"], []),
+    ("mindmap of youtu.be/69tPv5xZJjc please", [], ["https://youtu.be/69tPv5xZJjc"], []),
+    ("Compare www.adobe.com/sample.pdf with https://en.wikipedia.org/wiki/Large_language_model.",
+     ["https://www.adobe.com/sample.pdf"], [], ["https://en.wikipedia.org/wiki/Large_language_model"]),
+    ("What does agno.com say about agents?", [], [], ["https://agno.com"]),
+    ("Summarize https://arxiv.org/pdf/1706.03762.pdf and https://arxiv.org/pdf/1706.03762.pdf",
+     ["https://arxiv.org/pdf/1706.03762.pdf"], [], []),
+    ("Podcast: https://docs.python.org/3/tutorial/index.html, https://www.youtube.com/watch?v=abc123&t=42s",
+     [], ["https://www.youtube.com/watch?v=abc123&t=42s"], ["https://docs.python.org/3/tutorial/index.html"]),
+    ("check www.example please", [], [], ["https://www.example.com"]),
+    ("https://github.com/agno-agi/agno", [], [], ["https://github.com/agno-agi/agno"]),
+    ("Read https://www.nasa.gov/news/ and www.mit.edu/research/",
+     [], [], ["https://www.nasa.gov/news/", "https://www.mit.edu/research/"]),
+    ("podcast from https://huggingface.co/blog/agents", [], [], ["https://huggingface.co/blog/agents"]),
+    ("Explain the attention mechanism in two paragraphs", [], [], []),
+    ("summarize bbc.co.uk/news/technology", None, None, None),
+    ("email the summary to me@example.com", None, None, None),
+    ("see (https://en.wikipedia.org/wiki/Python_(programming_language))", None, None, None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="Timing rounds over the corpus")
+    args = parser.parse_args()
+
+    confident = correct = expected_fallbacks = missed_fallbacks = 0
+    for prompt, *expected in CORPUS:
+        result, issues = extract_urls_locally(prompt)
+        if expected[0] is None:
+            expected_fallbacks += 1
+            if not issues:
+                missed_fallbacks += 1
+                print(f"  should have fallen back: {prompt!r} -> {result}")
+            continue
+        if issues:
+            print(f"  unnecessary fallback: {prompt!r} ({issues})")
+            continue
+        confident += 1
+        got = [result["pdf_urls"], result["youtube_urls"], result["web_urls"]]
+        if got == expected:
+            correct += 1
+        else:
+            print(f"  mismatch: {prompt!r} -> {got}, expected {expected}")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for prompt, *_ in CORPUS:
+            extract_urls_locally(prompt)
+    per_prompt = (time.perf_counter() - start) / (args.rounds * len(CORPUS))
+
+    print(f"prompts={len(CORPUS)}  handled locally={confident + missed_fallbacks}/{len(CORPUS)}  "
+          f"accuracy={correct}/{confident}  fallbacks={expected_fallbacks - missed_fallbacks}/{expected_fallbacks}")
+    print(f"extract_urls_locally: {per_prompt * 1e6:.1f} us per prompt (agents: 2 LLM calls per prompt)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: Chroma vs. NumpyVectorDb (flat and IVF) for insert and query throughput.
+
+Inserts the same clustered synthetic embeddings (stand-ins for chunk embeddings, so no
+embedder is involved) into a persistent Chroma collection and into NumpyVectorDb, then
+runs the same query vectors against each: one query per call, and for NumpyVectorDb also
+all queries in one batched call. Prints open time, insert rows/sec, queries/sec and
+recall@k against exact search.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_vector_backends.py --rows 50000 --dimensions 768
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chromadb  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.numpy_vectordb import NumpyVectorDb  # noqa: E402
+
+INSERT_BATCH = 1000
+
+
+def clustered_vectors(rows: int, dimensions: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, rows)] + 0.6 * rng.standard_normal((rows, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall(results, truth) -> float:
+    return float(np.mean([len(set(r) & set(t)) / len(t) for r, t in zip(results, truth)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dimensions", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    vectors = clustered_vectors(args.rows, args.dimensions, clusters=max(8, args.rows // 250), seed=0)
+    queries = clustered_vectors(args.queries, args.dimensions, clusters=max(8, args.rows // 250), seed=0)
+    queries = queries + 0.05 * np.random.default_rng(1).standard_normal(queries.shape).astype(np.float32)
+    ids = [f"chunk-{i}" for i in range(args.rows)]
+    texts = [f"chunk text {i}" for i in range(args.rows)]
+    metadatas = [{"page": i % 50} for i in range(args.rows)]
+    print(f"{args.rows} rows x {args.dimensions} dimensions, {args.queries} queries, top-{args.top_k}")
+
+    # Only used for query text; the benchmark passes embeddings directly
+    embedder = LocalHashEmbedder(dimensions=args.dimensions)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+
+        def insert(collection) -> float:
+            start = time.perf_counter()
+            for i in range(0, args.rows, INSERT_BATCH):
+                collection.add(ids=ids[i:i + INSERT_BATCH], embeddings=vectors[i:i + INSERT_BATCH],
+                               documents=texts[i:i + INSERT_BATCH], metadatas=metadatas[i:i + INSERT_BATCH])
+            return time.perf_counter() - start
+
+        def report(label: str, open_seconds: float, insert_seconds: float, query_seconds: float, hits):
+            results[label] = hits
+            insert_rate = f"{args.rows / insert_seconds:9.0f} rows/s" if insert_seconds else " " * 14
+            print(f"  {label:<16} open={open_seconds * 1000:7.1f} ms  insert={insert_rate}  "
+                  f"query={args.queries / query_seconds:8.0f} q/s", end="")
+            if "exact" in results and label != "numpy flat":
+                print(f"  recall@{args.top_k}={recall(hits, results['exact']):.3f}")
+            else:
+                print()
+
+        # NumpyVectorDb, exact search
+        start = time.perf_counter()
+        flat = NumpyVectorDb("bench", embedder=embedder, path=os.path.join(tmp, "numpy"))
+        flat.create()
+        flat_open = time.perf_counter() - start
+        flat_insert = insert(flat.collection)
+        start = time.perf_counter()
+        flat_hits = [[d.id for d in flat.search_by_embeddings([q], args.top_k)[0]] for q in queries]
+        flat_query = time.perf_counter() - start
+        results["exact"] = flat_hits
+        report("numpy flat", flat_open, flat_insert, flat_query, flat_hits)
+
+        start = time.perf_counter()
+        batched = flat.search_by_embeddings(queries, args.top_k)
+        report("numpy batched", 0.0, 0.0, time.perf_counter() - start, [[d.id for d in docs] for docs in batched])
+
+        # Reopen the same files with IVF partitioning
+        start = time.perf_counter()
+        ivf = NumpyVectorDb("bench", embedder=embedder, path=os.path.join(tmp, "numpy"), index="ivf",
+                            nprobe=args.nprobe, ivf_min_rows=0)
+        ivf.get_count()
+        ivf_open = time.perf_counter() - start
+        start = time.perf_counter()
+        ivf.train_ivf()
+        print(f"  (IVF training: {(time.perf_counter() - start) * 1000:.0f} ms)")
+        start = time.perf_counter()
+        ivf_hits = [[d.id for d in ivf.search_by_embeddings([q], args.top_k)[0]] for q in queries]
+        report(f"numpy ivf/{args.nprobe}", ivf_open, 0.0, time.perf_counter() - start, ivf_hits)
+
+        # Chroma (persistent client, cosine HNSW); last, as its background indexing threads
+        # would otherwise compete with the NumPy measurements
+        start = time.perf_counter()
+        client = chromadb.PersistentClient(path=os.path.join(tmp, "chroma"))
+        collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+        chroma_open = time.perf_counter() - start
+        chroma_insert = insert(collection)
+        start = time.perf_counter()
+        chroma_hits = [collection.query(query_embeddings=[q.tolist()], n_results=args.top_k)["ids"][0] for q in queries]
+        chroma_query = time.perf_counter() - start
+
+        report("chroma", chroma_open, chroma_insert, chroma_query, chroma_hits)
+
+
+if __name__ == "__main__":
+    main()
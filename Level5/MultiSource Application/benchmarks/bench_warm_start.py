@@ -0,0 +1,80 @@
+"""
+Benchmark: startup time of l4-w's knowledge base, loaded at import vs. warm-started.
+
+Serves a synthetic PDF from a local HTTP server and builds the knowledge base three ways:
+the previous import-time load (in-memory Chroma, ingested before the module finishes
+importing), and BackgroundKnowledgeLoader over a persistent Chroma store, first with an
+empty store (cold) and then after a restart with the store and manifest intact (warm).
+Prints how long startup is blocked, the time until questions can be answered and how many
+HTTP requests were made. Embeddings come from LocalHashEmbedder, so no API is called.
+
+Usage (from the MultiSource Application directory):
+    python benchmarks/bench_warm_start.py --pages 300
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agno.knowledge.pdf_url import PDFUrlKnowledgeBase, PDFUrlReader  # noqa: E402
+from fixtures import make_pdf, serve_directory  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.numpy_vectordb import create_vector_db  # noqa: E402
+from utils.pdf_ingest import IncrementalPDFIngestor  # noqa: E402
+from utils.warm_start import BackgroundKnowledgeLoader  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    embedder = LocalHashEmbedder()
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "doc.pdf"), "wb") as f:
+            f.write(make_pdf(args.pages))
+        base_url, server = serve_directory(tmp)
+        requests = []
+        finish_request = server.finish_request
+
+        def counting_finish_request(request, client_address):
+            requests.append(client_address)
+            finish_request(request, client_address)
+
+        server.finish_request = counting_finish_request
+        urls = [f"{base_url}/doc.pdf"]
+
+        def knowledge_base(path):
+            vector_db = create_vector_db("chroma", "doc", embedder, path=path)
+            return PDFUrlKnowledgeBase(urls=urls, vector_db=vector_db, embedder=embedder, reader=PDFUrlReader())
+
+        def report(label: str, blocked: float, ready: float):
+            print(f"  {label:<22} startup blocked={blocked * 1000:8.1f} ms  ready after={ready * 1000:8.1f} ms  "
+                  f"http requests={len(requests)}")
+            requests.clear()
+
+        print(f"{args.pages}-page PDF")
+        start = time.perf_counter()
+        kb = knowledge_base(None)
+        IncrementalPDFIngestor(kb, manifest_path=os.path.join(tmp, "memory.json")).ingest(urls)
+        elapsed = time.perf_counter() - start
+        report("import-time load", elapsed, elapsed)
+
+        store = os.path.join(tmp, "store")
+        for label in ("background, cold store", "background, warm store"):
+            start = time.perf_counter()
+            kb = knowledge_base(store)
+            loader = BackgroundKnowledgeLoader(
+                kb, ingestor=IncrementalPDFIngestor(kb, manifest_path=os.path.join(tmp, "store.json"))
+            ).start()
+            blocked = time.perf_counter() - start
+            loader.wait()
+            report(label, blocked, time.perf_counter() - start)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
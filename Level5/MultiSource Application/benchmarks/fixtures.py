@@ -0,0 +1,243 @@
+"""
+Shared fixtures for the benchmark scripts: synthetic PDFs and chunks, a local HTTP server
+standing in for the sites PDFs are downloaded from, a fake remote embedder, a fake
+TTS server and synthetic MP3s.
+
+Import after adding the MultiSource Application directory to sys.path.
+"""
+import json
+import time
+import random
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from agno.document import Document
+from utils.local_embedder import LocalHashEmbedder
+
+WORDS = ("agent", "model", "context", "retrieval", "vector", "summary", "podcast", "knowledge", "latency",
+         "workflow", "embedding", "transcript", "source", "prompt", "cache", "token", "chunk", "query")
+
+
+def page_text(page_number: int, words: int = 400, seed: int = 0) -> List[str]:
+    """Deterministic lines of text for one page."""
+    rng = random.Random(seed * 1_000_003 + page_number)
+    tokens = [rng.choice(WORDS) for _ in range(words)]
+    return [" ".join(tokens[i:i + 12]) for i in range(0, len(tokens), 12)]
+
+
+def make_pdf(pages: int, words_per_page: int = 400, seed: int = 0, changed_pages: Optional[set] = None) -> bytes:
+    """
+    Build a minimal text PDF.
+
+    Args:
+        pages: Number of pages.
+        words_per_page: Words of generated text on each page.
+        seed: Text seed; the same seed gives the same bytes.
+        changed_pages: 1-based page numbers whose text uses a different seed, to simulate an edit.
+    """
+    changed_pages = changed_pages or set()
+    objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for number in range(1, pages + 1):
+        lines = page_text(number, words_per_page, seed + (7919 if number in changed_pages else 0))
+        stream = "BT /F1 9 Tf 11 TL 40 780 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        stream_bytes = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream_bytes) + stream_bytes + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % content_ref)
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % pages
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for index, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % index + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    # Simulated network costs: once per new connection (TCP/TLS setup) and per response
+    connect_latency = 0.0
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+        time.sleep(self.connect_latency)
+
+    def send_head(self):
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        time.sleep(self.latency)
+        return super().send_head()
+
+
+def serve_directory(directory: str, latency: float = 0.0, connect_latency: float = 0.0,
+                    keep_alive: bool = False) -> Tuple[str, ThreadingHTTPServer]:
+    """
+    Serve a directory over HTTP on a free local port (with Last-Modified / 304 support).
+
+    Args:
+        directory: Directory to serve.
+        latency: Seconds added before each response.
+        connect_latency: Seconds added once per new connection.
+        keep_alive: Speak HTTP/1.1, so clients can reuse connections.
+
+    Returns:
+        (base_url, server); server.stats counts connections and requests. Call
+        server.shutdown() when done.
+    """
+    handler = type("_Handler", (_QuietHandler,), {
+        "latency": latency,
+        "connect_latency": connect_latency,
+        "protocol_version": "HTTP/1.1" if keep_alive else "HTTP/1.0",
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=directory))
+    server.stats = {"connections": 0, "requests": 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def make_documents(count: int, seed: int, words: int = 150):
+    """Chunk-sized agno Documents with deterministic text."""
+    return [Document(name="bench", content=" ".join(page_text(i, words, seed)), meta_data={"page": i})
+            for i in range(1, count + 1)]
+
+
+class FakeRemoteEmbedder(LocalHashEmbedder):
+    """LocalHashEmbedder with simulated per-request and per-text latency."""
+
+    def __init__(self, request_latency: float, text_latency: float):
+        super().__init__()
+        self.request_latency = request_latency
+        self.text_latency = text_latency
+        self.requests = 0
+
+    def get_embedding(self, text):
+        self.requests += 1
+        time.sleep(self.request_latency + self.text_latency)
+        return super().get_embedding(text)
+
+    def get_embeddings(self, texts):
+        self.requests += 1
+        time.sleep(self.request_latency + self.text_latency * len(texts))
+        return [LocalHashEmbedder.get_embedding(self, text) for text in texts]
+
+
+class _FakeTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        voice_id = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        with server.stats_lock:
+            server.stats["requests"] += 1
+            server.in_flight += 1
+            server.stats["max_in_flight"] = max(server.stats["max_in_flight"], server.in_flight)
+            rejected = server.in_flight > server.max_concurrent
+            failed = not rejected and server.rng.random() < server.failure_rate
+            server.stats["rejected"] += rejected
+            server.stats["failed"] += failed
+        try:
+            if rejected:
+                status, body = 429, b'{"detail": "too_many_concurrent_requests"}'
+            else:
+                time.sleep(server.latency + server.char_latency * len(request["text"]))
+                status = 500 if failed else 200
+                body = b"error" if failed else fake_audio(voice_id, request["text"])
+        finally:
+            with server.stats_lock:
+                server.in_flight -= 1
+        self.send_response(status)
+        self.send_header("Content-Type", "audio/mpeg" if status == 200 else "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def fake_audio(voice_id: str, text: str) -> bytes:
+    """Bytes the fake TTS server returns for a segment; identifies the voice and text."""
+    return f"FAKEMP3|{voice_id}|{text}".encode()
+
+
+def serve_tts(latency: float = 0.5, char_latency: float = 0.002, max_concurrent: int = 4,
+              failure_rate: float = 0.0, seed: int = 0) -> Tuple[str, ThreadingHTTPServer]:
+    """
+    Serve a fake ElevenLabs text-to-speech API: POST {"text", "model_id"} as JSON to
+    /v1/text-to-speech/<voice_id> and get fake_audio(voice_id, text) back.
+
+    Args:
+        latency: Seconds per request, plus char_latency per character of text.
+        max_concurrent: Requests beyond this many in flight get 429, like a provider's plan limit.
+        failure_rate: Fraction of accepted requests that fail with 500.
+        seed: Seed for which requests fail.
+
+    Returns:
+        (base_url, server); server.stats counts requests, rejected (429), failed (500) and
+        max_in_flight. Call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTTSHandler)
+    server.latency = latency
+    server.char_latency = char_latency
+    server.max_concurrent = max_concurrent
+    server.failure_rate = failure_rate
+    server.rng = random.Random(seed)
+    server.in_flight = 0
+    server.stats = {"requests": 0, "rejected": 0, "failed": 0, "max_in_flight": 0}
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def make_mp3(seconds: float, seed: int = 0, bitrate_kbps: int = 64, tags: bool = True) -> bytes:
+    """
+    Build a CBR MPEG-1 Layer III, 44.1 kHz mono stream shaped like a TTS response.
+
+    Frames carry zero side info and random main data: valid frame structure for splicing
+    and parsing, not decodable speech. With tags, the stream has an ID3v2 tag, an Info
+    header frame and an ID3v1 tag around the audio frames.
+    """
+    rng = random.Random(seed)
+    sample_rate, bitrate = 44100, bitrate_kbps * 1000
+    bitrate_index = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320).index(bitrate_kbps)
+    frames = max(1, round(seconds * sample_rate / 1152))
+    out = bytearray()
+    if tags:
+        out += b"ID3\x04\x00\x00\x00\x00\x00\x20" + bytes(32)
+
+    remainder = 0
+
+    def frame(payload: bytes = b"") -> bytes:
+        nonlocal remainder
+        remainder += 144 * bitrate % sample_rate
+        padding = remainder >= sample_rate
+        remainder -= sample_rate if padding else 0
+        length = 144 * bitrate // sample_rate + padding
+        header = bytes((0xFF, 0xFB, bitrate_index << 4 | padding << 1, 0xC4))
+        body = bytes(17) + payload
+        return header + (body + rng.randbytes(length - 4 - len(body)) if not payload else body.ljust(length - 4, b"\x00"))
+
+    if tags:
+        out += frame(b"Info")
+    for _ in range(frames):
+        out += frame()
+    if tags:
+        out += b"TAG" + bytes(125)
+    return bytes(out)
+
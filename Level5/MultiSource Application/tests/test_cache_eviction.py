@@ -0,0 +1,109 @@
+"""
+CacheEvictor with an ArtifactStore: artifacts are recorded at save time and collected once unreferenced.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+import time
+import base64
+import sqlite3
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from utils.artifact_store import ArtifactStore  # noqa: E402
+from utils.cache_backend import SQLiteCacheBackend  # noqa: E402
+from utils.cache_eviction import CacheEvictor  # noqa: E402
+from utils.cache_keys import canonical_cache_key  # noqa: E402
+from utils.cache_payload import MissingArtifactError, artifact_refs, decode_payload, encode_payload  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.semantic_cache import SemanticCache  # noqa: E402
+
+
+def audio_response(content: str, audio: bytes):
+    return SimpleNamespace(content=content, audio=[SimpleNamespace(base64_audio=base64.b64encode(audio).decode())])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), "workflow_cache", canonical_cache_key)
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    yield backend, store
+    backend.close()
+
+
+def saved(backend, store, prompt, response):
+    payload = encode_payload(response, store)
+    backend.save(prompt, payload, artifact_sizes={ref: store.size(ref) for ref in artifact_refs(payload)})
+    return payload
+
+
+def test_evicted_rows_release_their_artifacts(cache):
+    backend, store = cache
+    old = saved(backend, store, "first prompt", audio_response("first", b"a" * 1000))
+    saved(backend, store, "second prompt", audio_response("second", b"b" * 2000))
+    orphan = store.put_bytes(b"c" * 500, ".mp3")  # its row was never saved
+    size = backend.connection().execute(
+        "SELECT size_bytes FROM workflow_cache WHERE prompt = ?", ("first prompt",)).fetchone()[0]
+    assert size == len(old) + 1000
+
+    time.sleep(0.05)
+    backend.connection().execute("UPDATE workflow_cache SET last_access = '2000-01-01 00:00:00' "
+                                 "WHERE prompt = 'first prompt'")
+    backend.connection().commit()
+    evictor = CacheEvictor(backend, ttl=None, max_rows=1, artifact_store=store, artifact_grace_seconds=0)
+    result = evictor.run_once()
+
+    assert result["over_budget"] == 1
+    assert result["artifacts_deleted"] == 2
+    assert not store.exists(artifact_refs(old)[0]) and not store.exists(orphan)
+    assert [ref for ref, _, _ in store.iter_artifacts()] == [artifact_refs(backend.get("second prompt"))[0]]
+
+
+def test_evicted_rows_leave_the_semantic_cache(cache):
+    backend, _ = cache
+    semantic = SemanticCache(LocalHashEmbedder(), backend, threshold=0.5)
+    prompt = "summarize https://example.com/a.pdf"
+    backend.save(prompt, b"{}")
+    semantic.add(prompt, canonical_cache_key(prompt))
+    assert semantic.lookup(prompt) == canonical_cache_key(prompt)
+
+    CacheEvictor(backend, ttl=None, max_rows=0, semantic_cache=semantic).run_once()
+
+    assert semantic.lookup(prompt) is None
+    assert backend.connection().execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0] == 0
+
+
+def test_legacy_rows_are_indexed_once_with_their_artifact_sizes(tmp_path):
+    store = ArtifactStore(str(tmp_path / "artifacts"))
+    payload = encode_payload(audio_response("legacy", b"d" * 3000), store)
+    db_file = str(tmp_path / "cache.db")
+    conn = sqlite3.connect(db_file)
+    # Table as written before artifacts were recorded
+    conn.execute("CREATE TABLE workflow_cache (cache_key TEXT PRIMARY KEY, prompt TEXT, response TEXT, "
+                 "timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, last_access DATETIME DEFAULT CURRENT_TIMESTAMP, "
+                 "size_bytes INTEGER DEFAULT 0)")
+    conn.execute("INSERT INTO workflow_cache (cache_key, prompt, response, size_bytes) VALUES (?, ?, ?, ?)",
+                 (canonical_cache_key("legacy prompt"), "legacy prompt", payload, len(payload)))
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteCacheBackend(db_file, "workflow_cache", canonical_cache_key)
+    evictor = CacheEvictor(backend, ttl=None, artifact_store=store, artifact_grace_seconds=0)
+    time.sleep(0.05)
+    assert evictor.run_once()["artifacts_deleted"] == 0
+    size, indexed = backend.connection().execute(
+        "SELECT size_bytes, artifacts_indexed FROM workflow_cache").fetchone()
+    assert (size, indexed) == (len(payload) + 3000, 1)
+    assert store.exists(artifact_refs(payload)[0])
+    backend.close()
+
+
+def test_missing_audio_artifact_is_a_miss(cache):
+    _, store = cache
+    payload = encode_payload(audio_response("podcast", b"e" * 100), store)
+    store.delete(artifact_refs(payload)[0])
+    with pytest.raises(MissingArtifactError):
+        decode_payload(payload, store)
@@ -0,0 +1,47 @@
+"""
+Streamed podcast scripts: parsing team run events into speaker segments.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conversation_stream import (  # noqa: E402
+    iter_conversation_segments,
+    parse_conversation_segments,
+    team_content_stream,
+)
+
+VOICES = {"SPEAKER_A": "voice-a", "SPEAKER_B": "voice-b"}
+SCRIPT = "SPEAKER_A: Welcome to the show.\nSPEAKER_B: Thanks for having me.\nIt is great to be here.\nSPEAKER_A: Bye!\n"
+
+
+def chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_mixed_team_and_member_events_yield_only_the_leader_script():
+    member_draft = "SPEAKER_A: My own draft of the intro.\nSPEAKER_B: And my draft.\n"
+    events = [SimpleNamespace(event="TeamRunStarted", content=None)]
+    for leader, member in zip(chunks(SCRIPT, 7), chunks(member_draft, 5) + [""] * 20):
+        events.append(SimpleNamespace(event="RunResponseContent", content=member))
+        events.append(SimpleNamespace(event="TeamToolCallStarted", content=None))
+        events.append(SimpleNamespace(event="TeamRunResponseContent", content=leader))
+    events.append(SimpleNamespace(event="TeamRunCompleted", content=SCRIPT))
+
+    segments = list(iter_conversation_segments(team_content_stream(events), VOICES))
+
+    assert segments == [
+        {"speaker": "SPEAKER_A", "text": "Welcome to the show.", "voice_id": "voice-a"},
+        {"speaker": "SPEAKER_B", "text": "Thanks for having me. It is great to be here.", "voice_id": "voice-b"},
+        {"speaker": "SPEAKER_A", "text": "Bye!", "voice_id": "voice-a"},
+    ]
+
+
+def test_streamed_segments_match_batch_parse_for_any_chunking():
+    expected = parse_conversation_segments(SCRIPT, VOICES)
+    for size in range(1, len(SCRIPT) + 1):
+        assert list(iter_conversation_segments(chunks(SCRIPT, size), VOICES)) == expected
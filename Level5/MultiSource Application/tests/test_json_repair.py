@@ -0,0 +1,26 @@
+"""
+Local repair of URL Handler output: truncated objects must not lose URL lists.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_repair import repair_json  # noqa: E402
+
+
+def test_truncated_before_the_url_lists_falls_back_to_the_corrector():
+    assert repair_json('{"remaining_text":"summarize th') is None
+    assert repair_json('{"pdf_urls":["https://example.com/a.pdf"],"youtube_urls"') is None
+
+
+def test_truncated_after_the_url_lists_is_repaired():
+    result = repair_json('{"pdf_urls":["https://example.com/a.pdf"],"youtube_urls":[],"web_urls":[],"remaining_text":"sum')
+    assert result == {"pdf_urls": ["https://example.com/a.pdf"], "youtube_urls": [], "web_urls": [],
+                      "remaining_text": "sum", "errors": []}
+
+
+def test_intact_json_may_leave_out_empty_lists():
+    assert repair_json('{"web_urls":["https://example.com"]}')["web_urls"] == ["https://example.com"]
@@ -0,0 +1,54 @@
+"""
+NumpyVectorDb metadata filters: the indexed row mask agrees with matches_filter across writes.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from utils.numpy_vectordb import NumpyVectorDb, matches_filter  # noqa: E402
+
+FILTERS = [
+    {"doc_id": "d1"},
+    {"doc_id": {"$in": ["d0", "d2"]}},
+    {"doc_id": {"$nin": ["d0"]}},
+    {"doc_id": {"$ne": "d3"}},
+    {"doc_id": ["d1", "d3"]},
+    {"page": {"$gte": 3}},
+    {"$and": [{"doc_id": "d2"}, {"page": {"$lt": 5}}]},
+    {"$or": [{"doc_id": "d0"}, {"tag": "x"}]},
+    {"tag": {"$eq": None}},
+]
+
+
+def expected_ids(db: NumpyVectorDb, where):
+    return sorted(doc_id for doc_id, meta in zip(db._ids, db._metadata)
+                  if doc_id is not None and matches_filter(meta, where))
+
+
+def filtered_ids(db: NumpyVectorDb, where):
+    return sorted(db.collection.get(where=where, include=[])["ids"])
+
+
+def test_filter_mask_matches_python_filter_after_writes(tmp_path):
+    db = NumpyVectorDb(collection="test", path=str(tmp_path), embedder=object())
+    rng = np.random.default_rng(0)
+    ids = [f"row{i}" for i in range(40)]
+    metadatas = [{"doc_id": f"d{i % 4}", "page": i % 7, **({"tag": "x"} if i % 5 == 0 else {})} for i in range(40)]
+    db.collection.add(ids, rng.normal(size=(40, 8)), ["text"] * 40, metadatas)
+    for where in FILTERS:
+        assert filtered_ids(db, where) == expected_ids(db, where)
+
+    # Indexes built above must follow every kind of write
+    db.collection.upsert(["row1", "row40"], rng.normal(size=(2, 8)), ["a", "b"],
+                         [{"doc_id": "d3", "page": 1}, {"doc_id": "d1", "page": 6, "tag": "x"}])
+    db.collection.update(["row2"], [{"doc_id": "d0", "tag": "x"}])
+    db.collection.delete(where={"doc_id": "d2", "page": {"$gt": 4}})
+    for where in FILTERS:
+        assert filtered_ids(db, where) == expected_ids(db, where)
+
+    hits = db.search_by_embeddings(rng.normal(size=(1, 8)), limit=50, filters={"doc_id": {"$in": ["d1"]}})[0]
+    assert sorted(hit.meta_data["doc_id"] for hit in hits) == ["d1"] * len(expected_ids(db, {"doc_id": "d1"}))
@@ -0,0 +1,40 @@
+"""
+Source dispatch: per-call and overall timeouts of run_with_timeouts.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parallel import SourceTimeoutError, run_with_timeouts  # noqa: E402
+
+
+def test_queued_calls_are_cancelled_at_the_overall_deadline():
+    release = threading.Event()
+    ran = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # An abandoned call from an earlier batch still holds the only worker
+        executor.submit(release.wait, 5)
+        start = time.monotonic()
+        outcomes = run_with_timeouts(executor, {"a": lambda: ran.append("a"), "b": lambda: ran.append("b")},
+                                     timeout=60, total_timeout=0.3)
+        elapsed = time.monotonic() - start
+        release.set()
+    assert elapsed < 2
+    assert ran == []
+    for result, error in outcomes.values():
+        assert result is None and isinstance(error, SourceTimeoutError)
+
+
+def test_per_call_timeout_counts_from_start():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        outcomes = run_with_timeouts(executor, {"slow": lambda: time.sleep(1.5) or "slow", "fast": lambda: "fast"},
+                                     timeout=0.5, total_timeout=10)
+    assert isinstance(outcomes["slow"][1], SourceTimeoutError)
+    assert outcomes["fast"] == ("fast", None)
+    assert list(outcomes) == ["slow", "fast"]
@@ -0,0 +1,44 @@
+"""
+ParallelPDFExtractor after a worker process dies.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+import signal
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.join(APP_DIR, "benchmarks"))
+
+import pytest  # noqa: E402
+from fixtures import make_pdf  # noqa: E402
+from utils.pdf_extract import ParallelPDFExtractor, extract_page_range  # noqa: E402
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(make_pdf(12, words_per_page=50))
+    return str(path)
+
+
+def kill_workers(extractor: ParallelPDFExtractor):
+    for process in list(extractor._pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_broken_pool_is_replaced_and_the_document_completes(pdf_path):
+    expected = extract_page_range(pdf_path, 0, 12)
+    extractor = ParallelPDFExtractor(max_workers=2, pages_per_task=2, min_parallel_pages=0)
+    try:
+        broken = extractor._pool
+        kill_workers(extractor)
+        assert list(extractor.iter_page_texts(pdf_path)) == expected
+        assert extractor._pool is not broken
+        # Later documents keep working, on the new pool or in-process
+        assert list(extractor.iter_page_texts(pdf_path)) == expected
+    finally:
+        extractor.close()
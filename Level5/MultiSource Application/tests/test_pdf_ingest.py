@@ -0,0 +1,67 @@
+"""
+IncrementalPDFIngestor after a restart: the manifest survives on disk, the vector db does not.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.join(APP_DIR, "benchmarks"))
+
+import pytest  # noqa: E402
+from agno.knowledge.pdf_url import PDFUrlKnowledgeBase, PDFUrlReader  # noqa: E402
+from agno.vectordb.chroma import ChromaDb  # noqa: E402
+from fixtures import make_pdf, serve_directory  # noqa: E402
+from utils.local_embedder import LocalHashEmbedder  # noqa: E402
+from utils.pdf_ingest import IncrementalPDFIngestor  # noqa: E402
+
+
+@pytest.fixture
+def pdf_url(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "doc.pdf").write_bytes(make_pdf(3, words_per_page=200))
+    base_url, server = serve_directory(str(site))
+    yield f"{base_url}/doc.pdf"
+    server.shutdown()
+
+
+def make_ingestor(tmp_path, run: str) -> IncrementalPDFIngestor:
+    """An ingestor on a fresh vector db, sharing the manifest with every other run."""
+    embedder = LocalHashEmbedder()
+    vector_db = ChromaDb(collection="pdf_content", embedder=embedder,
+                         path=str(tmp_path / f"chroma_{run}"), persistent_client=True)
+    vector_db.create()
+    knowledge_base = PDFUrlKnowledgeBase(urls=[], vector_db=vector_db, embedder=embedder, reader=PDFUrlReader())
+    return IncrementalPDFIngestor(knowledge_base, manifest_path=str(tmp_path / "manifest.json"))
+
+
+def stored_chunks(ingestor: IncrementalPDFIngestor, url: str) -> int:
+    ids = ingestor.retriever([url]).ids
+    return len(ingestor._stored_ids(ids))
+
+
+def test_same_vector_db_skips_unchanged_pdf(tmp_path, pdf_url):
+    ingestor = make_ingestor(tmp_path, "first")
+    assert ingestor.ingest([pdf_url]) == {pdf_url: "new"}
+    assert ingestor.ingest([pdf_url]) == {pdf_url: "not_modified"}
+    assert ingestor.ingest_url(pdf_url) == "not_modified"
+
+
+@pytest.mark.parametrize("method", ["ingest", "ingest_url"])
+def test_restart_with_empty_vector_db_reingests(tmp_path, pdf_url, method):
+    first = make_ingestor(tmp_path, "first")
+    assert first.ingest([pdf_url]) == {pdf_url: "new"}
+    chunks = stored_chunks(first, pdf_url)
+    assert chunks > 0
+
+    # The server would answer 304 to the manifest's validators; the new vector db is empty
+    restarted = make_ingestor(tmp_path, "restarted")
+    assert restarted.validate([pdf_url]) == [pdf_url]
+    status = restarted.ingest([pdf_url])[pdf_url] if method == "ingest" else restarted.ingest_url(pdf_url)
+    assert status == "updated"
+    assert stored_chunks(restarted, pdf_url) == chunks
+    assert restarted.validate([pdf_url]) == []
+    assert restarted.ingest([pdf_url]) == {pdf_url: "not_modified"}
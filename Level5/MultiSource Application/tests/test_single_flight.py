@@ -0,0 +1,61 @@
+"""
+SingleFlight leases: renewed while the runner works, and bounded waits for followers.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from utils.cache_backend import SQLiteCacheBackend  # noqa: E402
+from utils.cache_keys import canonical_cache_key  # noqa: E402
+from utils.single_flight import SingleFlight  # noqa: E402
+
+KEY = "k" * 64
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), "workflow_cache", canonical_cache_key)
+    yield backend
+    backend.close()
+
+
+def test_slow_runner_keeps_its_lease(backend):
+    results = {}
+    runs = []
+
+    def slow():
+        runs.append(1)
+        time.sleep(1.0)
+        results[KEY] = "answer"
+        return "answer"
+
+    # Two instances stand in for two worker processes sharing the cache database
+    leader = SingleFlight(backend, lease_seconds=0.3, poll_interval=0.05)
+    other = SingleFlight(backend, lease_seconds=0.3, poll_interval=0.05)
+    thread = threading.Thread(target=leader.do, args=(KEY, slow, lambda: None))
+    thread.start()
+    time.sleep(0.1)
+    assert other.do(KEY, slow, lambda: results.get(KEY)) == "answer"
+    thread.join()
+    assert len(runs) == 1
+    assert other.stats()["lease_takeovers"] == 0
+
+
+def test_follower_runs_the_call_itself_after_its_wait(backend):
+    stuck = threading.Event()
+    flight = SingleFlight(backend, wait_seconds=0.3)
+    thread = threading.Thread(target=flight.do, args=(KEY, stuck.wait, lambda: None))
+    thread.start()
+    time.sleep(0.1)
+    start = time.monotonic()
+    assert flight.do(KEY, lambda: "own result", lambda: None) == "own result"
+    assert time.monotonic() - start < 2
+    assert flight.stats()["wait_timeouts"] == 1
+    stuck.set()
+    thread.join()
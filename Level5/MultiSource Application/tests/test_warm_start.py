@@ -0,0 +1,53 @@
+"""
+BackgroundKnowledgeLoader after a transient failure: retried with backoff, then on demand.
+
+Run from the MultiSource Application directory: python -m pytest tests
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.warm_start import BackgroundKnowledgeLoader  # noqa: E402
+
+URL = "https://example.com/doc.pdf"
+
+
+class FlakyIngestor:
+    """Fails the first `failures` ingests, as a network outage at startup would."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def validate(self, urls):
+        return list(urls)
+
+    def ingest(self, urls):
+        self.calls += 1
+        return {url: "failed" if self.calls <= self.failures else "ingested" for url in urls}
+
+
+def knowledge_base():
+    vector_db = SimpleNamespace(exists=lambda: True, collection=object())
+    return SimpleNamespace(urls=[URL], vector_db=vector_db)
+
+
+def test_transient_failure_is_retried_with_backoff():
+    ingestor = FlakyIngestor(failures=2)
+    loader = BackgroundKnowledgeLoader(knowledge_base(), ingestor=ingestor, retries=2,
+                                       retry_backoff_seconds=0.01).start()
+    assert loader.wait(5)
+    assert ingestor.calls == 3 and loader.results == {URL: "ingested"}
+
+
+def test_failed_load_is_restarted_by_retry():
+    ingestor = FlakyIngestor(failures=1)
+    loader = BackgroundKnowledgeLoader(knowledge_base(), ingestor=ingestor, retries=0).start()
+    assert not loader.wait(5)
+    assert loader.status == "failed"
+
+    assert loader.retry()
+    assert loader.wait(5) and loader.status == "ready"
+    assert not loader.retry()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import hashlib
+import tempfile
+from typing import Iterator, Optional, Tuple
+from agno.utils.log import logger
+
+# Content-addressed store for generated files (podcast audio, mindmap PNGs).
+# Files are stored once under <root>/<first two hex chars>/<sha256><ext>, and cache
+# payloads keep only the reference, so identical outputs are shared and rows stay small.
+# Nothing here knows which rows use a file; CacheEvictor deletes the ones no row references
+# (see utils/cache_eviction.py). Storing a file that already exists refreshes its mtime, so
+# the sweep's grace period covers the time between storing it and saving the row.
+
+
+class ArtifactStore:
+    """Write-once, content-addressed file store."""
+
+    def __init__(self, root: str = "tmp/artifacts"):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, ref: str) -> str:
+        """Path of the stored file for a reference like '<sha256>.mp3'."""
+        return os.path.join(self.root, ref[:2], ref)
+
+    def exists(self, ref: str) -> bool:
+        return os.path.exists(self.path_for(ref))
+
+    def _commit(self, tmp_path: str, ref: str) -> str:
+        target = self.path_for(ref)
+        if os.path.exists(target):
+            os.remove(tmp_path)
+            os.utime(target)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp_path, target)
+        return ref
+
+    def put_bytes(self, data: bytes, extension: str = "") -> str:
+        """Store bytes and return their reference."""
+        ref = hashlib.sha256(data).hexdigest() + extension
+        if self.exists(ref):
+            os.utime(self.path_for(ref))
+            return ref
+        fd, tmp_path = tempfile.mkstemp(dir=self.root)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self._commit(tmp_path, ref)
+
+    def put_file(self, path: str) -> Optional[str]:
+        """Copy a file into the store and return its reference, or None if it does not exist."""
+        if not os.path.isfile(path):
+            logger.warning(f"Artifact {path} not found; not storing it")
+            return None
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.root)
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for block in iter(lambda: src.read(1 << 20), b""):
+                digest.update(block)
+                dst.write(block)
+        return self._commit(tmp_path, digest.hexdigest() + os.path.splitext(path)[1])
+
+    def get_bytes(self, ref: str) -> Optional[bytes]:
+        """Return the stored bytes, or None if the artifact is missing."""
+        try:
+            with open(self.path_for(ref), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def restore(self, ref: str, path: str) -> bool:
+        """Copy a stored artifact back to a well-known path; returns False if it is missing."""
+        if not self.exists(ref):
+            return False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        shutil.copyfile(self.path_for(ref), path)
+        return True
+
+    def size(self, ref: str) -> int:
+        """Size of a stored artifact in bytes, 0 if it is missing."""
+        try:
+            return os.path.getsize(self.path_for(ref))
+        except FileNotFoundError:
+            return 0
+
+    def mtime(self, ref: str) -> Optional[float]:
+        """Last time the artifact was stored, or None if it is missing."""
+        try:
+            return os.path.getmtime(self.path_for(ref))
+        except FileNotFoundError:
+            return None
+
+    def iter_artifacts(self) -> Iterator[Tuple[str, int, float]]:
+        """Yield (ref, size in bytes, mtime) of every stored artifact."""
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if not os.path.isdir(directory):
+                continue  # temporary files of in-progress writes
+            for ref in os.listdir(directory):
+                try:
+                    stat = os.stat(os.path.join(directory, ref))
+                except FileNotFoundError:
+                    continue
+                yield ref, stat.st_size, stat.st_mtime
+
+    def delete(self, ref: str) -> int:
+        """Remove a stored artifact; returns the bytes freed."""
+        path = self.path_for(ref)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        return size
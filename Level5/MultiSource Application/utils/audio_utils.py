@@ -1,16 +1,18 @@
 import os
-import base64
 import time
 from dotenv import load_dotenv
 from io import BytesIO
 from uuid import uuid4
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 from pydub import AudioSegment
-from agno.agent import Agent
 from agno.workflow.workflow import Workflow
-from agno.models.google import Gemini
-from agno.tools.eleven_labs import ElevenLabsTools
 from agno.utils.log import logger
+from utils.conversation_stream import iter_conversation_segments, parse_conversation_segments
+from utils.mp3_splice import MP3SpliceError, splice_mp3
+from utils.rate_limit import TokenBucket
+from utils.tts_backend import create_tts_backend
+from utils.tts_cache import CachedTTSBackend
+from utils.tts_scheduler import TTSScheduler
 
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
@@ -24,7 +26,17 @@ VOICE_CONFIGS = {
 
 class AudioUtilsWorkflow(Workflow):
     """Workflow to parse, generate, and combine audio segments for a podcast."""
-    
+
+    # Segments synthesized at once, and an optional cap on TTS requests per second
+    tts_concurrency: int = int(os.getenv("TTS_CONCURRENCY", "3"))
+    tts_requests_per_second: Optional[float] = (
+        float(os.getenv("TTS_REQUESTS_PER_SECOND")) if os.getenv("TTS_REQUESTS_PER_SECOND") else None
+    )
+    # "direct" ElevenLabs API calls, or "agent" (a Gemini agent calling ElevenLabsTools per segment)
+    tts_backend: str = os.getenv("TTS_BACKEND", "direct")
+    # Segment audio cache shared with l5-1.py and l5-2.py (TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+    tts_cache_enabled: bool = os.getenv("TTS_CACHE", "true").lower() == "true"
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         logger.debug(f"Initializing AudioUtilsWorkflow with args: {args}, kwargs: {kwargs}")
@@ -40,105 +52,47 @@ class AudioUtilsWorkflow(Workflow):
         if not api_key:
             logger.error("ELEVEN_LABS_API_KEY not set.")
             raise ValueError("Missing Eleven Labs API key")
-        
-        # Create separate agents for each voice - THIS IS KEY
-        self.audio_agents = {}
-        for speaker, voice_id in self.voice_configs.items():
-            try:
-                self.audio_agents[speaker] = Agent(
-                    name=f"Audio Generator {speaker}",
-                    model=Gemini(),
-                    tools=[
-                        ElevenLabsTools(
-                            api_key=api_key,
-                            voice_id=voice_id,  # DIFFERENT voice_id for each agent
-                            model_id="eleven_multilingual_v2",
-                            target_directory="temp_audio"
-                        )
-                    ],
-                    instructions=[
-                        "Convert the provided text to speech using the text_to_speech function.",
-                        "Use the configured voice for this agent.",
-                        "Generate clear, natural-sounding audio."
-                    ],
-                    debug_mode=True,
-                )
-                logger.debug(f"Successfully initialized audio agent for {speaker} with voice {voice_id}")
-            except Exception as e:
-                logger.error(f"Failed to initialize audio agent for {speaker}: {str(e)}", exc_info=True)
-                raise
+
+        self.tts = create_tts_backend(self.tts_backend, api_key)
+        if self.tts_cache_enabled:
+            self.tts = CachedTTSBackend(self.tts)
+        self.tts_scheduler = TTSScheduler(
+            self.generate_audio_segment,
+            max_concurrency=self.tts_concurrency,
+            rate_limiter=TokenBucket(self.tts_requests_per_second) if self.tts_requests_per_second else None,
+        )
 
     def parse_conversation_segments(self, conversation: str) -> List[Dict[str, str]]:
         """Parse conversation into sequential segments with speaker identification."""
-        segments = []
-        lines = conversation.split('\n')
-        current_speaker = None
-        current_text = ""
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("SPEAKER_A:"):
-                if current_speaker and current_text.strip():
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': current_text.strip(),
-                        'voice_id': self.voice_configs[current_speaker]
-                    })
-                current_speaker = "SPEAKER_A"
-                current_text = line.replace("SPEAKER_A:", "").strip()
-            elif line.startswith("SPEAKER_B:"):
-                if current_speaker and current_text.strip():
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': current_text.strip(),
-                        'voice_id': self.voice_configs[current_speaker]
-                    })
-                current_speaker = "SPEAKER_B"
-                current_text = line.replace("SPEAKER_B:", "").strip()
-            elif current_speaker and line:
-                current_text += " " + line
-
-        if current_speaker and current_text.strip():
-            segments.append({
-                'speaker': current_speaker,
-                'text': current_text.strip(),
-                'voice_id': self.voice_configs[current_speaker]
-            })
-
+        segments = parse_conversation_segments(conversation, self.voice_configs)
         if not segments:
             logger.error("No valid segments parsed from conversation")
             raise ValueError("No valid segments generated")
-        
-        logger.debug(f"Parsed {len(segments)} segments: {segments}")
         return segments
 
     def generate_audio_segment(self, text: str, speaker_name: str) -> bytes:
-        """Generate audio for a single segment."""
+        """
+        Generate audio for a single segment (one attempt).
+
+        Retries and pacing are handled by self.tts_scheduler.
+        """
         logger.info(f"Generating audio for {speaker_name}: {text[:50]}...")
-        max_retries = 3
-        retry_delay = 2.0
-        
-        # Use the specific agent for this speaker (each has different voice configured)
-        agent = self.audio_agents[speaker_name]  # SPEAKER_A agent vs SPEAKER_B agent
-        
-        for attempt in range(max_retries):
-            try:
-                response = agent.run(f"Convert this text to speech: {text}")
-                if response.audio and len(response.audio) > 0:
-                    audio_data = base64.b64decode(response.audio[0].base64_audio)
-                    logger.debug(f"Generated audio for {speaker_name}, length: {len(audio_data)} bytes")
-                    time.sleep(5)
-                    return audio_data
-                else:
-                    logger.warning(f"Empty audio response for {speaker_name}, attempt {attempt + 1}")
-            except Exception as e:
-                logger.error(f"Failed to generate audio for {speaker_name}, attempt {attempt + 1}: {str(e)}")
-                if attempt == max_retries - 1:
-                    raise RuntimeError(f"Failed to generate audio for {speaker_name} after {max_retries} attempts: {str(e)}")
-                time.sleep(retry_delay)
-        
-        raise RuntimeError(f"Failed to generate audio for {speaker_name} after {max_retries} attempts")
-    
+        audio_data = self.tts.synthesize(text, self.voice_configs[speaker_name])
+        if not audio_data:
+            logger.warning(f"Empty audio response for {speaker_name}")
+            return b""
+        logger.debug(f"Generated audio for {speaker_name}, length: {len(audio_data)} bytes")
+        return audio_data
+
+    def generate_audio_segments(self, segments: List[Dict[str, str]]) -> List[bytes]:
+        """Generate audio for all segments concurrently; returned in segment order."""
+        logger.info(f"Generating {len(segments)} segments, {self.tts_scheduler.max_concurrency} at a time")
+        audio_segments = self.tts_scheduler.synthesize_all(segments)
+        logger.debug(f"TTS stats: {self.tts_scheduler.stats()}, segment latencies: {self.tts.latencies()}")
+        if self.tts_cache_enabled:
+            logger.info(f"TTS segment cache: {self.tts.stats()}")
+        return audio_segments
+
     def combine_audio_segments(self, audio_segments: List[bytes], output_filename: str) -> str:
         """Combine audio segments with pauses and save as MP3."""
         logger.debug(f"Combining {len(audio_segments)} audio segments")
@@ -146,6 +100,16 @@ class AudioUtilsWorkflow(Workflow):
             logger.error("No audio segments provided to combine")
             raise ValueError("No segments to combine")
 
+        os.makedirs("final_podcast", exist_ok=True)
+        output_path = os.path.join("final_podcast", f"{uuid4()}_{output_filename}.mp3")
+        # Fast path: copy the segments' MP3 frames, with silent frames for the pauses
+        try:
+            stats = splice_mp3(audio_segments, output_path, pause_ms=500)
+            logger.info(f"Spliced {stats['segments']} segments ({stats['seconds']:.1f}s) into {output_path}")
+            return output_path
+        except MP3SpliceError as e:
+            logger.info(f"Cannot splice MP3 frames ({str(e)}); combining with pydub")
+
         combined = AudioSegment.empty()
         pause = AudioSegment.silent(duration=500)  # 500ms pause
         
@@ -166,8 +130,6 @@ class AudioUtilsWorkflow(Workflow):
             logger.error("No valid audio segments were combined")
             raise RuntimeError("No valid audio segments to combine")
 
-        os.makedirs("final_podcast", exist_ok=True)
-        output_path = os.path.join("final_podcast", f"{uuid4()}_{output_filename}.mp3")
         logger.info(f"Saving combined audio to {output_path}")
         try:
             combined.export(output_path, format="mp3")
@@ -200,15 +162,7 @@ class AudioUtilsWorkflow(Workflow):
                 raise ValueError("No valid segments generated")
             
             logger.info(f"Parsed {len(segments)} conversation segments")
-            audio_segments = []
-            
-            for i, segment in enumerate(segments):
-                logger.info(f"Processing segment {i+1}/{len(segments)}")
-                audio_data = self.generate_audio_segment(
-                    segment['text'],
-                    segment['speaker']
-                )
-                audio_segments.append(audio_data)
+            audio_segments = self.generate_audio_segments(segments)
 
             output_path = self.combine_audio_segments(
                 audio_segments,
@@ -226,6 +180,37 @@ class AudioUtilsWorkflow(Workflow):
             logger.error(f"Error in run_workflow: {str(e)}", exc_info=True)
             raise
 
+    def run_streaming(self, chunks: Iterable[str], output_filename: str) -> str:
+        """
+        Make the podcast from a conversation that is still being written.
+
+        Segments are parsed from the streamed chunks and start synthesizing as soon as the
+        next speaker label closes them, so TTS overlaps script generation.
+        """
+        start = time.perf_counter()
+
+        def on_segment(index: int, audio: bytes):
+            # The podcast can start playing once its opening segment is ready
+            if index == 0:
+                logger.info(f"First audio after {time.perf_counter() - start:.2f}s")
+
+        def segments():
+            for count, segment in enumerate(iter_conversation_segments(chunks, self.voice_configs), 1):
+                logger.info(f"Segment {count} ({segment['speaker']}) parsed after {time.perf_counter() - start:.2f}s")
+                yield segment
+
+        audio_segments = self.tts_scheduler.synthesize_all(segments(), on_segment=on_segment)
+        if not audio_segments:
+            logger.error("No valid segments parsed from conversation stream")
+            raise ValueError("No valid segments generated")
+        logger.debug(f"TTS stats: {self.tts_scheduler.stats()}, segment latencies: {self.tts.latencies()}")
+        if self.tts_cache_enabled:
+            logger.info(f"TTS segment cache: {self.tts.stats()}")
+
+        output_path = self.combine_audio_segments(audio_segments, output_filename)
+        logger.info(f"Podcast generated in {time.perf_counter() - start:.2f}s: {output_path}")
+        return output_path
+
     def run(self, conversation: str, output_path: str) -> str:
         """Run the audio processing workflow: parse, generate, and combine segments."""
         logger.debug(f"Starting audio utils workflow for conversation: {conversation[:100]}...")
@@ -234,14 +219,7 @@ class AudioUtilsWorkflow(Workflow):
             logger.error("Failed to parse conversation segments")
             return None
         logger.info(f"Parsed {len(segments)} conversation segments")
-        audio_segments = []
-        for i, segment in enumerate(segments):
-            logger.info(f"Processing segment {i+1}/{len(segments)}")
-            audio_data = self.generate_audio_segment(
-                segment['text'],
-                segment['speaker']
-            )
-            audio_segments.append(audio_data)
+        audio_segments = self.generate_audio_segments(segments)
 
         output_path = self.combine_audio_segments(
             audio_segments,
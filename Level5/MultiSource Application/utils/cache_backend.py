@@ -0,0 +1,346 @@
+import os
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from agno.utils.log import logger
+
+# SQLite backend for the MultiSourceWorkflow response cache.
+# Instead of opening a new connection for every lookup, each thread gets one long-lived
+# connection from a small pool. Pragmas are applied once per connection and the SQL text
+# is built once, so sqlite3's per-connection statement cache reuses the compiled statements.
+# Rows are keyed by a fixed-width digest of the canonical prompt (see utils/cache_keys.py);
+# the raw prompt is kept alongside for debugging and re-keying. last_access and size_bytes
+# feed the eviction engine in utils/cache_eviction.py; hits only buffer their access time,
+# which the evictor flushes in the background. The audio/mindmap artifacts a row references
+# are recorded at save time in <table>_artifacts (and counted in size_bytes), so the evictor
+# never has to decode rows to find them; artifacts_indexed marks rows saved that way.
+
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SQLiteCacheBackend:
+    """Thread-pooled SQLite connections for the workflow cache table."""
+
+    def __init__(self, db_file: str, table_name: str, key_fn: Callable[[str], str], busy_timeout_ms: int = 5000):
+        self.db_file = db_file
+        self.table_name = table_name
+        self.key_fn = key_fn
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+
+        # Hit-rate counters; normalized_hits counts hits whose stored prompt text differs
+        # from the requested one, i.e. hits that exact prompt matching would have missed.
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "normalized_hits": 0, "saves": 0}
+        self._touched: Dict[str, str] = {}  # cache_key -> last access time, not yet written
+
+        # SQL is built once; sqlite3 keys its statement cache on the exact SQL text
+        self.sql_create = f'''
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                cache_key TEXT PRIMARY KEY,
+                prompt TEXT,
+                response TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_access DATETIME DEFAULT CURRENT_TIMESTAMP,
+                size_bytes INTEGER DEFAULT 0,
+                artifacts_indexed INTEGER DEFAULT 0
+            )
+        '''
+        self.artifact_table_name = f"{table_name}_artifacts"
+        self.sql_get = f"SELECT prompt, response FROM {table_name} WHERE cache_key = ?"
+        self.sql_save = (
+            f"INSERT OR REPLACE INTO {table_name} "
+            f"(cache_key, prompt, response, timestamp, last_access, size_bytes, artifacts_indexed) "
+            f"VALUES (?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?, 1)"
+        )
+        self.sql_link_artifact = f"INSERT OR IGNORE INTO {self.artifact_table_name} (cache_key, ref) VALUES (?, ?)"
+        self.sql_unlink_artifacts = f"DELETE FROM {self.artifact_table_name} WHERE cache_key = ?"
+        self.sql_touch = f"UPDATE {table_name} SET last_access = ? WHERE cache_key = ?"
+        self.sql_evict = f"DELETE FROM {table_name} WHERE timestamp < ?"
+        self.sql_evict_artifacts = (
+            f"DELETE FROM {self.artifact_table_name} "
+            f"WHERE cache_key IN (SELECT cache_key FROM {table_name} WHERE timestamp < ?)"
+        )
+
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create the cache table and switch the database to WAL once."""
+        db_dir = os.path.dirname(self.db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        conn = self.connection()
+        # journal_mode is persistent in the database file, so it only needs to be set here.
+        # It must run before any statement that opens a transaction.
+        conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")]
+        if columns and "cache_key" not in columns:
+            self._migrate_prompt_keys(conn)
+
+        conn.execute(self.sql_create)
+        self._add_eviction_columns(conn)
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {self.artifact_table_name} (
+                cache_key TEXT,
+                ref TEXT,
+                PRIMARY KEY (cache_key, ref)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.artifact_table_name}_ref "
+                     f"ON {self.artifact_table_name} (ref)")
+        conn.commit()
+
+    def _add_eviction_columns(self, conn: sqlite3.Connection):
+        """Add and index the last_access/size_bytes columns on tables created before they existed."""
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")]
+        # ALTER TABLE cannot use a non-constant default, so backfill explicitly
+        if "last_access" not in columns:
+            conn.execute(f"ALTER TABLE {self.table_name} ADD COLUMN last_access DATETIME")
+        if "size_bytes" not in columns:
+            conn.execute(f"ALTER TABLE {self.table_name} ADD COLUMN size_bytes INTEGER DEFAULT 0")
+        # Rows saved before artifacts were recorded; the evictor indexes them once
+        if "artifacts_indexed" not in columns:
+            conn.execute(f"ALTER TABLE {self.table_name} ADD COLUMN artifacts_indexed INTEGER DEFAULT 0")
+        conn.execute(
+            f"UPDATE {self.table_name} SET last_access = COALESCE(last_access, timestamp), "
+            f"size_bytes = length(CAST(response AS BLOB)) WHERE last_access IS NULL OR size_bytes IS NULL"
+        )
+        # Covering indexes: eviction scans them in order without touching the rows
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_last_access "
+                     f"ON {self.table_name} (last_access, size_bytes, cache_key)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_timestamp "
+                     f"ON {self.table_name} (timestamp, size_bytes, cache_key)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_unindexed "
+                     f"ON {self.table_name} (cache_key) WHERE artifacts_indexed = 0")
+
+    def _migrate_prompt_keys(self, conn: sqlite3.Connection):
+        """
+        Re-key a legacy table whose primary key was the raw prompt text.
+
+        Runs as one explicit transaction (sqlite3 would otherwise autocommit the DDL), so
+        a crash leaves either the legacy table or the fully migrated one.
+        """
+        legacy_table = f"{self.table_name}_legacy"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated the table while this one waited for the lock
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")]
+            if "cache_key" in columns:
+                conn.rollback()
+                return
+            logger.info(f"Migrating {self.table_name} from raw prompt keys to canonical cache keys")
+            conn.execute(f"ALTER TABLE {self.table_name} RENAME TO {legacy_table}")
+            conn.execute(self.sql_create)
+            # Oldest first, so when several legacy prompts collapse onto one key the newest wins
+            rows = conn.execute(f"SELECT prompt, response, timestamp FROM {legacy_table} ORDER BY timestamp")
+            migrated = 0
+            for prompt, response, timestamp in rows.fetchall():
+                size = len(response) if isinstance(response, bytes) else len((response or "").encode("utf-8"))
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} "
+                    f"(cache_key, prompt, response, timestamp, last_access, size_bytes) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.key_fn(prompt), prompt, response, timestamp, timestamp, size),
+                )
+                migrated += 1
+            conn.execute(f"DROP TABLE {legacy_table}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        logger.info(f"Migrated {migrated} cache rows to canonical keys")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a pooled connection and apply per-connection pragmas."""
+        # check_same_thread=False only so close() can run from any thread; each
+        # connection is otherwise used exclusively by the thread that opened it.
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = self._connect()
+        self._local.conn = conn
+        with self._pool_lock:
+            # Drop connections owned by threads that have exited
+            alive = []
+            for thread, pooled in self._pool:
+                if thread.is_alive():
+                    alive.append((thread, pooled))
+                else:
+                    pooled.close()
+            alive.append((threading.current_thread(), conn))
+            self._pool = alive
+            logger.debug(f"Opened cache connection to {self.db_file} ({len(self._pool)} pooled)")
+        return conn
+
+    @property
+    def pool_size(self) -> int:
+        """Number of connections currently held by the pool."""
+        with self._pool_lock:
+            return len(self._pool)
+
+    def _count(self, **increments: int):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit/miss counters and the hit rate since startup."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def get(self, prompt: str) -> Optional[Union[str, bytes]]:
+        """Return the serialized response stored under the prompt's canonical key, if any."""
+        return self.get_by_key(self.key_fn(prompt), prompt)
+
+    def get_by_key(self, cache_key: str, prompt: Optional[str] = None,
+                   record_stats: bool = True) -> Optional[Union[str, bytes]]:
+        """Return the serialized response stored under an already computed cache key."""
+        row = self.connection().execute(self.sql_get, (cache_key,)).fetchone()
+        if row is not None:
+            with self._stats_lock:
+                self._touched[cache_key] = datetime.now(timezone.utc).strftime(SQLITE_TIMESTAMP_FORMAT)
+        if record_stats:
+            if row is None:
+                self._count(misses=1)
+            else:
+                self._count(hits=1, normalized_hits=int(prompt is not None and row[0] != prompt))
+        return row[1] if row else None
+
+    def flush_touches(self) -> int:
+        """Write buffered last_access times; called by the evictor, off the request path."""
+        with self._stats_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn = self.connection()
+            conn.executemany(self.sql_touch, [(accessed, key) for key, accessed in touched.items()])
+            conn.commit()
+        return len(touched)
+
+    def record_stale_hit(self):
+        """Count a hit the caller could not use (e.g. its files are gone) as a miss."""
+        self._count(hits=-1, misses=1)
+
+    def save(self, prompt: str, response: Union[str, bytes], artifact_sizes: Optional[Dict[str, int]] = None):
+        """
+        Insert or replace the serialized response (JSON text or compact bytes) for the prompt.
+
+        artifact_sizes maps the references of the artifacts the response uses to their
+        sizes; they are recorded for the evictor and count toward the row's size_bytes, so
+        the eviction byte budget covers them.
+        """
+        artifact_sizes = artifact_sizes or {}
+        size = len(response) if isinstance(response, bytes) else len(response.encode("utf-8"))
+        size += sum(artifact_sizes.values())
+        cache_key = self.key_fn(prompt)
+        conn = self.connection()
+        conn.execute(self.sql_save, (cache_key, prompt, response, size))
+        conn.execute(self.sql_unlink_artifacts, (cache_key,))
+        conn.executemany(self.sql_link_artifact, [(cache_key, ref) for ref in artifact_sizes])
+        conn.commit()
+        self._count(saves=1)
+
+    def evict_older_than(self, cutoff: datetime) -> int:
+        """Delete entries written before the cutoff and return how many were removed."""
+        # CURRENT_TIMESTAMP stores UTC text, so compare against the same representation
+        if cutoff.tzinfo is not None:
+            cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None)
+        conn = self.connection()
+        conn.execute(self.sql_evict_artifacts, (cutoff.strftime(SQLITE_TIMESTAMP_FORMAT),))
+        cursor = conn.execute(self.sql_evict, (cutoff.strftime(SQLITE_TIMESTAMP_FORMAT),))
+        conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._pool_lock:
+            for _, conn in self._pool:
+                conn.close()
+            self._pool = []
+        self._local = threading.local()
+
+
+class SourceResultCache:
+    """
+    Second cache tier holding one processed result per source.
+
+    Entries are keyed by the canonical URL plus the task type (e.g. "summary"), so the
+    PDF, YouTube or webpage work done for one prompt is reused by any later prompt that
+    mentions the same source. Shares the pooled connections of a SQLiteCacheBackend.
+    """
+
+    def __init__(self, backend: SQLiteCacheBackend, table_name: str = "source_cache"):
+        self.backend = backend
+        self.table_name = table_name
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "saves": 0}
+
+        self.sql_get = f"SELECT result FROM {table_name} WHERE source_key = ?"
+        self.sql_save = f"INSERT OR REPLACE INTO {table_name} (source_key, url, task, result) VALUES (?, ?, ?, ?)"
+        self.sql_evict = f"DELETE FROM {table_name} WHERE timestamp < ?"
+
+        conn = backend.connection()
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                source_key TEXT PRIMARY KEY,
+                url TEXT,
+                task TEXT,
+                result TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+
+    @staticmethod
+    def source_key(canonical_url: str, task: str) -> str:
+        """Fixed-width key for a (canonical URL, task type) pair."""
+        return hashlib.sha256(f"{task}\n{canonical_url}".encode("utf-8")).hexdigest()
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit/miss counters and the hit rate since startup."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def get(self, canonical_url: str, task: str) -> Optional[str]:
+        """Return the cached result for the source and task, if any."""
+        row = self.backend.connection().execute(self.sql_get, (self.source_key(canonical_url, task),)).fetchone()
+        with self._stats_lock:
+            self._stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def save(self, canonical_url: str, task: str, result: str):
+        """Store the processed result for the source and task."""
+        conn = self.backend.connection()
+        conn.execute(self.sql_save, (self.source_key(canonical_url, task), canonical_url, task, result))
+        conn.commit()
+        with self._stats_lock:
+            self._stats["saves"] += 1
+
+    def evict_older_than(self, cutoff: datetime) -> int:
+        """Delete results written before the cutoff and return how many were removed."""
+        if cutoff.tzinfo is not None:
+            cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None)
+        conn = self.backend.connection()
+        cursor = conn.execute(self.sql_evict, (cutoff.strftime(SQLITE_TIMESTAMP_FORMAT),))
+        conn.commit()
+        return cursor.rowcount
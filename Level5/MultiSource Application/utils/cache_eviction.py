@@ -0,0 +1,251 @@
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+from agno.utils.log import logger
+from utils.artifact_store import ArtifactStore
+from utils.cache_backend import SQLITE_TIMESTAMP_FORMAT, SQLiteCacheBackend, SourceResultCache
+from utils.cache_payload import artifact_refs
+from utils.semantic_cache import SemanticCache
+
+# Size-bounded eviction for workflow_cache, run on a background thread instead of a
+# DELETE on every request.
+#
+# Policies:
+#   "lru" - entries idle (not read) for longer than the TTL expire; when over budget the
+#           least recently accessed entries go first.
+#   "ttl" - entries expire TTL after they were written; when over budget the oldest
+#           written entries go first.
+# Both walk the covering (last_access|timestamp, size_bytes, cache_key) indexes, so
+# neither reads the table rows. Evicted keys are also dropped from the semantic cache.
+#
+# With an ArtifactStore, each pass also collects the audio/mindmap files. Rows record their
+# artifacts at save time (SQLiteCacheBackend's <table>_artifacts), so evicting a row yields
+# its refs, and each is deleted once no remaining row references it (an indexed lookup).
+# Files no row ever referenced (the row was never saved) are found by a sweep of the store,
+# at most once per sweep interval. Artifacts written within the grace period are kept,
+# since their row may not be saved yet. Rows saved before artifacts were recorded are
+# indexed once, in batches, and their size_bytes corrected.
+
+EVICTION_POLICIES = ("lru", "ttl")
+EVICTION_BATCH_SIZE = 500
+ARTIFACT_GRACE_SECONDS = 3600
+ARTIFACT_SWEEP_SECONDS = 3600
+
+
+class CacheEvictor:
+    """Background LRU/TTL eviction with row and byte budgets for the workflow cache."""
+
+    def __init__(
+        self,
+        backend: SQLiteCacheBackend,
+        policy: str = "lru",
+        ttl: Optional[timedelta] = timedelta(days=7),
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        interval_seconds: float = 300.0,
+        source_cache: Optional[SourceResultCache] = None,
+        artifact_store: Optional[ArtifactStore] = None,
+        artifact_grace_seconds: float = ARTIFACT_GRACE_SECONDS,
+        artifact_sweep_seconds: float = ARTIFACT_SWEEP_SECONDS,
+        semantic_cache: Optional[SemanticCache] = None,
+    ):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {policy}. Expected one of {EVICTION_POLICIES}")
+        self.backend = backend
+        self.policy = policy
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.interval_seconds = interval_seconds
+        self.source_cache = source_cache
+        self.artifact_store = artifact_store
+        self.artifact_grace_seconds = artifact_grace_seconds
+        self.artifact_sweep_seconds = artifact_sweep_seconds
+        self._last_sweep: Optional[float] = None
+        self.semantic_cache = semantic_cache
+
+        table = backend.table_name
+        self.order_column = "last_access" if policy == "lru" else "timestamp"
+        self.sql_expired = (
+            f"SELECT cache_key, size_bytes FROM {table} WHERE {self.order_column} < ? "
+            f"ORDER BY {self.order_column} LIMIT {EVICTION_BATCH_SIZE}"
+        )
+        self.sql_oldest = (
+            f"SELECT cache_key, size_bytes FROM {table} ORDER BY {self.order_column} LIMIT {EVICTION_BATCH_SIZE}"
+        )
+        self.sql_totals = f"SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM {table}"
+        self.sql_delete = f"DELETE FROM {table} WHERE cache_key = ?"
+        artifacts = backend.artifact_table_name
+        self.sql_row_artifacts = f"SELECT ref FROM {artifacts} WHERE cache_key = ?"
+        self.sql_referenced = f"SELECT 1 FROM {artifacts} WHERE ref = ? LIMIT 1"
+        self.sql_unindexed = (
+            f"SELECT cache_key, response, size_bytes FROM {table} "
+            f"WHERE artifacts_indexed = 0 LIMIT {EVICTION_BATCH_SIZE}"
+        )
+        self.sql_mark_indexed = f"UPDATE {table} SET size_bytes = ?, artifacts_indexed = 1 WHERE cache_key = ?"
+
+        self._run_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "runs": 0,
+            "evictions": 0,
+            "expired": 0,
+            "over_budget": 0,
+            "source_evictions": 0,
+            "bytes_reclaimed": 0,
+            "artifacts_deleted": 0,
+            "artifact_bytes_reclaimed": 0,
+            "rows": 0,
+            "bytes": 0,
+            "last_run_ms": 0.0,
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background eviction thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="cache-evictor", daemon=True)
+        self._thread.start()
+        logger.info(f"Started cache evictor (policy={self.policy}, ttl={self.ttl}, max_rows={self.max_rows}, "
+                    f"max_bytes={self.max_bytes}, every {self.interval_seconds}s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread, waiting for an in-flight pass to finish."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Cache eviction pass failed: {str(e)}", exc_info=True)
+
+    def _delete(self, rows: List[tuple], released: Set[str]) -> int:
+        """Delete the rows and their artifact records; their artifact refs are added to released."""
+        conn = self.backend.connection()
+        keys = [(key,) for key, _ in rows]
+        for key in keys:
+            released.update(ref for (ref,) in conn.execute(self.sql_row_artifacts, key))
+        conn.executemany(self.backend.sql_unlink_artifacts, keys)
+        conn.executemany(self.sql_delete, keys)
+        conn.commit()
+        if self.semantic_cache is not None:
+            # Paraphrase matches must not point at evicted rows
+            self.semantic_cache.discard_many(key for (key,) in keys)
+        return sum(size or 0 for _, size in rows)
+
+    def _index_legacy_rows(self) -> int:
+        """Record the artifacts of rows saved before they were recorded, and fix their size_bytes."""
+        conn = self.backend.connection()
+        indexed = 0
+        while True:
+            rows = conn.execute(self.sql_unindexed).fetchall()
+            if not rows:
+                return indexed
+            for key, response, size in rows:
+                refs = set(artifact_refs(response)) if response else set()
+                if refs:
+                    row_bytes = len(response) if isinstance(response, bytes) else len(response.encode("utf-8"))
+                    size = row_bytes + sum(self.artifact_store.size(ref) for ref in refs)
+                conn.executemany(self.backend.sql_link_artifact, [(key, ref) for ref in refs])
+                conn.execute(self.sql_mark_indexed, (size, key))
+            conn.commit()
+            indexed += len(rows)
+
+    def _delete_unreferenced_artifacts(self, candidates: Set[str]) -> tuple:
+        """Delete the candidate artifacts no row references and older than the grace period; returns (count, bytes)."""
+        conn = self.backend.connection()
+        cutoff = time.time() - self.artifact_grace_seconds
+        deleted = reclaimed = 0
+        for ref in candidates:
+            mtime = self.artifact_store.mtime(ref)
+            if mtime is None or mtime >= cutoff:
+                continue
+            if conn.execute(self.sql_referenced, (ref,)).fetchone() is None:
+                reclaimed += self.artifact_store.delete(ref)
+                deleted += 1
+        return deleted, reclaimed
+
+    def run_once(self) -> Dict[str, int]:
+        """Run one eviction pass and return what it removed."""
+        with self._run_lock:
+            start = time.perf_counter()
+            conn = self.backend.connection()
+            # Access times must be current before LRU ordering is trusted
+            self.backend.flush_touches()
+            if self.artifact_store is not None:
+                self._index_legacy_rows()
+
+            expired = over_budget = reclaimed = 0
+            released: Set[str] = set()
+            if self.ttl is not None:
+                cutoff = (datetime.now(timezone.utc) - self.ttl).strftime(SQLITE_TIMESTAMP_FORMAT)
+                while True:
+                    rows = conn.execute(self.sql_expired, (cutoff,)).fetchall()
+                    if not rows:
+                        break
+                    reclaimed += self._delete(rows, released)
+                    expired += len(rows)
+
+            row_count, byte_count = conn.execute(self.sql_totals).fetchone()
+            while (self.max_rows is not None and row_count > self.max_rows) or \
+                    (self.max_bytes is not None and byte_count > self.max_bytes):
+                victims = []
+                for key, size in conn.execute(self.sql_oldest).fetchall():
+                    if not ((self.max_rows is not None and row_count > self.max_rows) or
+                            (self.max_bytes is not None and byte_count > self.max_bytes)):
+                        break
+                    victims.append((key, size))
+                    row_count -= 1
+                    byte_count -= size or 0
+                if not victims:
+                    break
+                reclaimed += self._delete(victims, released)
+                over_budget += len(victims)
+
+            source_evictions = 0
+            if self.source_cache is not None and self.ttl is not None:
+                source_evictions = self.source_cache.evict_older_than(datetime.now(timezone.utc) - self.ttl)
+
+            artifacts_deleted = artifact_bytes = 0
+            if self.artifact_store is not None:
+                candidates = released
+                now = time.monotonic()
+                if self._last_sweep is None or now - self._last_sweep >= self.artifact_sweep_seconds:
+                    # Also catch files whose row was never saved
+                    self._last_sweep = now
+                    candidates = released | {ref for ref, _, _ in self.artifact_store.iter_artifacts()}
+                artifacts_deleted, artifact_bytes = self._delete_unreferenced_artifacts(candidates)
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._stats["runs"] += 1
+                self._stats["evictions"] += expired + over_budget
+                self._stats["expired"] += expired
+                self._stats["over_budget"] += over_budget
+                self._stats["source_evictions"] += source_evictions
+                self._stats["bytes_reclaimed"] += reclaimed
+                self._stats["artifacts_deleted"] += artifacts_deleted
+                self._stats["artifact_bytes_reclaimed"] += artifact_bytes
+                self._stats["rows"] = row_count
+                self._stats["bytes"] = byte_count
+                self._stats["last_run_ms"] = elapsed_ms
+
+        if expired or over_budget or source_evictions or artifacts_deleted:
+            logger.debug(f"Evicted {expired} expired and {over_budget} over-budget cache entries "
+                         f"({reclaimed} bytes), {source_evictions} source results and {artifacts_deleted} "
+                         f"unreferenced artifacts ({artifact_bytes} bytes) in {elapsed_ms:.1f} ms")
+        return {"expired": expired, "over_budget": over_budget, "source_evictions": source_evictions,
+                "bytes_reclaimed": reclaimed, "artifacts_deleted": artifacts_deleted,
+                "artifact_bytes_reclaimed": artifact_bytes}
+
+    def stats(self) -> Dict[str, float]:
+        """Return cumulative eviction counters and the cache size seen by the last pass."""
+        with self._stats_lock:
+            return dict(self._stats)
@@ -0,0 +1,48 @@
+import json
+import hashlib
+from typing import Dict, List
+from utils.url_utils import classify_url, find_urls, normalize_url, strip_urls
+
+# Canonical cache keys for workflow_cache.
+# Prompts that differ only in whitespace, letter case, URL order or tracking parameters
+# map to the same fixed-width SHA-256 key, so they share one cache entry.
+
+CACHE_KEY_VERSION = 1
+
+
+def canonicalize_prompt(prompt: str) -> Dict[str, object]:
+    """
+    Split a prompt into its canonical parts.
+
+    Returns:
+        dict: {"pdf_urls", "youtube_urls", "web_urls"} as sorted, de-duplicated canonical URLs
+        and "text" as the remaining prompt text, lowercased with whitespace collapsed.
+    """
+    buckets: Dict[str, set] = {"pdf": set(), "youtube": set(), "webpage": set()}
+    for url in find_urls(prompt):
+        canonical = normalize_url(url)
+        buckets[classify_url(canonical)].add(canonical)
+
+    return {
+        "pdf_urls": sorted(buckets["pdf"]),
+        "youtube_urls": sorted(buckets["youtube"]),
+        "web_urls": sorted(buckets["webpage"]),
+        "text": " ".join(strip_urls(prompt).lower().split()),
+    }
+
+
+def canonical_urls(prompt: str) -> List[str]:
+    """Return every canonical URL in the prompt, sorted."""
+    canonical = canonicalize_prompt(prompt)
+    return sorted(canonical["pdf_urls"] + canonical["youtube_urls"] + canonical["web_urls"])
+
+
+def canonical_cache_key(prompt: str) -> str:
+    """Return the 64-character hex digest used as the workflow_cache primary key."""
+    payload = json.dumps(
+        {"v": CACHE_KEY_VERSION, **canonicalize_prompt(prompt)},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,107 @@
+import os
+import json
+import zlib
+import base64
+from typing import Any, Dict, List, Union
+from utils.artifact_store import ArtifactStore
+
+# Compact serialization for workflow_cache rows.
+# Only the fields the Playground renders are kept, the JSON is zlib-compressed, and
+# audio / mindmap outputs are stored in the ArtifactStore and referenced by content hash
+# instead of being inlined (base64 audio alone used to dominate row size).
+#
+# Rows written before this format are plain JSON text from RunResponse.to_dict() and are
+# still decoded transparently.
+
+COMPACT_MAGIC = b"MSC1"
+MINDMAP_FILENAME = "mindmap_output.png"
+# RunResponse fields the Playground needs to render a cached answer
+COMPACT_FIELDS = ("content", "content_type", "event", "workflow_id", "created_at")
+
+
+class MissingArtifactError(LookupError):
+    """A cache row references an artifact that is no longer in the store."""
+
+
+def encode_payload(response: Any, store: ArtifactStore) -> bytes:
+    """Serialize a RunResponse into the compact, compressed cache format."""
+    payload: Dict[str, Any] = {}
+    for field in COMPACT_FIELDS:
+        value = getattr(response, field, None)
+        if value is not None:
+            payload[field] = getattr(value, "value", value)  # enums (e.g. RunEvent) by value
+
+    metadata = getattr(response, "metadata", None)
+    if metadata:
+        payload["metadata"] = metadata
+
+    audio = getattr(response, "audio", None)
+    if isinstance(audio, str):
+        # The workflow reports the podcast as a file path
+        ref = store.put_file(audio)
+        if ref:
+            payload["audio_ref"] = ref
+    elif audio:
+        # Inline audio artifacts (base64) go to the store as raw bytes
+        refs = []
+        for artifact in audio:
+            base64_audio = getattr(artifact, "base64_audio", None)
+            if base64_audio:
+                refs.append(store.put_bytes(base64.b64decode(base64_audio), ".mp3"))
+        if refs:
+            payload["audio_artifact_refs"] = refs
+
+    content = payload.get("content")
+    if isinstance(content, str) and MINDMAP_FILENAME in content and os.path.exists(MINDMAP_FILENAME):
+        ref = store.put_file(MINDMAP_FILENAME)
+        if ref:
+            payload["mindmap_ref"] = ref
+
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return COMPACT_MAGIC + zlib.compress(raw, 6)
+
+
+def artifact_refs(raw: Union[str, bytes]) -> List[str]:
+    """References of the artifacts a cache row uses, without resolving them."""
+    if isinstance(raw, str) or not raw.startswith(COMPACT_MAGIC):
+        return []
+    payload = json.loads(zlib.decompress(raw[len(COMPACT_MAGIC):]))
+    refs = [payload.get("audio_ref"), payload.get("mindmap_ref")] + payload.get("audio_artifact_refs", [])
+    return [ref for ref in refs if ref]
+
+
+def decode_payload(raw: Union[str, bytes], store: ArtifactStore) -> Dict[str, Any]:
+    """
+    Decode a cache row into keyword arguments for RunResponse.
+
+    Referenced artifacts are resolved to files on disk: the audio field becomes the
+    stored file's path and a missing mindmap_output.png is restored from the store.
+    Inline audio artifacts come back as {"base64_audio": ...} dicts; if one of them is
+    gone from the store, MissingArtifactError is raised so the row is treated as a miss.
+    """
+    if isinstance(raw, str):
+        # Legacy row: full RunResponse.to_dict() JSON
+        return json.loads(raw)
+    if not raw.startswith(COMPACT_MAGIC):
+        return json.loads(raw.decode("utf-8"))
+
+    payload = json.loads(zlib.decompress(raw[len(COMPACT_MAGIC):]))
+
+    audio_ref = payload.pop("audio_ref", None)
+    if audio_ref:
+        payload["audio"] = store.path_for(audio_ref)
+
+    artifact_refs = payload.pop("audio_artifact_refs", None)
+    if artifact_refs:
+        payload["audio"] = []
+        for ref in artifact_refs:
+            data = store.get_bytes(ref)
+            if data is None:
+                raise MissingArtifactError(f"Audio artifact {ref} is missing")
+            payload["audio"].append({"base64_audio": base64.b64encode(data).decode("ascii")})
+
+    mindmap_ref = payload.pop("mindmap_ref", None)
+    if mindmap_ref and not os.path.exists(MINDMAP_FILENAME):
+        store.restore(mindmap_ref, MINDMAP_FILENAME)
+
+    return payload
@@ -0,0 +1,99 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from agno.utils.log import logger
+
+# Incremental parsing of podcast conversations into speaker segments.
+# The podcast team writes the script as lines starting with 'SPEAKER_A:' or 'SPEAKER_B:';
+# a line without a label continues the current speaker's text. ConversationParser takes
+# the script in arbitrary chunks (streamed model tokens) and emits each segment as soon as
+# the next label, or the end of the stream, closes it. So synthesis of a segment can start
+# while the model is still writing the following ones. A label is recognized as soon as
+# it appears at the start of a line, before the rest of that line has arrived.
+# parse_conversation_segments is the same parser over a finished script.
+
+SPEAKER_LABELS = {"SPEAKER_A:": "SPEAKER_A", "SPEAKER_B:": "SPEAKER_B"}
+
+
+class ConversationParser:
+    """Turns streamed conversation text into {'speaker', 'text', 'voice_id'} segments."""
+
+    def __init__(self, voice_configs: Dict[str, str]):
+        self.voice_configs = voice_configs
+        self._buffer = ""  # the current, incomplete line
+        self._speaker: Optional[str] = None
+        self._text = ""
+
+    def _close_segment(self) -> List[Dict[str, str]]:
+        segment = []
+        if self._speaker and self._text.strip():
+            segment.append({
+                "speaker": self._speaker,
+                "text": self._text.strip(),
+                "voice_id": self.voice_configs[self._speaker],
+            })
+        self._speaker, self._text = None, ""
+        return segment
+
+    def _label(self, line: str) -> Optional[str]:
+        for label in SPEAKER_LABELS:
+            if line.startswith(label):
+                return label
+        return None
+
+    def _line(self, line: str) -> List[Dict[str, str]]:
+        line = line.strip()
+        label = self._label(line)
+        if label:
+            closed = self._close_segment()
+            self._speaker = SPEAKER_LABELS[label]
+            self._text = line.replace(label, "").strip()
+            return closed
+        if self._speaker and line:
+            self._text += " " + line
+        return []
+
+    def feed(self, chunk: str) -> List[Dict[str, str]]:
+        """Add streamed text; returns the segments it closed, in order."""
+        self._buffer += chunk
+        segments: List[Dict[str, str]] = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            segments.extend(self._line(line))
+        # A label at the start of the incomplete line already closes the current segment
+        if self._speaker and self._label(self._buffer.lstrip()):
+            segments.extend(self._close_segment())
+        return segments
+
+    def close(self) -> List[Dict[str, str]]:
+        """End of stream: returns the remaining segment, if any."""
+        segments = self._line(self._buffer)
+        self._buffer = ""
+        return segments + self._close_segment()
+
+
+def iter_conversation_segments(chunks: Iterable[str], voice_configs: Dict[str, str]) -> Iterator[Dict[str, str]]:
+    """Yield segments from streamed conversation text as each one is closed."""
+    parser = ConversationParser(voice_configs)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_conversation_segments(conversation: str, voice_configs: Dict[str, str]) -> List[Dict[str, str]]:
+    """Parse a finished conversation into sequential segments with speaker identification."""
+    segments = list(iter_conversation_segments([conversation], voice_configs))
+    logger.debug(f"Parsed {len(segments)} segments: {segments}")
+    return segments
+
+
+def team_content_stream(events: Iterable[Any]) -> Iterator[str]:
+    """
+    Text deltas of the team leader's response in a streamed agno Team run.
+
+    Collaborate-mode teams also stream their members' runs (stream_member_events), as
+    RunResponseContent events. Those are the speakers' own drafts, so only the leader's
+    TeamRunResponseContent events are kept.
+    """
+    for event in events:
+        content = getattr(event, "content", None)
+        if getattr(event, "event", "") == "TeamRunResponseContent" and isinstance(content, str):
+            yield content
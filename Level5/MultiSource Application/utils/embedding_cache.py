@@ -0,0 +1,230 @@
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from agno.utils.log import logger
+from utils.embedding_pipeline import embed_batch
+
+# Persistent, content-addressed embedding cache shared by every knowledge base in the repo.
+# Vectors live in one flat memory-mapped array per embedding space (embedder id, task type,
+# dimensions, storage dtype); a SQLite index maps sha256(text) to the row in that array.
+# Appends take the index's write lock first, so several processes (Level4 and Level5 apps
+# running side by side) can share a cache directory. The vector bytes are written before
+# the index rows commit, so a reader never sees an index entry without its vector.
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agno-embedding-cache")
+)
+CACHE_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class _Space:
+    """Vector file and memory map for one embedding space."""
+
+    def __init__(self, path: str, dimensions: int, dtype: np.dtype):
+        self.path = path
+        self.dimensions = dimensions
+        self.dtype = np.dtype(dtype)
+        self.row_bytes = dimensions * self.dtype.itemsize
+        self._map: Optional[np.memmap] = None
+        if not os.path.exists(path):
+            open(path, "ab").close()
+
+    def rows(self, needed: int) -> np.memmap:
+        """Memory map covering at least `needed` rows, remapped when the file has grown."""
+        if self._map is None or self._map.shape[0] < needed:
+            count = os.path.getsize(self.path) // self.row_bytes
+            self._map = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(count, self.dimensions))
+        return self._map
+
+    def append(self, first_row: int, vectors: np.ndarray):
+        with open(self.path, "r+b") as f:
+            f.seek(first_row * self.row_bytes)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+
+
+class EmbeddingCache:
+    """Memory-mapped vector store with a SQLite offset index, keyed by embedding space and text hash."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, dtype: str = "float32"):
+        if dtype not in CACHE_DTYPES:
+            raise ValueError(f"Invalid cache dtype: {dtype}. Expected one of {tuple(CACHE_DTYPES)}")
+        self.directory = directory
+        self.dtype = CACHE_DTYPES[dtype]
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.db")
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._spaces: Dict[str, _Space] = {}
+        self._stats = {"hits": 0, "misses": 0, "stored": 0}
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS spaces (
+                space TEXT PRIMARY KEY,
+                dimensions INTEGER,
+                rows INTEGER
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                space TEXT,
+                digest BLOB,
+                row INTEGER,
+                PRIMARY KEY (space, digest)
+            ) WITHOUT ROWID
+        ''')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def space_key(self, embedder_id: str, dimensions: int, task_type: Optional[str] = None) -> str:
+        return f"{embedder_id}|{task_type or ''}|{dimensions}|{np.dtype(self.dtype).name}"
+
+    def _space(self, space: str, dimensions: int) -> _Space:
+        with self._lock:
+            if space not in self._spaces:
+                filename = re.sub(r"[^A-Za-z0-9_.-]+", "_", space) + ".bin"
+                self._spaces[space] = _Space(os.path.join(self.directory, filename), dimensions, self.dtype)
+            return self._spaces[space]
+
+    def get_many(self, space: str, dimensions: int, digests: List[bytes]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for the digests, None where missing."""
+        if not digests:
+            return []
+        rows: Dict[bytes, int] = {}
+        conn = self._connection()
+        unique = list(dict.fromkeys(digests))
+        for i in range(0, len(unique), 500):
+            part = unique[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            rows.update(conn.execute(
+                f"SELECT digest, row FROM entries WHERE space = ? AND digest IN ({placeholders})", (space, *part)
+            ).fetchall())
+
+        results: List[Optional[np.ndarray]] = [None] * len(digests)
+        if rows:
+            vectors = self._space(space, dimensions).rows(max(rows.values()) + 1)
+            for i, digest in enumerate(digests):
+                row = rows.get(digest)
+                if row is not None:
+                    results[i] = np.asarray(vectors[row], dtype=np.float32)
+        hits = sum(result is not None for result in results)
+        with self._lock:
+            self._stats["hits"] += hits
+            self._stats["misses"] += len(digests) - hits
+        return results
+
+    def put_many(self, space: str, dimensions: int, items: List[Tuple[bytes, List[float]]]):
+        """Store vectors for digests not cached yet."""
+        vectors_by_digest = {digest: vector for digest, vector in items if len(vector) == dimensions}
+        if not vectors_by_digest:
+            return
+        store = self._space(space, dimensions)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            digests = list(vectors_by_digest)
+            existing = set()
+            for i in range(0, len(digests), 500):
+                part = digests[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                existing.update(row[0] for row in conn.execute(
+                    f"SELECT digest FROM entries WHERE space = ? AND digest IN ({placeholders})", (space, *part)
+                ))
+            new = [digest for digest in digests if digest not in existing]
+            if new:
+                row = conn.execute("SELECT rows FROM spaces WHERE space = ?", (space,)).fetchone()
+                first = row[0] if row else 0
+                store.append(first, np.array([vectors_by_digest[d] for d in new], dtype=np.float32))
+                conn.executemany(
+                    "INSERT INTO entries (space, digest, row) VALUES (?, ?, ?)",
+                    [(space, digest, first + i) for i, digest in enumerate(new)],
+                )
+                conn.execute(
+                    "INSERT INTO spaces (space, dimensions, rows) VALUES (?, ?, ?) "
+                    "ON CONFLICT(space) DO UPDATE SET rows = excluded.rows",
+                    (space, dimensions, first + len(new)),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._stats["stored"] += len(new)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit rate since startup plus entries and bytes on disk."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = self._connection().execute("SELECT COALESCE(SUM(rows), 0) FROM spaces").fetchone()[0]
+        stats["bytes"] = sum(
+            os.path.getsize(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.endswith(".bin")
+        )
+        return stats
+
+
+class CachedEmbedder:
+    """Wraps an agno embedder so previously embedded texts are served from an EmbeddingCache."""
+
+    def __init__(self, embedder: Any, cache: Optional[EmbeddingCache] = None):
+        self.embedder = embedder
+        self.cache = cache or EmbeddingCache()
+        self.id = getattr(embedder, "id", type(embedder).__name__)
+        self.dimensions = getattr(embedder, "dimensions", None)
+        self.space = self.cache.space_key(self.id, self.dimensions or 0, getattr(embedder, "task_type", None))
+
+    def __getattr__(self, name: str):
+        # Everything else (client, task_type, ...) comes from the wrapped embedder
+        if name == "embedder":
+            raise AttributeError(name)
+        return getattr(self.embedder, name)
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch, calling the wrapped embedder only for texts not in the cache."""
+        digests = [text_digest(text) for text in texts]
+        cached = self.cache.get_many(self.space, self.dimensions or 0, digests) if self.dimensions else [None] * len(texts)
+        results: List[List[float]] = [vector.tolist() if vector is not None else [] for vector in cached]
+        # Texts missing from the cache, each embedded once even if repeated in the batch
+        missing: Dict[bytes, List[int]] = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(digests[i], []).append(i)
+        if missing:
+            fresh = embed_batch(self.embedder, [texts[positions[0]] for positions in missing.values()])
+            for positions, vector in zip(missing.values(), fresh):
+                for i in positions:
+                    results[i] = list(vector)
+            if self.dimensions:
+                self.cache.put_many(self.space, self.dimensions,
+                                    [(digest, results[positions[0]]) for digest, positions in missing.items()])
+            else:
+                logger.warning(f"Embedder {self.id} has no fixed dimensions; not caching its embeddings")
+        return results
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        """Match the agno Embedder API; cache hits have no usage to report."""
+        return self.get_embedding(text), None
+
+    def stats(self) -> Dict[str, float]:
+        return self.cache.stats()
@@ -0,0 +1,188 @@
+import time
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from agno.utils.log import logger
+from utils.rate_limit import TokenBucket
+
+# Batched, bounded-concurrency embedding for knowledge base loads.
+# agno's ChromaDb.insert embeds one chunk per request, serially. The pipeline instead
+# groups chunks into provider-sized batches, keeps up to `max_concurrency` batch requests
+# in flight (each one taking a token from an optional rate limiter), and writes every
+# batch into the Chroma collection as soon as it completes. Rows are written exactly as
+# ChromaDb.insert writes them (md5 ids of the cleaned text, document metadata), so
+# search and the PDF ingestion manifest see no difference.
+
+# Gemini's embed_content accepts up to 100 contents per request
+DEFAULT_BATCH_SIZE = 100
+
+
+def chunk_id(content: str) -> str:
+    """Id agno's ChromaDb assigns to a chunk with this content."""
+    return hashlib.md5(clean_content(content).encode()).hexdigest()
+
+
+def clean_content(content: str) -> str:
+    """Chunk text as agno's ChromaDb stores it."""
+    return content.replace("\x00", "\ufffd")
+
+
+def collection_for(vector_db: Any) -> Any:
+    """
+    Collection behind a vector db, created if needed.
+
+    ChromaDb's Chroma collection, or the Chroma-style NumpyVectorDb.collection.
+    """
+    if not vector_db.exists():
+        vector_db.create()
+    collection = getattr(vector_db, "collection", None)
+    if collection is not None:
+        return collection
+    return vector_db.client.get_collection(name=vector_db.collection_name)
+
+
+def embed_batch(embedder: Any, texts: List[str]) -> List[List[float]]:
+    """
+    Embed several texts with as few provider requests as the embedder allows.
+
+    Uses the embedder's get_embeddings when it has one, a single embed_content call for
+    GeminiEmbedder, and one get_embedding call per text otherwise.
+    """
+    if hasattr(embedder, "get_embeddings"):
+        return embedder.get_embeddings(texts)
+
+    models = getattr(getattr(embedder, "client", None), "models", None)
+    if models is not None and hasattr(models, "embed_content"):
+        model_id = embedder.id.split("/")[-1]
+        config = {}
+        if getattr(embedder, "dimensions", None):
+            config["output_dimensionality"] = embedder.dimensions
+        if getattr(embedder, "task_type", None):
+            config["task_type"] = embedder.task_type
+        request = {"contents": texts, "model": model_id}
+        if config:
+            request["config"] = config
+        if getattr(embedder, "request_params", None):
+            request.update(embedder.request_params)
+        response = models.embed_content(**request)
+        embeddings = [list(embedding.values or []) for embedding in (response.embeddings or [])]
+        if len(embeddings) != len(texts):
+            raise RuntimeError(f"Embedding batch returned {len(embeddings)} vectors for {len(texts)} texts")
+        return embeddings
+
+    return [embedder.get_embedding(text) for text in texts]
+
+
+class EmbeddingPipeline:
+    """Embeds documents in concurrent, rate-limited batches and streams them into the vector db."""
+
+    def __init__(
+        self,
+        embedder: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_concurrency: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 2,
+    ):
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError(f"Invalid batch_size={batch_size} / max_concurrency={max_concurrency}; both must be >= 1")
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="embed")
+
+    def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return embed_batch(self.embedder, texts)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                backoff = 2 ** attempt
+                logger.warning(f"Embedding batch of {len(texts)} failed ({str(e)}); retrying in {backoff}s")
+                time.sleep(backoff)
+
+    def _batches(self, documents: Iterable[Any]) -> Iterator[List[tuple]]:
+        """Group documents into (chunk id, (content, metadata)) batches, skipping repeated texts."""
+        seen = set()
+        batch: List[tuple] = []
+        for document in documents:
+            doc_id = chunk_id(document.content)
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            batch.append((doc_id, (clean_content(document.content), dict(document.meta_data or {}))))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def insert_documents(self, vector_db: Any, documents: Iterable[Any]) -> Dict[str, float]:
+        """
+        Embed documents and add them to the vector db's collection.
+
+        Documents are consumed lazily, so a generator keeps at most `max_concurrency`
+        batches in memory. Duplicate chunk texts are embedded once. Returns chunks,
+        batches, seconds and chunks_per_sec for the call.
+        """
+        start = time.perf_counter()
+        collection = collection_for(vector_db)
+
+        pending: Dict[Any, list] = {}  # future -> batch
+        batch_iter = self._batches(documents)
+        chunks = batches = written = 0
+        error: Optional[BaseException] = None
+
+        def submit_next() -> bool:
+            nonlocal chunks, batches
+            batch = next(batch_iter, None)
+            if batch is None:
+                return False
+            chunks += len(batch)
+            batches += 1
+            future = self._executor.submit(self._embed_with_retry, [content for _, (content, _) in batch])
+            pending[future] = batch
+            return True
+
+        while len(pending) < self.max_concurrency and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                # Writes happen on this thread only; the Chroma client is not shared across workers
+                collection.add(
+                    ids=[doc_id for doc_id, _ in batch],
+                    embeddings=embeddings,
+                    documents=[content for _, (content, _) in batch],
+                    metadatas=[metadata for _, (_, metadata) in batch],
+                )
+                written += len(batch)
+                if error is None:
+                    submit_next()
+
+        elapsed = time.perf_counter() - start
+        if error is not None:
+            logger.error(f"Embedding pipeline stopped after {written}/{chunks} chunks: {str(error)}")
+            raise RuntimeError(f"Embedding failed: {str(error)}")
+        stats = {
+            "chunks": chunks,
+            "batches": batches,
+            "seconds": elapsed,
+            "chunks_per_sec": chunks / elapsed if elapsed > 0 else 0.0,
+        }
+        logger.info(f"Embedded {chunks} chunks in {batches} batches at {stats['chunks_per_sec']:.1f} chunks/s")
+        return stats
+
+    def close(self):
+        self._executor.shutdown(wait=False)
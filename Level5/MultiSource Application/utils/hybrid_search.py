@@ -0,0 +1,394 @@
+import re
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from agno.document import Document
+from agno.utils.log import logger
+from agno.vectordb.base import VectorDb
+from utils.embedding_pipeline import chunk_id, collection_for
+
+# Keyword + vector retrieval for knowledge bases whose questions quote exact terms
+# (section numbers, product codes) that embeddings rank poorly.
+# BM25Index is an inverted index kept next to the vector store: every batch of rows written
+# at ingest becomes a small segment (term ids, posting rows, term frequencies, sorted by term),
+# and segments of similar size are merged as they pile up, so there are O(log n) of them and
+# no rebuild is needed when a PDF is added. A query slices the postings of its terms out of
+# each segment and scores them with a handful of vectorized operations.
+# HybridVectorDb wraps a vector db, keeps the index in step with every write that goes
+# through it, and fuses the vector and BM25 rankings by reciprocal-rank fusion.
+
+# Keeps dotted/dashed identifiers ("4.2.1", "c4611-x") whole; their parts are indexed too
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[._\-/][a-z0-9]+)*")
+TOKEN_SEPARATORS = re.compile(r"[._\-/]")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were "
+    "what when where which who why will with how does do did can".split()
+)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Query terms found in more than this share of the rows (near-zero IDF, longest postings)
+# are skipped unless the query has nothing else
+MAX_DF_RATIO = 0.5
+# Standard RRF constant; dampens the weight of the very first ranks
+RRF_K = 60
+# Candidates taken from each ranking per requested result
+CANDIDATE_MULTIPLIER = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased index terms of a text, without stopwords."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token not in STOPWORDS:
+            tokens.append(token)
+        if TOKEN_SEPARATORS.search(token):
+            tokens.extend(part for part in TOKEN_SEPARATORS.split(token) if part not in STOPWORDS)
+    return tokens
+
+
+class _Segment:
+    """Postings of a batch of rows, grouped by term id."""
+
+    __slots__ = ("terms", "offsets", "rows", "tfs")
+
+    def __init__(self, term_ids: np.ndarray, rows: np.ndarray, tfs: np.ndarray):
+        order = np.argsort(term_ids, kind="stable")
+        term_ids = term_ids[order]
+        self.rows = rows[order]
+        self.tfs = tfs[order]
+        terms, starts = np.unique(term_ids, return_index=True)
+        self.terms = terms.astype(np.int64)
+        self.offsets = np.append(starts, len(term_ids))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def ranges(self, term_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Posting start/end offsets of each term id (empty ranges for absent terms)."""
+        i = np.minimum(self.terms.searchsorted(term_ids), len(self.terms) - 1)
+        present = self.terms[i] == term_ids
+        return np.where(present, self.offsets[i], 0), np.where(present, self.offsets[i + 1], 0)
+
+    def expanded(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return np.repeat(self.terms, np.diff(self.offsets)), self.rows, self.tfs
+
+
+class BM25Index:
+    """Incrementally built BM25 inverted index over chunk ids and texts."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B, max_df_ratio: float = MAX_DF_RATIO):
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._vocabulary: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._total_length = 0.0
+        self._segments: List[_Segment] = []
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._row_of
+
+    def _reserve(self, rows: int):
+        if rows > len(self._lengths):
+            capacity = max(rows, 2 * len(self._lengths))
+            self._lengths = np.resize(self._lengths, capacity)
+            self._alive = np.resize(self._alive, capacity)
+            self._alive[len(self._ids):] = False
+
+    def add(self, ids: List[str], texts: List[str], replace: bool = False):
+        """
+        Index rows. Ids already indexed are skipped unless `replace` is set; ids are chunk
+        content hashes, so the same id normally means the same text.
+        """
+        with self._lock:
+            if replace:
+                self._remove([id for id in ids if id in self._row_of])
+            term_ids: List[int] = []
+            rows: List[int] = []
+            tfs: List[int] = []
+            first_row = len(self._ids)
+            for id, text in zip(ids, texts):
+                if id in self._row_of:
+                    continue
+                row = len(self._ids)
+                self._ids.append(id)
+                self._row_of[id] = row
+                counts = Counter(tokenize(text or ""))
+                self._reserve(row + 1)
+                self._lengths[row] = sum(counts.values())
+                self._alive[row] = True
+                self._total_length += float(self._lengths[row])
+                for term, count in counts.items():
+                    term_ids.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+                    rows.append(row)
+                    tfs.append(count)
+            if len(self._ids) == first_row:
+                return
+            self._segments.append(_Segment(np.array(term_ids, dtype=np.int32), np.array(rows, dtype=np.int32),
+                                           np.array(tfs, dtype=np.float32)))
+            self._merge_segments()
+
+    def _merge_segments(self):
+        """Merge the two newest segments while the newest is at least as large (a binary counter)."""
+        while len(self._segments) > 1 and len(self._segments[-1]) >= len(self._segments[-2]):
+            newer = self._segments.pop()
+            older = self._segments.pop()
+            parts = [older.expanded(), newer.expanded()]
+            term_ids, rows, tfs = (np.concatenate(columns) for columns in zip(*parts))
+            # Postings of removed rows are dropped here rather than on removal
+            live = self._alive[rows]
+            self._segments.append(_Segment(term_ids[live], rows[live], tfs[live]))
+
+    def remove(self, ids: Iterable[str]):
+        with self._lock:
+            self._remove(ids)
+
+    def _remove(self, ids: Iterable[str]):
+        for id in ids:
+            row = self._row_of.pop(id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._ids[row] = None
+                self._total_length -= float(self._lengths[row])
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Top (id, BM25 score) pairs for the query, best first."""
+        with self._lock:
+            live_rows = len(self._row_of)
+            term_ids = {self._vocabulary.get(term) for term in tokenize(query)} - {None}
+            if not live_rows or not term_ids:
+                return []
+            average_length = self._total_length / live_rows or 1.0
+            term_ids = np.array(sorted(term_ids), dtype=np.int64)
+            ranges = [(segment, *segment.ranges(term_ids)) for segment in self._segments]
+            # Posting counts include removed rows until their segments merge; close enough here
+            frequencies = sum(ends - starts for _, starts, ends in ranges)
+            terms = np.flatnonzero(frequencies)
+            common = frequencies[terms] > self.max_df_ratio * live_rows
+            if not common.all():
+                terms = terms[~common]
+            rows_parts, weight_parts = [], []
+            for t in terms:
+                found = [(segment.rows[starts[t]:ends[t]], segment.tfs[starts[t]:ends[t]])
+                         for segment, starts, ends in ranges if ends[t] > starts[t]]
+                rows = np.concatenate([rows for rows, _ in found]) if len(found) > 1 else found[0][0]
+                tfs = np.concatenate([tfs for _, tfs in found]) if len(found) > 1 else found[0][1]
+                live = self._alive[rows]
+                rows, tfs = rows[live], tfs[live]
+                if not len(rows):
+                    continue
+                idf = float(np.log1p((live_rows - len(rows) + 0.5) / (len(rows) + 0.5)))
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[rows] / average_length)
+                rows_parts.append(rows)
+                weight_parts.append(idf * (self.k1 + 1.0) * tfs / (tfs + norm))
+            if not rows_parts:
+                return []
+            rows = np.concatenate(rows_parts) if len(rows_parts) > 1 else rows_parts[0]
+            if len(rows_parts) > 1:
+                # Sum per row with a dense bincount (cheaper than sorting the postings), then rank
+                # the postings by their row's total; each row appears at most once per term, so
+                # the top limit * terms postings cover the top `limit` rows
+                totals = np.bincount(rows, weights=np.concatenate(weight_parts), minlength=len(self._ids))
+                scores = totals[rows]
+            else:
+                scores = weight_parts[0]
+            width = min(limit * len(rows_parts), len(rows))
+            top = np.argpartition(-scores, width - 1)[:width]
+            top_rows, first = np.unique(rows[top], return_index=True)
+            top_scores = scores[top][first]
+            order = np.argsort(-top_scores, kind="stable")[:limit]
+            return [(self._ids[top_rows[i]], float(top_scores[i])) for i in order]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: each id scores the sum of 1 / (k + rank) over the lists it is in."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, id in enumerate(ranking, start=1):
+            scores[id] = scores.get(id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+class IndexedCollection:
+    """Collection facade that mirrors every row written or deleted into the BM25 index."""
+
+    def __init__(self, db: "HybridVectorDb", collection: Any):
+        self.db = db
+        self.collection = collection
+
+    def __getattr__(self, name: str):
+        if name == "collection":
+            raise AttributeError(name)
+        return getattr(self.collection, name)
+
+    def add(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: Optional[List[dict]] = None):
+        self.collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        self.db.index.add(ids, documents)
+
+    def upsert(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: Optional[List[dict]] = None):
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        self.db.index.add(ids, documents, replace=True)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None):
+        if where is not None:
+            ids = self.collection.get(ids=ids, where=where, include=[])["ids"]
+        self.collection.delete(ids=ids)
+        self.db.index.remove(ids or [])
+
+
+class HybridVectorDb(VectorDb):
+    """
+    Wraps an agno vector db with a BM25 index and answers searches with the reciprocal-rank
+    fusion of both rankings.
+
+    Rows written through `collection` (the embedding pipeline, IncrementalPDFIngestor) or
+    insert/upsert are indexed as they are stored. Rows that were already stored when the db
+    is opened are indexed from the collection on first use.
+    """
+
+    def __init__(self, vector_db: VectorDb, candidate_multiplier: int = CANDIDATE_MULTIPLIER, rrf_k: int = RRF_K,
+                 index: Optional[BM25Index] = None):
+        self.vector_db = vector_db
+        self.candidate_multiplier = candidate_multiplier
+        self.rrf_k = rrf_k
+        self.index = index or BM25Index()
+        self._lock = threading.Lock()
+        self._collection: Optional[IndexedCollection] = None
+
+    def __getattr__(self, name: str):
+        # embedder, collection_name, client, ... come from the wrapped vector db
+        if name == "vector_db":
+            raise AttributeError(name)
+        return getattr(self.vector_db, name)
+
+    @property
+    def collection(self) -> IndexedCollection:
+        return self._indexed_collection()
+
+    def _indexed_collection(self) -> IndexedCollection:
+        """The wrapped collection, after indexing the rows it already holds."""
+        with self._lock:
+            if self._collection is None:
+                collection = collection_for(self.vector_db)
+                stored = collection.get(include=["documents"])
+                self.index.add(stored["ids"], stored["documents"])
+                if stored["ids"]:
+                    logger.info(f"Indexed {len(stored['ids'])} stored chunks for keyword search")
+                self._collection = IndexedCollection(self, collection)
+            return self._collection
+
+    def keyword_search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """BM25 (id, score) pairs only."""
+        self._indexed_collection()
+        return self.index.search(query, limit)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        collection = self._indexed_collection()
+        candidates = max(limit, 1) * self.candidate_multiplier
+        vector_documents = self.vector_db.search(query, limit=candidates, filters=filters)
+        if filters:
+            # The keyword index holds no metadata; filtered searches stay vector-only
+            return vector_documents[:limit]
+        keyword_ids = [id for id, _ in self.index.search(query, candidates)]
+        by_id = {document.id or chunk_id(document.content): document for document in vector_documents}
+        fused = reciprocal_rank_fusion([list(by_id), keyword_ids], self.rrf_k)[:limit]
+
+        missing = [id for id, _ in fused if id not in by_id]
+        if missing:
+            rows = collection.get(ids=missing, include=["documents", "metadatas"])
+            for id, content, metadata in zip(rows["ids"], rows["documents"], rows["metadatas"]):
+                by_id[id] = Document(id=id, content=content, meta_data=dict(metadata or {}))
+        documents = []
+        for id, score in fused:
+            document = by_id.get(id)
+            if document is not None:
+                document.meta_data = {**(document.meta_data or {}), "rrf_score": score}
+                documents.append(document)
+        return documents
+
+    def create(self) -> None:
+        self.vector_db.create()
+
+    def exists(self) -> bool:
+        return self.vector_db.exists()
+
+    def drop(self) -> None:
+        with self._lock:
+            self.vector_db.drop()
+            self.index.clear()
+            self._collection = None
+
+    def delete(self) -> bool:
+        with self._lock:
+            deleted = self.vector_db.delete()
+            self.index.clear()
+            self._collection = None
+        return deleted
+
+    def get_count(self) -> int:
+        return self.vector_db.get_count()
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.vector_db.doc_exists(document)
+
+    def name_exists(self, name: str) -> bool:
+        return self.vector_db.name_exists(name)
+
+    def id_exists(self, id: str) -> bool:
+        return self.vector_db.id_exists(id)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self._indexed_collection()
+        self.vector_db.insert(documents, filters)
+        self.index.add([chunk_id(document.content) for document in documents],
+                       [document.content for document in documents])
+
+    def upsert_available(self) -> bool:
+        return self.vector_db.upsert_available()
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self._indexed_collection()
+        self.vector_db.upsert(documents, filters)
+        self.index.add([chunk_id(document.content) for document in documents],
+                       [document.content for document in documents], replace=True)
+
+    async def async_create(self) -> None:
+        await asyncio.to_thread(self.create)
+
+    async def async_exists(self) -> bool:
+        return await asyncio.to_thread(self.exists)
+
+    async def async_drop(self) -> None:
+        await asyncio.to_thread(self.drop)
+
+    async def async_doc_exists(self, document: Document) -> bool:
+        return await asyncio.to_thread(self.doc_exists, document)
+
+    async def async_name_exists(self, name: str) -> bool:
+        return await asyncio.to_thread(self.name_exists, name)
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.insert, documents, filters)
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.upsert, documents, filters)
+
+    async def async_search(self, query: str, limit: int = 5,
+                           filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
@@ -0,0 +1,175 @@
+import re
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Local repair for the URL Handler's JSON output, so the JSON Corrector agent only runs
+# when this fails. Handles Markdown fences, text around the object, trailing commas,
+# unclosed strings and brackets (e.g. truncated output), nested result objects and
+# missing keys, then coerces the result to the URL Handler schema. An object that only
+# parses after repair must still have every URL list: one cut off before them would
+# silently drop the prompt's URLs, so the JSON Corrector gets it instead. Intact JSON
+# may leave out lists the model had nothing for.
+
+URL_RESULT_DEFAULTS: Dict[str, Any] = {
+    "pdf_urls": [],
+    "youtube_urls": [],
+    "web_urls": [],
+    "remaining_text": "",
+    "errors": [],
+}
+URL_RESULT_REQUIRED = ("pdf_urls", "youtube_urls", "web_urls")
+
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+# Commas tried as truncation points when the tail of the text cannot be closed
+MAX_TRUNCATIONS = 8
+
+
+def _strip_fences(text: str) -> str:
+    match = FENCE_PATTERN.search(text)
+    return match.group(1) if match else text
+
+
+def _close(text: str) -> Optional[str]:
+    """
+    Close unterminated strings and brackets and drop trailing commas, scanning once.
+
+    Returns None when the brackets are mismatched, or when the text ends inside a list
+    item string: a truncated URL is worse than a missing one.
+    """
+    stack: List[str] = []
+    in_string = escaped = False
+    end = len(text)
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return None
+            if not stack:
+                end = i + 1
+                break
+
+    repaired = text[:end]
+    if in_string and stack and stack[-1] == "]":
+        return None
+    if in_string:
+        repaired = (repaired[:-1] if escaped else repaired) + '"'
+    repaired = repaired.rstrip()
+    if repaired.endswith(":"):
+        repaired += " null"
+    repaired = repaired.rstrip(",") + "".join(reversed(stack))
+    return TRAILING_COMMA_PATTERN.sub(r"\1", repaired)
+
+
+def _comma_positions(text: str) -> List[int]:
+    """Positions of commas outside strings, last first."""
+    positions = []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == ",":
+            positions.append(i)
+    return positions[::-1]
+
+
+def _parse_object(text: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Return (object, whether it needed repair)."""
+    start = text.find("{")
+    if start < 0:
+        return None, False
+    text = text[start:]
+    try:
+        data = json.loads(text)
+        return (data if isinstance(data, dict) else None), False
+    except json.JSONDecodeError:
+        pass
+
+    # Try the whole text first, then cut back to earlier commas to drop a dangling
+    # key or half-written value at the end
+    candidates = [text] + [text[:i] for i in _comma_positions(text)[:MAX_TRUNCATIONS]]
+    for candidate in candidates:
+        closed = _close(candidate)
+        if closed is None:
+            continue
+        try:
+            data = json.loads(closed)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict):
+            return data, True
+    return None, True
+
+
+def _find_result(data: Dict[str, Any], required: Sequence[str], complete: bool) -> Optional[Dict[str, Any]]:
+    """Return the first (possibly nested) object with every required key, or any of them if complete."""
+    if (any if complete else all)(key in data for key in required):
+        return data
+    for value in data.values():
+        if isinstance(value, dict):
+            found = _find_result(value, required, complete)
+            if found is not None:
+                return found
+    return None
+
+
+def _coerce(value: Any, default: Any) -> Any:
+    if isinstance(default, list):
+        if value is None:
+            return []
+        if isinstance(value, (list, tuple)):
+            return [str(item) for item in value if item is not None and str(item).strip()]
+        return [str(value)] if str(value).strip() else []
+    if isinstance(default, str):
+        return "" if value is None else str(value)
+    return value
+
+
+def repair_json(
+    text: str,
+    schema: Optional[Dict[str, Any]] = None,
+    required: Optional[Sequence[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Parse possibly malformed JSON output into a dict matching the schema.
+
+    Args:
+        text: Raw model output.
+        schema: Keys and their defaults (URL_RESULT_DEFAULTS if not given).
+        required: Keys that identify the result object (URL_RESULT_REQUIRED with the
+            default schema, else every schema key). Intact JSON needs one of them; JSON
+            that had to be repaired needs all of them. Other keys fall back to defaults.
+
+    Returns:
+        dict with every schema key present and of the schema's type, or None if no JSON
+        object with the required keys could be recovered.
+    """
+    if required is None:
+        required = URL_RESULT_REQUIRED if schema is None else tuple(schema)
+    schema = URL_RESULT_DEFAULTS if schema is None else schema
+    if not isinstance(text, str):
+        return None
+    data, repaired = _parse_object(_strip_fences(text))
+    if data is None:
+        return None
+    result = _find_result(data, required, complete=not repaired)
+    if result is None:
+        return None
+    return {key: _coerce(result.get(key), default) for key, default in schema.items()}
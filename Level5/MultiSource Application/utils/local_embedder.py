@@ -0,0 +1,41 @@
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+# A deterministic, offline stand-in for GeminiEmbedder.
+# It hashes word stems into a fixed number of signed buckets (the "hashing trick"), so
+# texts sharing vocabulary get similar vectors. Good enough for tests and benchmarks
+# that must not call the embedding API; not a substitute for a real model.
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class LocalHashEmbedder:
+    """Hashing-trick embedder exposing the same methods as agno embedders."""
+
+    def __init__(self, dimensions: int = 256, stem_length: int = 5):
+        self.id = f"local-hash-{dimensions}"
+        self.dimensions = dimensions
+        self.stem_length = stem_length
+
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimensions, 1.0 if (value >> 63) & 1 else -1.0
+
+    def get_embedding(self, text: str) -> List[float]:
+        """Return an L2-normalized embedding for the text."""
+        vector = [0.0] * self.dimensions
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            index, sign = self._bucket(token[: self.stem_length])
+            vector[index] += sign
+        norm = sum(value * value for value in vector) ** 0.5
+        return [value / norm for value in vector] if norm else vector
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        """Match the agno Embedder API; there is no usage to report."""
+        return self.get_embedding(text), None
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts."""
+        return [self.get_embedding(text) for text in texts]
@@ -0,0 +1,192 @@
+import os
+import math
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from agno.utils.log import logger
+
+# Frame-level MP3 concatenation for podcast segments.
+# Combining segments with pydub decodes every MP3 through ffmpeg, grows the result with
+# repeated `combined += segment` (each one copies everything so far, so the cost is
+# quadratic in podcast length) and re-encodes the whole podcast at the end. TTS segments
+# are constant-bitrate MPEG Layer III streams, and a CBR frame is self-contained at segment
+# starts (an encoder's first frame never borrows from the bit reservoir). So when every
+# segment has the same MPEG version, sample rate, channel count and bitrate, a segment's
+# audio frames can be copied to the output unchanged. Leading ID3v2 tags, Xing/Info/VBRI
+# header frames (whose frame counts describe the single segment) and trailing ID3v1/APE
+# tags are skipped. Pauses are runs of a precomputed silent frame: a header plus all-zero
+# side info decodes to silence. The output is written straight to a file, one slice per
+# segment. Anything else raises MP3SpliceError, and the caller falls back to pydub.
+
+# Layer III bitrates in kbps by bitrate index
+MPEG1_BITRATES = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+MPEG2_BITRATES = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5) and rate index
+SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+ID3V1_SIZE = 128
+APE_FOOTER_SIZE = 32
+
+
+class MP3SpliceError(ValueError):
+    """The segments cannot be spliced frame by frame."""
+
+
+class MP3Format(NamedTuple):
+    version: int  # version bits: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    bitrate_index: int
+    sample_rate_index: int
+    mono: bool
+
+    @property
+    def sample_rate(self) -> int:
+        return SAMPLE_RATES[self.version][self.sample_rate_index]
+
+    @property
+    def bitrate(self) -> int:
+        """Bits per second."""
+        return (MPEG1_BITRATES if self.version == 3 else MPEG2_BITRATES)[self.bitrate_index] * 1000
+
+    @property
+    def samples_per_frame(self) -> int:
+        return 1152 if self.version == 3 else 576
+
+    @property
+    def side_info_size(self) -> int:
+        if self.version == 3:
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    def frame_length(self, padding: int = 0) -> int:
+        coefficient = 144 if self.version == 3 else 72
+        return coefficient * self.bitrate // self.sample_rate + padding
+
+
+class MP3Stream(NamedTuple):
+    """Audio frames of one MP3: data[start:end] holds `frames` frames of `format`."""
+    format: MP3Format
+    start: int
+    end: int
+    frames: int
+    mode_byte: int  # fourth header byte of the first frame (channel mode, emphasis, ...)
+
+
+def _id3v2_size(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    return 10 + size + (10 if data[5] & 0x10 else 0)
+
+
+def _trailing_tags_start(data: bytes) -> int:
+    end = len(data)
+    if end >= ID3V1_SIZE and data[end - ID3V1_SIZE:end - ID3V1_SIZE + 3] == b"TAG":
+        end -= ID3V1_SIZE
+    if end >= APE_FOOTER_SIZE and data[end - APE_FOOTER_SIZE:end - APE_FOOTER_SIZE + 8] == b"APETAGEX":
+        tag_size = int.from_bytes(data[end - APE_FOOTER_SIZE + 12:end - APE_FOOTER_SIZE + 16], "little")
+        has_header = data[end - APE_FOOTER_SIZE + 23] & 0x80
+        end -= tag_size + (APE_FOOTER_SIZE if has_header else 0)
+    return max(end, 0)
+
+
+def _header(data: bytes, pos: int) -> Optional[Tuple[MP3Format, int, bool]]:
+    """(format, frame length, has CRC) of a Layer III frame header at pos, or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    fmt = MP3Format(version, bitrate_index, sample_rate_index, (b3 >> 6) == 3)
+    return fmt, fmt.frame_length((b2 >> 1) & 1), not (b1 & 1)
+
+
+def _is_info_frame(data: bytes, pos: int, fmt: MP3Format, crc: bool) -> bool:
+    offset = pos + 4 + (2 if crc else 0) + fmt.side_info_size
+    return data[offset:offset + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI"
+
+
+def parse_mp3(data: bytes) -> MP3Stream:
+    """Locate the audio frames of a CBR Layer III MP3; raises MP3SpliceError otherwise."""
+    pos = _id3v2_size(data)
+    end = _trailing_tags_start(data)
+    first = _header(data, pos)
+    if first is None:
+        raise MP3SpliceError(f"No MPEG Layer III frame at byte {pos}")
+    fmt, length, crc = first
+    if _is_info_frame(data, pos, fmt, crc):
+        pos += length
+    start = pos
+    mode_byte = data[pos + 3] if pos + 3 < len(data) else 0
+    frames = 0
+    while pos < end:
+        header = _header(data, pos)
+        if header is None:
+            raise MP3SpliceError(f"Lost frame sync at byte {pos}")
+        frame_format, length, _ = header
+        if frame_format != fmt:
+            raise MP3SpliceError(f"Frame {frames} is {frame_format}, expected {fmt} (not constant bitrate)")
+        if pos + length > end:
+            # Truncated final frame; leave it out
+            logger.debug(f"Dropping truncated final MP3 frame at byte {pos}")
+            break
+        pos += length
+        frames += 1
+    if frames == 0:
+        raise MP3SpliceError("No audio frames")
+    return MP3Stream(fmt, start, pos, frames, mode_byte)
+
+
+def silent_frame(fmt: MP3Format, mode_byte: int = 0) -> bytes:
+    """One frame of silence: header without CRC or padding, then all-zero side info and main data."""
+    header = bytes((
+        0xFF,
+        0xE0 | fmt.version << 3 | 1 << 1 | 1,
+        fmt.bitrate_index << 4 | fmt.sample_rate_index << 2,
+        # Same channel mode (no joint-stereo extension) and emphasis as the stream
+        (0xC0 if fmt.mono else mode_byte & 0xC0) | (mode_byte & 0x0F),
+    ))
+    return header + bytes(fmt.frame_length() - 4)
+
+
+def splice_mp3(segments: List[bytes], output_path: str, pause_ms: int = 500) -> Dict[str, float]:
+    """
+    Write the segments' audio frames to output_path with pause_ms of silence between them.
+
+    Empty segments are skipped. Raises MP3SpliceError, without touching output_path, when a
+    segment is not a CBR Layer III stream or the segments' formats differ.
+
+    Returns:
+        dict: segments, frames, seconds (audio duration) and bytes written.
+    """
+    streams = [(data, parse_mp3(data)) for data in segments if data]
+    if not streams:
+        raise MP3SpliceError("No segments to splice")
+    fmt, mode_byte = streams[0][1].format, streams[0][1].mode_byte
+    for index, (_, stream) in enumerate(streams):
+        if stream.format != fmt:
+            raise MP3SpliceError(f"Segment {index} is {stream.format}, expected {fmt}")
+
+    frame_seconds = fmt.samples_per_frame / fmt.sample_rate
+    pause = silent_frame(fmt, mode_byte) * math.ceil(pause_ms / 1000 / frame_seconds)
+    pause_frames = len(pause) // fmt.frame_length() if pause else 0
+
+    directory = os.path.dirname(output_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    written = frames = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for index, (data, stream) in enumerate(streams):
+                if index:
+                    f.write(pause)
+                    written += len(pause)
+                    frames += pause_frames
+                f.write(memoryview(data)[stream.start:stream.end])
+                written += stream.end - stream.start
+                frames += stream.frames
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return {"segments": len(streams), "frames": frames, "seconds": frames * frame_seconds, "bytes": written}
@@ -0,0 +1,749 @@
+import os
+import json
+import shutil
+import tempfile
+import asyncio
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+from agno.document import Document
+from agno.utils.log import logger
+from agno.vectordb.base import VectorDb
+from utils.embedding_pipeline import chunk_id, clean_content, embed_batch
+
+# In-process vector store for agno knowledge bases, as an alternative to ChromaDb.
+# Unit-normalized float32 embeddings are appended to one flat file that is memory-mapped
+# as a (rows, dimensions) matrix; ids, texts and metadata live in a SQLite table next to it.
+# A query is a blocked matrix-vector product followed by argpartition top-k (several queries
+# become one matrix-matrix product). For larger collections, index="ivf" partitions the
+# rows around k-means centroids and only scores the `nprobe` closest partitions.
+#
+# Rows are addressed the same way ChromaDb addresses them (md5 of the cleaned text), and
+# `collection` exposes the subset of Chroma's collection API the ingestion code uses
+# (add, upsert, get, update, delete, count), so either backend can sit behind a knowledge base.
+#
+# Metadata filters (e.g. {"doc_id": {"$in": [...]}} from scoped retrieval) become a boolean
+# row mask. Equality-style conditions ($eq, $ne, $in, $nin and plain values) are answered
+# from a value -> rows index per metadata key, built the first time the key is filtered on
+# and kept current by every write, so a filtered query costs the size of its matches rather
+# than a Python pass over every row. Range operators still evaluate row by row.
+
+VECTOR_DB_BACKENDS = ("chroma", "numpy")
+DEFAULT_PATH = "tmp/numpy_vectordb"
+INDEX_TYPES = ("flat", "ivf")
+# Rows scored per block on flat search; bounds the temporary score buffer
+SEARCH_BLOCK_ROWS = 65536
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+# Filter operators answered from the per-key value index
+INDEXED_OPERATORS = ("$eq", "$ne", "$in", "$nin")
+
+
+def create_vector_db(backend: str, collection: str, embedder: Any, path: Optional[str] = None) -> VectorDb:
+    """
+    Vector db for a knowledge base: 'chroma' (agno's ChromaDb) or 'numpy' (NumpyVectorDb).
+
+    With a path, Chroma uses a persistent client there (it is in-memory otherwise) and
+    NumpyVectorDb stores its files there instead of DEFAULT_PATH.
+    """
+    if backend == "chroma":
+        from agno.vectordb.chroma import ChromaDb
+        if path is not None:
+            return ChromaDb(collection=collection, embedder=embedder, path=path, persistent_client=True)
+        return ChromaDb(collection=collection, embedder=embedder)
+    if backend == "numpy":
+        return NumpyVectorDb(collection=collection, embedder=embedder, path=path or DEFAULT_PATH)
+    logger.error(f"Invalid vector db backend: {backend}")
+    raise ValueError(f"Invalid vector db backend: {backend}. Expected one of {VECTOR_DB_BACKENDS}")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    if operator == "$gt":
+        return value > operand
+    if operator == "$gte":
+        return value >= operand
+    if operator == "$lt":
+        return value < operand
+    if operator == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_filter(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Evaluate a Chroma-style where filter ($eq, $ne, $in, $nin, $gt(e), $lt(e), $and, $or)."""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(_compare(metadata.get(key), operator, operand) for operator, operand in condition.items()):
+                return False
+        elif isinstance(condition, (list, tuple)):
+            # agno's simple filter form: a list means "any of"
+            if metadata.get(key) not in condition:
+                return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+class NumpyCollection:
+    """Chroma-collection-style row access to a NumpyVectorDb."""
+
+    def __init__(self, db: "NumpyVectorDb"):
+        self.db = db
+
+    def add(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: Optional[List[dict]] = None):
+        """Add rows; ids already present are skipped, as Chroma does."""
+        self.db._write(ids, embeddings, documents, metadatas, replace=False)
+
+    def upsert(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: Optional[List[dict]] = None):
+        self.db._write(ids, embeddings, documents, metadatas, replace=True)
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+            include: Iterable[str] = ("metadatas", "documents")) -> Dict[str, Any]:
+        return self.db._get(ids, where, set(include))
+
+    def update(self, ids: List[str], metadatas: List[dict]):
+        """Merge metadata into existing rows; a None value removes the key."""
+        self.db._update_metadata(ids, metadatas)
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None):
+        self.db._delete(ids, where)
+
+    def count(self) -> int:
+        return self.db.get_count()
+
+
+class NumpyVectorDb(VectorDb):
+    """agno VectorDb backed by a memory-mapped float32 matrix, with optional IVF partitioning."""
+
+    def __init__(
+        self,
+        collection: str,
+        embedder: Any = None,
+        path: str = DEFAULT_PATH,
+        index: str = "flat",
+        ivf_lists: Optional[int] = None,
+        nprobe: int = 8,
+        ivf_min_rows: int = 20000,
+        reranker: Any = None,
+    ):
+        if index not in INDEX_TYPES:
+            logger.error(f"Invalid index type: {index}")
+            raise ValueError(f"Invalid index type: {index}. Expected one of {INDEX_TYPES}")
+        if embedder is None:
+            from agno.embedder.openai import OpenAIEmbedder
+            embedder = OpenAIEmbedder()
+        self.collection_name = collection
+        self.embedder = embedder
+        self.directory = os.path.join(path, collection)
+        self.index = index
+        # Partitions (default sqrt(rows)), partitions scored per query, and the size below
+        # which IVF falls back to exact search
+        self.ivf_lists = ivf_lists
+        self.nprobe = nprobe
+        self.ivf_min_rows = ivf_min_rows
+        self.reranker = reranker
+        self.collection = NumpyCollection(self)
+
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._loaded = False
+        self.dimensions: Optional[int] = None
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._metadata: List[Optional[dict]] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._map: Optional[np.memmap] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._partitions: Optional[List[np.ndarray]] = None
+        self._trained_rows = 0
+        self._generation = 0
+        # Metadata key -> value -> rows, for keys filtered on so far (None: values not hashable)
+        self._value_index: Dict[str, Optional[Dict[Any, set]]] = {}
+
+    # -- storage --------------------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _centroids_path(self) -> str:
+        return os.path.join(self.directory, "ivf_centroids.npy")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "directory", None) != self.directory:
+            conn = sqlite3.connect(os.path.join(self.directory, "rows.db"), timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.directory = self.directory
+        return conn
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            if not self.exists():
+                self.create()
+                return
+            self._load()
+
+    def _load(self):
+        """Read the row table and map the vectors. Caller holds the lock."""
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                id TEXT UNIQUE,
+                content TEXT,
+                metadata TEXT
+            )
+        ''')
+        found = conn.execute("SELECT value FROM info WHERE key = 'dimensions'").fetchone()
+        self.dimensions = int(found[0]) if found else None
+
+        rows = conn.execute("SELECT row, id, metadata FROM rows ORDER BY row").fetchall()
+        count = rows[-1][0] + 1 if rows else 0
+        self._ids = [None] * count
+        self._metadata = [None] * count
+        self._alive = np.zeros(count, dtype=bool)
+        self._row_of = {}
+        for row, doc_id, metadata in rows:
+            self._ids[row] = doc_id
+            self._metadata[row] = json.loads(metadata) if metadata else {}
+            self._alive[row] = True
+            self._row_of[doc_id] = row
+        self._map = None
+        self._value_index = {}
+        # Row numbers change on every load (optimize() compacts them)
+        self._generation += 1
+        self._centroids = None
+        self._assignments = np.full(count, -1, dtype=np.int32)
+        self._partitions = None
+        if self.index == "ivf" and os.path.exists(self._centroids_path) and count:
+            self._centroids = np.load(self._centroids_path)
+            self._assignments = self._assign(np.arange(count))
+            self._trained_rows = int(self._alive.sum())
+        self._loaded = True
+
+    def _matrix(self) -> np.ndarray:
+        """Memory map covering every row, remapped when the file has grown."""
+        rows = len(self._ids)
+        if self._map is None or self._map.shape[0] < rows:
+            if not rows or not self.dimensions:
+                return np.zeros((0, self.dimensions or 0), dtype=np.float32)
+            self._map = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimensions))
+        return self._map
+
+    def _write_vectors(self, first_row: int, vectors: np.ndarray):
+        with open(self._vectors_path, "r+b") as f:
+            f.seek(first_row * self.dimensions * 4)
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+    def _write(self, ids: List[str], embeddings: Any, documents: List[str], metadatas: Optional[List[dict]],
+               replace: bool):
+        self._ensure_loaded()
+        metadatas = metadatas or [{}] * len(ids)
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        with self._lock:
+            if self.dimensions is None and len(ids):
+                self.dimensions = vectors.shape[1]
+                self._connection().execute(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES ('dimensions', ?)", (str(self.dimensions),)
+                )
+            if len(ids) and vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional embeddings, got {vectors.shape[1]}")
+
+            new_rows, new_positions, replaced = [], [], []
+            batch_rows: Dict[str, int] = {}
+            next_row = len(self._ids)
+            for position, doc_id in enumerate(ids):
+                row = self._row_of.get(doc_id, batch_rows.get(doc_id))
+                if row is None:
+                    row = batch_rows[doc_id] = next_row
+                    next_row += 1
+                    new_rows.append(row)
+                    new_positions.append(position)
+                elif replace:
+                    replaced.append((row, position))
+            if not new_rows and not replaced:
+                return
+
+            # Vectors first, then the rows that point at them
+            if new_rows:
+                self._write_vectors(new_rows[0], vectors[new_positions])
+            for row, position in replaced:
+                self._write_vectors(row, vectors[position:position + 1])
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO rows (row, id, content, metadata) VALUES (?, ?, ?, ?)",
+                    [(row, ids[position], documents[position], json.dumps(metadatas[position] or {}))
+                     for row, position in list(zip(new_rows, new_positions)) + replaced],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            for row, position in zip(new_rows, new_positions):
+                self._ids.append(ids[position])
+                self._metadata.append(dict(metadatas[position] or {}))
+                self._row_of[ids[position]] = row
+                self._index_row(row)
+            for row, position in replaced:
+                self._unindex_row(row)
+                self._metadata[row] = dict(metadatas[position] or {})
+                self._index_row(row)
+            if new_rows:
+                self._alive = np.concatenate([self._alive, np.ones(len(new_rows), dtype=bool)])
+                assignments = self._assign(np.array(new_rows)) if self._centroids is not None else \
+                    np.full(len(new_rows), -1, dtype=np.int32)
+                self._assignments = np.concatenate([self._assignments, assignments])
+                self._partitions = None
+            if replaced and self._centroids is not None:
+                rows = np.array([row for row, _ in replaced])
+                self._assignments[rows] = self._assign(rows)
+
+    # -- metadata filters -------------------------------------------------------------
+
+    def _index_row(self, row: int):
+        """Add a row's metadata to the value indexes. Caller holds the lock."""
+        for key, index in self._value_index.items():
+            if index is not None:
+                try:
+                    index.setdefault(self._metadata[row].get(key), set()).add(row)
+                except TypeError:
+                    self._value_index[key] = None  # unhashable value; filter this key row by row
+
+    def _unindex_row(self, row: int):
+        """Remove a row's metadata from the value indexes. Caller holds the lock."""
+        for key, index in self._value_index.items():
+            if index is not None:
+                rows = index.get(self._metadata[row].get(key))
+                if rows is not None:
+                    rows.discard(row)
+
+    def _values_of(self, key: str) -> Optional[Dict[Any, set]]:
+        """Value -> rows index of a metadata key, built on first use. Caller holds the lock."""
+        if key not in self._value_index:
+            index: Optional[Dict[Any, set]] = {}
+            try:
+                for row in np.flatnonzero(self._alive):
+                    index.setdefault(self._metadata[row].get(key), set()).add(int(row))
+            except TypeError:
+                index = None
+            self._value_index[key] = index
+        return self._value_index[key]
+
+    def _rows_mask(self, index: Dict[Any, set], values: Iterable[Any]) -> np.ndarray:
+        mask = np.zeros(len(self._ids), dtype=bool)
+        for value in values:
+            rows = index.get(value)
+            if rows:
+                mask[list(rows)] = True
+        return mask
+
+    def _condition_mask(self, key: str, operator: str, operand: Any) -> np.ndarray:
+        index = self._values_of(key) if operator in INDEXED_OPERATORS else None
+        if index is None:
+            return np.array([meta is not None and _compare(meta.get(key), operator, operand)
+                             for meta in self._metadata], dtype=bool)
+        values = [operand] if operator in ("$eq", "$ne") else list(operand)
+        try:
+            mask = self._rows_mask(index, values)
+        except TypeError:
+            # An unhashable operand can only be compared row by row
+            return np.array([meta is not None and _compare(meta.get(key), operator, operand)
+                             for meta in self._metadata], dtype=bool)
+        return ~mask if operator in ("$ne", "$nin") else mask
+
+    def _filter_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Rows matching a Chroma-style where filter (see matches_filter), as a mask. Caller holds the lock."""
+        mask = self._alive.copy()
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause)
+            elif key == "$or":
+                either = np.zeros(len(self._ids), dtype=bool)
+                for clause in condition:
+                    either |= self._filter_mask(clause)
+                mask &= either
+            elif isinstance(condition, dict):
+                for operator, operand in condition.items():
+                    mask &= self._condition_mask(key, operator, operand)
+            elif isinstance(condition, (list, tuple)):
+                # agno's simple filter form: a list means "any of"
+                mask &= self._condition_mask(key, "$in", condition)
+            else:
+                mask &= self._condition_mask(key, "$eq", condition)
+        return mask
+
+    def _rows_for(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        if ids is not None:
+            rows = [self._row_of[doc_id] for doc_id in ids if doc_id in self._row_of]
+            if where:
+                mask = self._filter_mask(where)
+                rows = [row for row in rows if mask[row]]
+            return rows
+        if where:
+            return np.flatnonzero(self._filter_mask(where)).tolist()
+        return np.flatnonzero(self._alive).tolist()
+
+    def _get(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]], include: set) -> Dict[str, Any]:
+        self._ensure_loaded()
+        with self._lock:
+            rows = self._rows_for(ids, where)
+            result: Dict[str, Any] = {"ids": [self._ids[row] for row in rows]}
+            if "metadatas" in include:
+                result["metadatas"] = [dict(self._metadata[row]) for row in rows]
+            if "embeddings" in include:
+                result["embeddings"] = np.array(self._matrix()[rows]) if rows else np.zeros((0, self.dimensions or 0))
+        if "documents" in include:
+            contents = self._contents(rows)
+            result["documents"] = [contents[row] for row in rows]
+        return result
+
+    def _contents(self, rows: List[int]) -> Dict[int, str]:
+        contents: Dict[int, str] = {}
+        conn = self._connection()
+        for i in range(0, len(rows), 500):
+            part = rows[i:i + 500]
+            contents.update(conn.execute(
+                f"SELECT row, content FROM rows WHERE row IN ({','.join('?' * len(part))})", part
+            ).fetchall())
+        return contents
+
+    def _update_metadata(self, ids: List[str], metadatas: List[dict]):
+        self._ensure_loaded()
+        with self._lock:
+            updates = []
+            for doc_id, changes in zip(ids, metadatas):
+                row = self._row_of.get(doc_id)
+                if row is None:
+                    continue
+                merged = {**self._metadata[row], **changes}
+                merged = {key: value for key, value in merged.items() if value is not None}
+                self._unindex_row(row)
+                self._metadata[row] = merged
+                self._index_row(row)
+                updates.append((json.dumps(merged), row))
+            self._connection().executemany("UPDATE rows SET metadata = ? WHERE row = ?", updates)
+
+    def _delete(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]):
+        self._ensure_loaded()
+        with self._lock:
+            rows = self._rows_for(ids, where)
+            if not rows:
+                return
+            self._connection().executemany("DELETE FROM rows WHERE row = ?", [(row,) for row in rows])
+            for row in rows:
+                self._unindex_row(row)
+                del self._row_of[self._ids[row]]
+                self._ids[row] = None
+                self._metadata[row] = None
+            self._alive[rows] = False
+
+    # -- IVF ------------------------------------------------------------------------
+
+    def _assign(self, rows: np.ndarray) -> np.ndarray:
+        """Nearest centroid of each row."""
+        matrix = self._matrix()
+        assignments = np.empty(len(rows), dtype=np.int32)
+        for start in range(0, len(rows), SEARCH_BLOCK_ROWS):
+            block = rows[start:start + SEARCH_BLOCK_ROWS]
+            assignments[start:start + len(block)] = np.argmax(matrix[block] @ self._centroids.T, axis=1)
+        return assignments
+
+    def train_ivf(self):
+        """Partition the rows with spherical k-means; later inserts join their nearest partition."""
+        self._ensure_loaded()
+        with self._lock:
+            rows = np.flatnonzero(self._alive)
+            lists = self.ivf_lists or max(1, int(np.sqrt(len(rows))))
+            if len(rows) < lists:
+                return
+            rng = np.random.default_rng(0)
+            matrix = self._matrix()
+            sample = matrix[np.sort(rng.choice(rows, min(len(rows), lists * KMEANS_SAMPLE_PER_LIST), replace=False))]
+            centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+            for _ in range(KMEANS_ITERATIONS):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = np.bincount(labels, minlength=lists) == 0
+                sums[empty] = centroids[empty]
+                centroids = _normalize(sums)
+            self._centroids = centroids.astype(np.float32)
+            np.save(self._centroids_path, self._centroids)
+            self._assignments = np.full(len(self._ids), -1, dtype=np.int32)
+            self._assignments[rows] = self._assign(rows)
+            self._partitions = None
+            self._trained_rows = len(rows)
+            logger.info(f"Trained IVF index for {self.collection_name}: {lists} partitions over {len(rows)} rows")
+
+    def _use_ivf(self) -> bool:
+        """Whether to probe IVF partitions, (re)training them once the collection has doubled."""
+        if self.index != "ivf":
+            return False
+        alive = int(self._alive.sum())
+        if alive < self.ivf_min_rows:
+            return False
+        if self._centroids is None or alive > 2 * self._trained_rows:
+            self.train_ivf()
+        return self._centroids is not None
+
+    # -- search ---------------------------------------------------------------------
+
+    def search_by_embeddings(self, embeddings: Any, limit: int = 5,
+                             filters: Optional[Dict[str, Any]] = None) -> List[List[Document]]:
+        """Top `limit` rows for each query embedding, as Documents with Chroma-style cosine distances."""
+        self._ensure_loaded()
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not self._ids or not self.dimensions:
+            return [[] for _ in range(len(embeddings))]
+        queries = _normalize(embeddings.reshape(-1, self.dimensions))
+        while True:
+            with self._lock:
+                generation = self._generation
+                matrix = self._matrix()
+                allowed = self._alive.copy()
+                if filters:
+                    allowed &= self._filter_mask(filters)
+                # A filtered subset is small enough to score exactly
+                use_ivf = not filters and self._use_ivf()
+                centroids = self._centroids
+                partitions = self._partition_rows() if use_ivf else None
+
+            # Scored outside the lock, on this memory map
+            if use_ivf:
+                results = [self._ivf_top_k(matrix, query, allowed, centroids, partitions, limit) for query in queries]
+            else:
+                results = self._flat_top_k(matrix, queries, allowed, limit)
+
+            with self._lock:
+                if self._generation == generation:
+                    return [self._documents(sorted(hits, key=lambda hit: -hit[1])[:limit]) for hits in results]
+            # optimize() renumbered the rows meanwhile; score the new matrix
+
+    def _partition_rows(self) -> List[np.ndarray]:
+        """Rows of each IVF partition, rebuilt after assignments change. Caller holds the lock."""
+        if self._partitions is None:
+            order = np.argsort(self._assignments, kind="stable")
+            bounds = np.searchsorted(self._assignments[order], np.arange(len(self._centroids) + 1))
+            self._partitions = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+        return self._partitions
+
+    def _ivf_top_k(self, matrix: np.ndarray, query: np.ndarray, allowed: np.ndarray, centroids: np.ndarray,
+                   partitions: List[np.ndarray], limit: int) -> List[tuple]:
+        """Approximate top-k over the rows of the `nprobe` partitions closest to the query."""
+        nprobe = min(self.nprobe, len(centroids))
+        probes = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        pool = np.concatenate([partitions[p] for p in probes])
+        pool = np.sort(pool[allowed[pool]])
+        if not len(pool):
+            return []
+        scores = matrix[pool] @ query
+        keep = min(limit, len(pool))
+        top = np.argpartition(-scores, keep - 1)[:keep]
+        return [(int(pool[i]), float(scores[i])) for i in top]
+
+    def _flat_top_k(self, matrix: np.ndarray, queries: np.ndarray, allowed: np.ndarray, limit: int) -> List[List[tuple]]:
+        """Exact top-k over every allowed row, scoring the matrix block by block."""
+        best: List[List[tuple]] = [[] for _ in queries]
+        for start in range(0, matrix.shape[0], SEARCH_BLOCK_ROWS):
+            block_allowed = allowed[start:start + SEARCH_BLOCK_ROWS]
+            if not block_allowed.any():
+                continue
+            scores = queries @ matrix[start:start + SEARCH_BLOCK_ROWS].T
+            scores[:, ~block_allowed] = -np.inf
+            keep = min(limit, int(block_allowed.sum()))
+            top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            for i, columns in enumerate(top):
+                best[i].extend((start + int(c), float(scores[i, c])) for c in columns)
+                best[i] = sorted(best[i], key=lambda hit: -hit[1])[:limit]
+        return best
+
+    def _documents(self, hits: List[tuple]) -> List[Document]:
+        rows = [row for row, _ in hits]
+        contents = self._contents(rows)
+        matrix = self._matrix()
+        return [
+            Document(
+                id=self._ids[row],
+                content=contents.get(row, ""),
+                meta_data={**(self._metadata[row] or {}), "distances": 1.0 - score},
+                embedding=matrix[row].tolist(),
+            )
+            for row, score in hits
+        ]
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        embedding = self.embedder.get_embedding(query)
+        if not embedding:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        documents = self.search_by_embeddings([embedding], limit, filters)[0]
+        if self.reranker:
+            documents = self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    def search_many(self, queries: List[str], limit: int = 5,
+                    filters: Optional[Dict[str, Any]] = None) -> List[List[Document]]:
+        """Embed and search several queries with one embedding batch and one matrix product."""
+        return self.search_by_embeddings(embed_batch(self.embedder, queries), limit, filters)
+
+    def vector_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self.search(query, limit)
+
+    # -- agno VectorDb interface ----------------------------------------------------
+
+    def create(self) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if not os.path.exists(self._vectors_path):
+                open(self._vectors_path, "ab").close()
+            self._load()
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, "rows.db"))
+
+    def drop(self) -> None:
+        with self._lock:
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+            self._map = None
+            self._generation += 1
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._loaded = False
+
+    def delete(self) -> bool:
+        self.drop()
+        self.create()
+        return True
+
+    def get_count(self) -> int:
+        self._ensure_loaded()
+        return len(self._row_of)
+
+    def id_exists(self, id: str) -> bool:
+        self._ensure_loaded()
+        return id in self._row_of
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.id_exists(chunk_id(document.content))
+
+    def name_exists(self, name: str) -> bool:
+        # Like ChromaDb, rows keep no document names unless the metadata carries one
+        self._ensure_loaded()
+        return any(metadata and metadata.get("name") == name for metadata in self._metadata)
+
+    def _rows_from_documents(self, documents: List[Document], filters: Optional[Dict[str, Any]]):
+        embeddings = embed_batch(self.embedder, [document.content for document in documents])
+        metadatas = []
+        for document in documents:
+            metadata = dict(document.meta_data or {})
+            if filters:
+                metadata.update(filters)
+            metadatas.append(metadata)
+        return ([chunk_id(document.content) for document in documents], embeddings,
+                [clean_content(document.content) for document in documents], metadatas)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        if documents:
+            self.collection.add(*self._rows_from_documents(documents, filters))
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        if documents:
+            self.collection.upsert(*self._rows_from_documents(documents, filters))
+
+    def optimize(self) -> None:
+        """Compact away deleted rows and, in IVF mode, retrain the partitions."""
+        self._ensure_loaded()
+        with self._lock:
+            rows = np.flatnonzero(self._alive)
+            if len(rows) < len(self._ids):
+                matrix = np.array(self._matrix()[rows])
+                contents = self._contents(rows.tolist())
+                conn = self._connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    records = [(new_row, self._ids[row], contents[row], json.dumps(self._metadata[row]))
+                               for new_row, row in enumerate(rows)]
+                    conn.execute("DELETE FROM rows")
+                    conn.executemany("INSERT INTO rows (row, id, content, metadata) VALUES (?, ?, ?, ?)", records)
+                    # A new file renamed over the old one: searches still scoring an existing
+                    # memory map keep reading the old, complete file
+                    fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".f32")
+                    try:
+                        with os.fdopen(fd, "wb") as f:
+                            f.write(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+                        os.replace(tmp_path, self._vectors_path)
+                    except BaseException:
+                        os.remove(tmp_path)
+                        raise
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                self._load()
+            if self.index == "ivf" and len(self._row_of) >= self.ivf_min_rows:
+                self.train_ivf()
+
+    async def async_create(self) -> None:
+        await asyncio.to_thread(self.create)
+
+    async def async_exists(self) -> bool:
+        return await asyncio.to_thread(self.exists)
+
+    async def async_drop(self) -> None:
+        await asyncio.to_thread(self.drop)
+
+    async def async_doc_exists(self, document: Document) -> bool:
+        return await asyncio.to_thread(self.doc_exists, document)
+
+    async def async_name_exists(self, name: str) -> bool:
+        return await asyncio.to_thread(self.name_exists, name)
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.insert, documents, filters)
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await asyncio.to_thread(self.upsert, documents, filters)
+
+    async def async_search(self, query: str, limit: int = 5,
+                           filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return await asyncio.to_thread(self.search, query, limit, filters)
@@ -0,0 +1,92 @@
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Runs independent units of work (one per source) on a shared, bounded executor.
+# Every unit gets its own timeout, counted from when it starts running rather than
+# when it was queued, so a slow source neither blocks the others nor eats the budget
+# of sources still waiting for a worker. An overall deadline, counted from submit,
+# bounds the whole batch: once it passes, calls still queued are cancelled and running
+# ones are abandoned. Timed-out work cannot be interrupted; its result is abandoned and
+# the worker frees up once the call returns, so a shared pool can stay busy with
+# abandoned calls for a while and the overall deadline keeps later batches from
+# queueing behind them indefinitely.
+
+
+class SourceTimeoutError(TimeoutError):
+    """A unit of work did not finish within its timeout."""
+
+
+def run_with_timeouts(
+    executor: Executor,
+    calls: Dict[Hashable, Callable[[], Any]],
+    timeout: Optional[float],
+    total_timeout: Optional[float] = None,
+) -> Dict[Hashable, Tuple[Any, Optional[BaseException]]]:
+    """
+    Run the calls concurrently and collect their outcomes.
+
+    Args:
+        executor: Bounded executor the calls are submitted to.
+        calls: Zero-argument callables by key.
+        timeout: Seconds each call may run once started, or None for no limit.
+        total_timeout: Seconds from submit until every call must be done, including time
+            spent queued for a worker, or None for no overall limit.
+
+    Returns:
+        dict: key -> (result, None) on success or (None, error) on failure or timeout,
+        in the same key order as calls.
+    """
+    started: Dict[Hashable, float] = {}
+    lock = threading.Lock()
+
+    def timed(key: Hashable, fn: Callable[[], Any]) -> Any:
+        with lock:
+            started[key] = time.monotonic()
+        return fn()
+
+    submitted = time.monotonic()
+    futures: Dict[Future, Hashable] = {executor.submit(timed, key, fn): key for key, fn in calls.items()}
+    outcomes: Dict[Hashable, Tuple[Any, Optional[BaseException]]] = {}
+    pending = set(futures)
+    overall_deadline = submitted + total_timeout if total_timeout is not None else None
+
+    while pending:
+        deadlines = [overall_deadline] if overall_deadline is not None else []
+        if timeout is not None:
+            with lock:
+                deadlines.extend(started[futures[f]] + timeout for f in pending if futures[f] in started)
+        wait_for = None
+        if deadlines or timeout is not None:
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else 1.0
+            if timeout is not None:
+                # Re-check at least every second so queued calls' deadlines are picked up once they start
+                wait_for = min(wait_for, 1.0)
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            error = future.exception()
+            outcomes[futures[future]] = (None, error) if error else (future.result(), None)
+
+        now = time.monotonic()
+        if overall_deadline is not None and now >= overall_deadline:
+            for future in pending:
+                with lock:
+                    running = futures[future] in started
+                # Cancelling only succeeds for calls that have not started yet
+                if future.cancel() or not running:
+                    message = f"still queued after {total_timeout:.0f}s"
+                else:
+                    message = f"not finished {total_timeout:.0f}s after submit"
+                outcomes[futures[future]] = (None, SourceTimeoutError(message))
+            pending = set()
+        elif timeout is not None:
+            with lock:
+                expired = {f for f in pending if futures[f] in started and now - started[futures[f]] >= timeout}
+            for future in expired:
+                future.cancel()
+                outcomes[futures[future]] = (None, SourceTimeoutError(f"timed out after {timeout:.0f}s"))
+            pending -= expired
+
+    return {key: outcomes[key] for key in calls}
@@ -0,0 +1,154 @@
+import os
+import math
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional
+from agno.utils.log import logger
+from utils.pdf_stream import iter_page_texts, open_pdf
+
+# PDF text extraction in a process pool.
+# pypdf's extract_text is pure Python, so parsing a large PDF on a request thread holds the
+# GIL for seconds and runs on one core however many the machine has. ParallelPDFExtractor
+# splits a document into page ranges and extracts them in worker processes: each task
+# carries only the spooled file's path and a range, the worker opens the file itself, and
+# only the page texts come back. Ranges are submitted a few at a time and yielded in page
+# order, so the chunking and embedding stages downstream still see a page stream.
+# Short documents are read in-process, where pool round trips would cost more than they save.
+#
+# Workers are forked where the platform allows it: spawn and forkserver workers re-import
+# the main script, and the app scripts build knowledge bases at import time. Forking a
+# process that runs other threads can leave a child stuck on a lock one of them held, so
+# the pool forks all of its workers when the extractor is constructed. Construct it at
+# startup, before the app starts threads. A pool forked later (after close()) is created
+# only while the process has no other threads; otherwise pages are read in-process.
+# The pool is kept small (DEFAULT_MAX_WORKERS), since the server also runs thread pools.
+# A worker that dies (e.g. killed for memory) breaks the whole pool; it is then dropped and
+# the document resumes from its first unread page on a new pool, or in-process when a new
+# one cannot be forked or the document breaks the pool again.
+
+PAGES_PER_TASK = 16
+MIN_PARALLEL_PAGES = 32
+# Ranges queued per worker, so workers never wait on the consumer for their next range
+TASKS_PER_WORKER = 2
+# Pools a document may break before its remaining pages are read in-process
+MAX_POOL_ATTEMPTS = 2
+DEFAULT_MAX_WORKERS = min(2, os.cpu_count() or 1)
+
+
+def page_count(path: str, password: Optional[str] = None) -> int:
+    with open(path, "rb") as f:
+        return len(open_pdf(f, path, password).pages)
+
+
+def extract_page_range(path: str, start: int, stop: int, password: Optional[str] = None) -> List[str]:
+    """Text of pages [start, stop) of a PDF file; runs in a worker process."""
+    with open(path, "rb") as f:
+        pdf = open_pdf(f, path, password)
+        return [pdf.pages[index].extract_text() or "" for index in range(start, min(stop, len(pdf.pages)))]
+
+
+class ParallelPDFExtractor:
+    """Extracts page texts of large PDFs across a pool of worker processes."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = PAGES_PER_TASK,
+        min_parallel_pages: int = MIN_PARALLEL_PAGES,
+        start_method: Optional[str] = None,
+    ):
+        # 0 workers reads every document in-process
+        self.max_workers = DEFAULT_MAX_WORKERS if max_workers is None else max_workers
+        self.pages_per_task = pages_per_task
+        self.min_parallel_pages = min_parallel_pages
+        methods = multiprocessing.get_all_start_methods()
+        self.start_method = start_method or ("fork" if "fork" in methods else "spawn")
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.max_workers > 0:
+            with self._lock:
+                self._start()
+
+    def _start(self):
+        """Create the pool and its worker processes now. Caller holds the lock."""
+        if self.start_method == "fork" and threading.active_count() > 1:
+            logger.warning(f"Not forking PDF extraction workers: {threading.active_count() - 1} other threads "
+                           f"are running; extracting pages in-process")
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                         mp_context=multiprocessing.get_context(self.start_method))
+        # With fork, the first submit forks every worker before the pool starts its own thread
+        self._pool.submit(os.getpid)
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pool is None:
+                self._start()
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool, so the next _executor() call starts a new one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ranges(self, first: int, pages: int) -> List[tuple]:
+        # At least pages_per_task per range; larger ranges for long documents, so each
+        # worker re-opens the file a bounded number of times
+        size = max(self.pages_per_task, math.ceil(pages / (self.max_workers * 4)))
+        return [(start, min(start + size, pages)) for start in range(first, pages, size)]
+
+    def _pool_page_texts(self, executor: ProcessPoolExecutor, path: str, first: int, pages: int,
+                         password: Optional[str]) -> Iterator[str]:
+        ranges = iter(self._ranges(first, pages))
+        pending = deque()
+
+        def submit_next():
+            page_range = next(ranges, None)
+            if page_range is not None:
+                pending.append(executor.submit(extract_page_range, path, *page_range, password))
+
+        for _ in range(self.max_workers * TASKS_PER_WORKER):
+            submit_next()
+        try:
+            while pending:
+                texts = pending.popleft().result()
+                submit_next()
+                yield from texts
+        finally:
+            # The consumer stopped early (or a range failed); drop the ranges not yet started
+            for future in pending:
+                future.cancel()
+
+    def iter_page_texts(self, path: str, password: Optional[str] = None) -> Iterator[str]:
+        """Yield the text of each page in order, extracted by the pool for large documents."""
+        pages = page_count(path, password)
+        if self.max_workers < 1 or pages < self.min_parallel_pages:
+            yield from iter_page_texts(path, password)
+            return
+
+        done = 0
+        for _ in range(MAX_POOL_ATTEMPTS):
+            executor = self._executor()
+            if executor is None:
+                break
+            try:
+                for text in self._pool_page_texts(executor, path, done, pages, password):
+                    done += 1
+                    yield text
+                return
+            except BrokenProcessPool as e:
+                logger.warning(f"PDF extraction pool broke at page {done} of {pages} ({str(e)}); "
+                               f"dropping it and resuming from that page")
+                self._discard(executor)
+        yield from iter_page_texts(path, password, start=done)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
@@ -0,0 +1,110 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from agno.utils.log import logger
+from utils.pdf_stream import SpooledDownload, spool_download
+
+# Concurrent PDF downloads over one pooled HTTP client.
+# Downloading a request's PDFs one after another, each with a fresh client, pays a new
+# connection (and TLS handshake) per PDF and leaves the network idle while earlier PDFs are
+# parsed. PooledPDFFetcher keeps one httpx.Client, so connections to a host are reused
+# across PDFs, runs downloads on a small thread pool, and caps in-flight downloads per host
+# with a semaphore so a prompt full of links to one site does not hammer it.
+# Downloads are spooled to temporary files (utils/pdf_stream.py) and may be conditional
+# (If-None-Match / If-Modified-Since), in which case a 304 comes back without a file.
+
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_MAX_WORKERS = 8
+
+
+def conditional_headers(etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict[str, str]:
+    """Request headers that turn a download into a conditional one."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class PooledPDFFetcher:
+    """Downloads PDFs concurrently through a shared connection pool with per-host limits."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        per_host: int = DEFAULT_PER_HOST,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = 60.0,
+    ):
+        if max_connections < 1 or per_host < 1 or max_workers < 1:
+            raise ValueError(f"Invalid max_connections={max_connections} / per_host={per_host} / "
+                             f"max_workers={max_workers}; all must be >= 1")
+        self.per_host = per_host
+        self.client = httpx.Client(
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-fetch")
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.Semaphore] = {}
+        self._stats = {"downloads": 0, "not_modified": 0, "failed": 0, "bytes": 0}
+
+    def _slots(self, url: str) -> threading.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.Semaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> SpooledDownload:
+        """
+        Download one PDF (conditionally, given validator headers) into a temporary file.
+
+        The caller owns the returned file and must remove it.
+        """
+        with self._slots(url):
+            try:
+                download = spool_download(url, headers=headers, client=self.client)
+            except Exception:
+                self._count("failed")
+                raise
+        if download.status_code == 304:
+            self._count("not_modified")
+        else:
+            self._count("downloads")
+            self._count("bytes", os.path.getsize(download.path))
+        return download
+
+    def submit(self, url: str, headers: Optional[Dict[str, str]] = None) -> Future:
+        """Start a download in the background; the future resolves to a SpooledDownload."""
+        return self._executor.submit(self.fetch, url, headers)
+
+    def fetch_all(self, requests: Dict[str, Optional[Dict[str, str]]]) -> Dict[str, Future]:
+        """Start every download at once; url -> future, in input order."""
+        return {url: self.submit(url, headers) for url, headers in requests.items()}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.client.close()
+        logger.debug(f"PDF fetcher closed: {self.stats()}")
+
+    def __enter__(self) -> "PooledPDFFetcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
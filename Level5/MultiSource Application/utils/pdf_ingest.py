@@ -0,0 +1,298 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from agno.utils.log import logger
+from utils.embedding_pipeline import EmbeddingPipeline, chunk_id, collection_for
+from utils.pdf_extract import ParallelPDFExtractor
+from utils.pdf_fetch import PooledPDFFetcher, conditional_headers
+from utils.pdf_stream import SpooledDownload, StreamingPDFReader, doc_name_for
+from utils.scoped_retrieval import ScopedRetriever
+from utils.url_utils import normalize_url
+
+# Incremental ingestion for PDFUrlKnowledgeBase.
+# A JSON manifest records, per URL, the ETag / Last-Modified validators, the SHA-256 of the
+# downloaded bytes and the ids of the chunks stored in the vector db. On the next load:
+#   - the download is conditional, and a 304 skips the document entirely;
+#   - identical bytes skip parsing, chunking and embedding;
+#   - both skips need every chunk in the manifest to be stored. The vector db may be
+#     in-memory, or recreated, while the manifest survives a restart. A document with
+#     missing chunks is downloaded unconditionally and re-ingested.
+#   - changed bytes are re-chunked, and only chunks whose ids are new are embedded and
+#     inserted, while ids that disappeared are deleted.
+# Chunk ids are md5 of the cleaned chunk text, exactly as agno's ChromaDb.insert derives
+# them, so ids in the manifest and the collection line up.
+# Downloads are spooled to disk and parsed page by page (utils/pdf_stream.py), so new chunks
+# reach the embedding pipeline while later pages are still being read. ingest() starts all of
+# its downloads at once through a pooled fetcher (utils/pdf_fetch.py) and processes each PDF
+# as soon as its download finishes. Page text of large PDFs is extracted in a process pool
+# (utils/pdf_extract.py).
+#
+# Chunks are tagged with the doc_id and source_url of the PDF that first stored them
+# (identical text in several PDFs shares one row). retriever() scopes search to a set of
+# URLs using the manifest's chunk ids, which also covers those shared rows.
+
+# Version 2 added the document tags; older manifests are re-checked so stored chunks get tagged
+MANIFEST_VERSION = 2
+# Chunks checked against the collection per query while streaming
+STORED_CHECK_BATCH = 100
+
+
+def doc_id_for_url(url: str) -> str:
+    """Stable document id for a PDF URL."""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()[:16]
+
+
+def document_tags(url: str) -> Dict[str, Any]:
+    """Metadata a PDF's chunks are stored with."""
+    return {"doc_id": doc_id_for_url(url), "source_url": url}
+
+
+class IncrementalPDFIngestor:
+    """Loads PDF URLs into a knowledge base's vector db, skipping work for unchanged documents."""
+
+    def __init__(self, knowledge_base, manifest_path: Optional[str] = None, timeout: float = 60.0,
+                 embedding_pipeline: Optional[EmbeddingPipeline] = None, fetcher: Optional[PooledPDFFetcher] = None,
+                 extractor: Optional[ParallelPDFExtractor] = None):
+        self.knowledge_base = knowledge_base
+        self.vector_db = knowledge_base.vector_db
+        self.reader = knowledge_base.reader
+        # Page text of large PDFs is extracted in worker processes, off the request thread's GIL
+        self.extractor = extractor or ParallelPDFExtractor()
+        self.streaming_reader = StreamingPDFReader(self.reader, extractor=self.extractor)
+        # New chunks are embedded in concurrent batches instead of ChromaDb.insert's one-by-one
+        self.embedding_pipeline = embedding_pipeline or EmbeddingPipeline(self.vector_db.embedder)
+        self.manifest_path = manifest_path or os.path.join(
+            "tmp", f"{self.vector_db.collection_name}_pdf_manifest.json"
+        )
+        self.timeout = timeout
+        # Shared connection pool with per-host limits, used for every download
+        self.fetcher = fetcher or PooledPDFFetcher(timeout=timeout)
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._stats = {"unchanged": 0, "not_modified": 0, "updated": 0, "new": 0, "failed": 0,
+                       "chunks_inserted": 0, "chunks_deleted": 0, "chunks_reused": 0}
+
+    def _load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable PDF manifest {self.manifest_path}: {str(e)}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("documents", {})
+
+    def _save_manifest(self):
+        """Write the manifest atomically. Caller holds the lock."""
+        directory = os.path.dirname(self.manifest_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "documents": self._manifest}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _collection(self):
+        return collection_for(self.vector_db)
+
+    def _stored_ids(self, ids: List[str]) -> set:
+        """Subset of the ids present in the collection."""
+        if not ids:
+            return set()
+        return set(self._collection().get(ids=ids, include=[])["ids"])
+
+    def _stored_metadata(self, ids: List[str]) -> Dict[str, dict]:
+        """Metadata of the ids present in the collection."""
+        if not ids:
+            return {}
+        result = self._collection().get(ids=ids, include=["metadatas"])
+        return {cid: metadata or {} for cid, metadata in zip(result["ids"], result["metadatas"])}
+
+    @staticmethod
+    def _validator_headers(entry: Optional[dict]) -> Dict[str, str]:
+        """Conditional request headers from a manifest entry."""
+        if not entry:
+            return {}
+        return conditional_headers(entry.get("etag"), entry.get("last_modified"))
+
+    def _new_chunks(self, url: str, path: str, chunk_ids: List[str]) -> Iterator:
+        """
+        Yield the PDF's chunks that are not stored yet, tagged with the document, page by page.
+
+        Stored chunks from before tagging get this document's tags. Every distinct chunk id
+        is appended to `chunk_ids` as it is seen.
+        """
+        tags = document_tags(url)
+        seen = set()
+        buffer = []
+
+        def unstored():
+            stored = self._stored_metadata([chunk_id(document.content) for document in buffer])
+            untagged = [cid for cid, metadata in stored.items() if "doc_id" not in metadata]
+            if untagged:
+                self._collection().update(ids=untagged, metadatas=[tags] * len(untagged))
+            return [document for document in buffer if chunk_id(document.content) not in stored]
+
+        for document in self.streaming_reader.iter_documents(path, doc_name_for(url)):
+            cid = chunk_id(document.content)
+            if cid in seen:
+                continue
+            seen.add(cid)
+            chunk_ids.append(cid)
+            document.meta_data = {**(document.meta_data or {}), **tags}
+            buffer.append(document)
+            if len(buffer) == STORED_CHECK_BATCH:
+                yield from unstored()
+                buffer = []
+        if buffer:
+            yield from unstored()
+
+    def _referenced_elsewhere(self, url: str) -> set:
+        """Chunk ids that other manifest entries still use (identical text across PDFs)."""
+        with self._lock:
+            return {cid for other, entry in self._manifest.items() if other != url for cid in entry["chunk_ids"]}
+
+    def _complete_entries(self, urls: List[str]) -> Dict[str, Optional[dict]]:
+        """Manifest entries of the URLs, None where there is none or some of its chunks are not stored."""
+        stale = set(self.validate(urls))
+        with self._lock:
+            return {url: None if url in stale else self._manifest.get(url) for url in urls}
+
+    def ingest_url(self, url: str) -> str:
+        """
+        Bring one PDF URL up to date in the vector db.
+
+        Returns:
+            str: 'not_modified', 'unchanged', 'updated' or 'new'.
+        """
+        entry = self._complete_entries([url])[url]
+        return self._ingest_download(url, self.fetcher.fetch(url, self._validator_headers(entry)), entry)
+
+    def _ingest_download(self, url: str, download: SpooledDownload, complete_entry: Optional[dict]) -> str:
+        """
+        Bring one PDF URL up to date from its download; removes the download.
+
+        complete_entry is the URL's manifest entry if all its chunks are stored, else None.
+        Only then was the download conditional and can identical bytes be skipped.
+        """
+        with self._lock:
+            entry = self._manifest.get(url)
+        if download.status_code == 304:
+            self._count("not_modified")
+            return "not_modified"
+
+        try:
+            headers = {name.lower(): value for name, value in download.headers.items()}
+            validators = {"etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
+            # Same bytes and the chunks are all still stored
+            if complete_entry and complete_entry["sha256"] == download.sha256:
+                with self._lock:
+                    complete_entry.update(validators)
+                    self._save_manifest()
+                self._count("unchanged")
+                return "unchanged"
+
+            # Pages are parsed, chunked and embedded as a stream; only unstored chunks are embedded
+            chunk_ids: List[str] = []
+            new_chunks = self._new_chunks(url, download.path, chunk_ids)
+            inserted = int(self.embedding_pipeline.insert_documents(self.vector_db, new_chunks)["chunks"])
+        finally:
+            os.remove(download.path)
+
+        old_ids = set(entry["chunk_ids"]) if entry else set()
+        to_delete = sorted((old_ids - set(chunk_ids)) - self._referenced_elsewhere(url))
+        if to_delete:
+            self._collection().delete(ids=to_delete)
+
+        with self._lock:
+            self._manifest[url] = {
+                **validators,
+                "sha256": download.sha256,
+                "chunk_ids": chunk_ids,
+                "ingested_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save_manifest()
+
+        status = "updated" if entry else "new"
+        self._count(status)
+        self._count("chunks_inserted", inserted)
+        self._count("chunks_deleted", len(to_delete))
+        self._count("chunks_reused", len(chunk_ids) - inserted)
+        logger.info(f"Ingested {url} ({status}): {inserted} chunks embedded, {len(to_delete)} removed, "
+                    f"{len(chunk_ids) - inserted} reused")
+        return status
+
+    def retriever(self, urls: List[str]) -> ScopedRetriever:
+        """
+        Agent retriever that searches only the chunks of the given PDF URLs.
+
+        Uses the chunk ids recorded in the manifest, or a doc_id filter for URLs it has not
+        ingested.
+        """
+        with self._lock:
+            entries = [self._manifest.get(url) for url in urls]
+        if all(entries):
+            ids = list(dict.fromkeys(cid for entry in entries for cid in entry["chunk_ids"]))
+            return ScopedRetriever(self.vector_db, ids=ids)
+        return ScopedRetriever(self.vector_db, where={"doc_id": {"$in": [doc_id_for_url(url) for url in urls]}})
+
+    def validate(self, urls: List[str]) -> List[str]:
+        """
+        URLs that need ingesting: no manifest entry, or some of its chunks are no longer stored.
+
+        Checks only the manifest and the collection; nothing is downloaded.
+        """
+        stale = []
+        for url in urls:
+            with self._lock:
+                entry = self._manifest.get(url)
+            if entry is None:
+                stale.append(url)
+                continue
+            chunk_ids = list(dict.fromkeys(entry["chunk_ids"]))
+            for start in range(0, len(chunk_ids), STORED_CHECK_BATCH):
+                batch = chunk_ids[start:start + STORED_CHECK_BATCH]
+                if len(self._stored_ids(batch)) < len(batch):
+                    stale.append(url)
+                    break
+        return stale
+
+    def ingest(self, urls: List[str]) -> Dict[str, str]:
+        """
+        Bring several PDF URLs up to date; failures are logged and reported as 'failed'.
+
+        All downloads start at once; each PDF is parsed and embedded as soon as its download
+        completes, while the others are still in flight.
+
+        Returns:
+            dict: url -> status, in input order.
+        """
+        # Documents with missing chunks are downloaded unconditionally
+        entries = self._complete_entries(urls)
+        futures = self.fetcher.fetch_all({url: self._validator_headers(entry) for url, entry in entries.items()})
+        url_of = {future: url for url, future in futures.items()}
+        results = {}
+        for future in as_completed(url_of):
+            url = url_of[future]
+            try:
+                results[url] = self._ingest_download(url, future.result(), entries[url])
+            except Exception as e:
+                logger.error(f"Failed to ingest PDF {url}: {str(e)}")
+                self._count("failed")
+                results[url] = "failed"
+        return {url: results[url] for url in entries}
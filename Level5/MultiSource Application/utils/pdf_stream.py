@@ -0,0 +1,145 @@
+import os
+import re
+import hashlib
+import tempfile
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+import httpx
+from pypdf import PdfReader
+from agno.document import Document
+from agno.document.reader.pdf_reader import (
+    PAGE_END_NUMBERING_FORMAT_DEFAULT,
+    PAGE_START_NUMBERING_FORMAT_DEFAULT,
+    _clean_page_numbers,
+)
+
+# Bounded-memory PDF reading.
+# PDFUrlReader holds the whole download in memory, extracts every page, then chunks.
+# Here the download is spooled to a temporary file (hashed on the way), pypdf reads from
+# the open file instead of a bytes copy, and pages are extracted, numbered and chunked one
+# at a time, so memory stays flat however many pages the document has.
+#
+# Page numbers are cleaned like agno's reader does, except that the numbering shift is
+# detected on the first PAGE_NUMBER_WINDOW pages instead of the whole document.
+
+SPOOL_CHUNK_SIZE = 1 << 16
+PAGE_NUMBER_WINDOW = 10
+# pypdf caches every object it resolves; dropping the cache this often bounds it
+RESOLVED_OBJECT_FLUSH_PAGES = 25
+
+
+class SpooledDownload(NamedTuple):
+    path: Optional[str]  # None for a 304 Not Modified
+    sha256: Optional[str]
+    status_code: int
+    headers: Dict[str, str]
+
+
+def spool_download(url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 60.0,
+                   client: Optional[httpx.Client] = None, directory: Optional[str] = None) -> SpooledDownload:
+    """
+    Stream a download into a temporary file and hash it on the way.
+
+    The caller owns the returned file and must remove it.
+    """
+    http = client or httpx.Client(follow_redirects=True, timeout=timeout)
+    try:
+        with http.stream("GET", url, headers=headers or {}) as response:
+            if response.status_code == 304:
+                return SpooledDownload(None, None, 304, dict(response.headers))
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            fd, path = tempfile.mkstemp(suffix=".pdf", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for block in response.iter_bytes(SPOOL_CHUNK_SIZE):
+                        digest.update(block)
+                        f.write(block)
+            except BaseException:
+                os.remove(path)
+                raise
+            return SpooledDownload(path, digest.hexdigest(), response.status_code, dict(response.headers))
+    finally:
+        if client is None:
+            http.close()
+
+
+def doc_name_for(url: str) -> str:
+    """Document name PDFUrlReader derives from a URL."""
+    return url.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
+
+
+def open_pdf(f: Any, path: str, password: Optional[str] = None) -> PdfReader:
+    """PdfReader over an open file, decrypted if needed."""
+    pdf = PdfReader(f)
+    if pdf.is_encrypted:
+        if password is None or not pdf.decrypt(password):
+            raise ValueError(f"Could not decrypt {path}")
+    return pdf
+
+
+def iter_page_texts(path: str, password: Optional[str] = None, start: int = 0) -> Iterator[str]:
+    """Yield the text of each page from page `start` on, reading the file lazily."""
+    with open(path, "rb") as f:
+        pdf = open_pdf(f, path, password)
+        for index in range(start, len(pdf.pages)):
+            yield pdf.pages[index].extract_text() or ""
+            # Drop the page and pypdf's object cache so finished pages can be freed
+            pdf.flattened_pages[index] = None
+            if index % RESOLVED_OBJECT_FLUSH_PAGES == 0:
+                pdf.resolved_objects.clear()
+
+
+class StreamingPDFReader:
+    """
+    Page-by-page PDF to Document conversion using an agno PDF reader's settings and chunking.
+
+    Page text comes from iter_page_texts, or from `extractor.iter_page_texts` (same
+    signature) when an extractor is given, e.g. a ParallelPDFExtractor.
+    """
+
+    def __init__(self, reader: Any, page_number_window: int = PAGE_NUMBER_WINDOW, extractor: Any = None):
+        self.reader = reader
+        self.page_number_window = page_number_window
+        self.page_texts = extractor.iter_page_texts if extractor is not None else iter_page_texts
+        self.start_format = getattr(reader, "page_start_numbering_format", PAGE_START_NUMBERING_FORMAT_DEFAULT)
+        self.end_format = getattr(reader, "page_end_numbering_format", PAGE_END_NUMBERING_FORMAT_DEFAULT)
+
+    def _format_page(self, content: str, expected_number: int) -> str:
+        content = re.sub(rf"^\s*{expected_number}\s*|\s*{expected_number}\s*$", "", content)
+        start = self.start_format.format(page_nr=expected_number) + "\n" if self.start_format else ""
+        end = "\n" + self.end_format.format(page_nr=expected_number) if self.end_format else ""
+        return start + content + end
+
+    def _numbered_pages(self, pages: Iterator[str]) -> Iterator[tuple]:
+        """Yield (page_number, content) with page numbers cleaned like agno's reader."""
+        window: List[str] = []
+        for content in pages:
+            window.append(content)
+            if len(window) == self.page_number_window:
+                break
+        cleaned, shift = _clean_page_numbers(list(window), [], self.start_format, self.end_format)
+        first = shift if shift is not None else 1
+        for index, content in enumerate(cleaned):
+            yield first + index, content
+        for index, content in enumerate(pages, start=len(window)):
+            yield first + index, self._format_page(content, index + shift) if shift is not None else content
+
+    def iter_documents(self, path: str, doc_name: str, password: Optional[str] = None) -> Iterator[Document]:
+        """Yield the PDF's chunked Documents, one page at a time."""
+        password = password or getattr(self.reader, "password", None)
+        chunk = getattr(self.reader, "chunk", True)
+        split_on_pages = getattr(self.reader, "split_on_pages", True)
+        if not split_on_pages:
+            # One document for the whole file; nothing to stream
+            content = "\n".join(content for _, content in self._numbered_pages(self.page_texts(path, password)))
+            document = Document(name=doc_name, id=doc_name, meta_data={}, content=content)
+            yield from (self.reader.chunk_document(document) if chunk else [document])
+            return
+
+        for page_number, content in self._numbered_pages(self.page_texts(path, password)):
+            document = Document(name=doc_name, id=f"{doc_name}_{page_number}", meta_data={"page": page_number},
+                                content=content)
+            if chunk:
+                yield from self.reader.chunk_document(document)
+            else:
+                yield document
@@ -0,0 +1,62 @@
+import time
+import threading
+from typing import Dict, Optional
+
+# Thread-safe token bucket for client-side rate limiting of provider APIs
+# (embedding requests, TTS requests). Tokens refill continuously at `rate` per second
+# up to `capacity`; callers block in acquire() until enough tokens are available.
+
+
+class TokenBucket:
+    """Blocking token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}. Expected a positive number of tokens per second")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waited_s = 0.0
+        self._acquired = 0
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None) -> "TokenBucket":
+        """Bucket allowing `requests` per minute with bursts of up to `burst`."""
+        return cls(requests / 60.0, burst)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, waiting for them to refill if needed.
+
+        Returns:
+            bool: False if they could not be taken within the timeout.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self._acquired += 1
+                    self._waited_s += now - start
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, float]:
+        """Acquisitions so far and the total time callers spent waiting."""
+        with self._lock:
+            return {"acquired": self._acquired, "waited_s": self._waited_s}
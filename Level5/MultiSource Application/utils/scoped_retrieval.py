@@ -0,0 +1,71 @@
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+from agno.document import Document
+from agno.utils.log import logger
+from utils.embedding_pipeline import collection_for
+
+# Retrieval restricted to one request's documents in a shared Chroma collection.
+# A filtered Chroma query still walks the collection-wide index, so it gets slower as the
+# collection grows, and agno only passes knowledge_filters on keys it saw at load time.
+# ScopedRetriever instead fetches the scoped rows once (by id, or by a where-filter),
+# keeps their normalized vectors in a matrix and ranks each query with one dot product.
+# The cost depends on the size of the documents in scope, not of the collection.
+
+
+class ScopedRetriever:
+    """agno Agent retriever over a fixed subset of a vector db collection."""
+
+    def __init__(self, vector_db: Any, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+                 default_limit: int = 5):
+        if (ids is None) == (where is None):
+            raise ValueError("ScopedRetriever needs exactly one of ids or where")
+        self.vector_db = vector_db
+        self.ids = ids
+        self.where = where
+        self.default_limit = default_limit
+        self._lock = threading.Lock()
+        self._rows: Optional[dict] = None
+        self._matrix: Optional[np.ndarray] = None
+
+    def _load(self):
+        """Fetch the scoped rows and their vectors on first use."""
+        with self._lock:
+            if self._rows is not None:
+                return
+            collection = collection_for(self.vector_db)
+            include = ["embeddings", "documents", "metadatas"]
+            if self.ids is not None:
+                rows = collection.get(ids=self.ids, include=include) if self.ids else {"ids": []}
+            else:
+                rows = collection.get(where=self.where, include=include)
+            if len(rows["ids"]):
+                matrix = np.asarray(rows["embeddings"], dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._matrix = matrix / np.where(norms == 0, 1, norms)
+            self._rows = rows
+            logger.debug(f"Scoped retrieval over {len(rows['ids'])} chunks")
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Document]:
+        """Top chunks in scope by cosine similarity, with Chroma-style cosine distances."""
+        self._load()
+        if self._matrix is None:
+            return []
+        query_embedding = np.asarray(self.vector_db.embedder.get_embedding(query), dtype=np.float32)
+        norm = np.linalg.norm(query_embedding)
+        scores = self._matrix @ (query_embedding / norm if norm else query_embedding)
+        limit = min(limit or self.default_limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [
+            Document(
+                id=self._rows["ids"][i],
+                content=self._rows["documents"][i],
+                meta_data={**(self._rows["metadatas"][i] or {}), "distances": float(1.0 - scores[i])},
+            )
+            for i in top
+        ]
+
+    def __call__(self, query: str, num_documents: Optional[int] = None, **kwargs) -> Optional[List[dict]]:
+        documents = self.search(query, num_documents)
+        return [document.to_dict() for document in documents] or None
@@ -0,0 +1,178 @@
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from agno.utils.log import logger
+from utils.cache_backend import SQLiteCacheBackend
+from utils.cache_keys import canonicalize_prompt
+
+# Optional semantic tier in front of the exact workflow cache.
+# The non-URL part of a prompt is embedded and compared by cosine similarity against the
+# embeddings of previously cached prompts with exactly the same canonical URL set. A
+# match above the threshold returns the cache key of the earlier prompt, so paraphrases
+# ("summarize this pdf" vs "give me a summary of this pdf") reuse its response.
+
+
+def url_set_key(canonical: Dict[str, object]) -> str:
+    """Digest of the canonical URL set; semantic matches never cross URL sets."""
+    urls = {field: canonical[field] for field in ("pdf_urls", "youtube_urls", "web_urls")}
+    return hashlib.sha256(json.dumps(urls, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    """Array-backed cosine top-1 index over embeddings of cached prompts."""
+
+    def __init__(self, embedder, backend: SQLiteCacheBackend, threshold: float = 0.92,
+                 table_name: str = "semantic_cache", initial_capacity: int = 256):
+        self.embedder = embedder
+        self.backend = backend
+        self.threshold = threshold
+        self.table_name = table_name
+
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim) float32, rows L2-normalized
+        self._group_ids = np.empty(0, dtype=np.int32)  # URL-set group of each row
+        self._groups: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._initial_capacity = initial_capacity
+
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._latencies_ms = deque(maxlen=1000)
+
+        self.sql_save = f"INSERT OR REPLACE INTO {table_name} (cache_key, url_key, embedding) VALUES (?, ?, ?)"
+        self.sql_delete = f"DELETE FROM {table_name} WHERE cache_key = ?"
+
+        conn = backend.connection()
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                cache_key TEXT PRIMARY KEY,
+                url_key TEXT,
+                embedding BLOB
+            )
+        ''')
+        conn.commit()
+        self._load()
+
+    def _load(self):
+        """Rebuild the in-memory matrix from the persisted embeddings."""
+        rows = self.backend.connection().execute(
+            f"SELECT cache_key, url_key, embedding FROM {self.table_name}"
+        ).fetchall()
+        for cache_key, url_key, blob in rows:
+            self._append(cache_key, url_key, np.frombuffer(blob, dtype=np.float32))
+        if rows:
+            logger.info(f"Loaded {len(rows)} semantic cache embeddings")
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedder.get_embedding(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _append(self, cache_key: str, url_key: str, vector: np.ndarray):
+        """Add a row, doubling the backing arrays when full. Caller holds the lock or is __init__."""
+        if self._matrix is None:
+            self._matrix = np.zeros((self._initial_capacity, vector.shape[0]), dtype=np.float32)
+            self._group_ids = np.zeros(self._initial_capacity, dtype=np.int32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            logger.warning(f"Skipping semantic cache entry with dimension {vector.shape[0]}")
+            return
+        if self._size == self._matrix.shape[0]:
+            self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+            self._group_ids = np.concatenate([self._group_ids, np.zeros_like(self._group_ids)])
+
+        group = self._groups.setdefault(url_key, len(self._groups))
+        self._matrix[self._size] = vector
+        self._group_ids[self._size] = group
+        self._keys.append(cache_key)
+        self._rows[cache_key] = self._size
+        self._size += 1
+
+    def lookup(self, prompt: str) -> Optional[str]:
+        """
+        Return the cache key of the most similar cached prompt with the same URLs, if above threshold.
+
+        The semantic tier is only an optimization: if embedding the prompt fails (API error,
+        quota), the error is logged and the lookup counts as a miss.
+        """
+        start = time.perf_counter()
+        canonical = canonicalize_prompt(prompt)
+        cache_key = None
+        group = self._groups.get(url_set_key(canonical))
+        query = None
+        if group is not None:
+            try:
+                query = self._embed(canonical["text"])
+            except Exception as e:
+                logger.error(f"Semantic cache lookup failed to embed prompt: {str(e)}")
+                with self._lock:
+                    self._stats["errors"] += 1
+        if query is not None:
+            with self._lock:
+                candidates = np.flatnonzero(self._group_ids[: self._size] == group)
+                if candidates.size:
+                    scores = self._matrix[candidates] @ query
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.threshold:
+                        cache_key = self._keys[candidates[best]]
+                        logger.debug(f"Semantic cache match with similarity {scores[best]:.3f}")
+
+        with self._lock:
+            self._stats["hits" if cache_key else "misses"] += 1
+            self._latencies_ms.append((time.perf_counter() - start) * 1000)
+        return cache_key
+
+    def add(self, prompt: str, cache_key: str):
+        """Index a cached prompt under its exact-cache key."""
+        canonical = canonicalize_prompt(prompt)
+        url_key = url_set_key(canonical)
+        vector = self._embed(canonical["text"])
+        with self._lock:
+            if cache_key in self._rows:
+                return
+            self._append(cache_key, url_key, vector)
+        conn = self.backend.connection()
+        conn.execute(self.sql_save, (cache_key, url_key, vector.astype(np.float32).tobytes()))
+        conn.commit()
+
+    def discard(self, cache_key: str):
+        """Stop matching a key whose response is gone from the exact cache."""
+        self.discard_many([cache_key])
+
+    def discard_many(self, cache_keys: Iterable[str]):
+        """Stop matching keys whose responses were evicted, with one delete for all of them."""
+        cache_keys = list(cache_keys)
+        with self._lock:
+            for cache_key in cache_keys:
+                row = self._rows.pop(cache_key, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                # Swap the last row into the hole to keep the matrix contiguous
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._group_ids[row] = self._group_ids[last]
+                    self._keys[row] = self._keys[last]
+                    self._rows[self._keys[row]] = row
+                self._keys.pop()
+                self._size = last
+        # Rows are deleted even when this process never loaded them (another worker added them)
+        conn = self.backend.connection()
+        conn.executemany(self.sql_delete, [(cache_key,) for cache_key in cache_keys])
+        conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit rate and lookup latency (embedding + search) since startup."""
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = sorted(self._latencies_ms)
+            stats["entries"] = self._size
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["lookup_ms_p50"] = latencies[len(latencies) // 2] if latencies else 0.0
+        stats["lookup_ms_p95"] = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return stats
@@ -0,0 +1,182 @@
+import os
+import time
+import uuid
+import socket
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+from agno.utils.log import logger
+from utils.cache_backend import SQLiteCacheBackend
+
+# Single-flight coalescing for identical workflow runs.
+# Concurrent calls with the same cache key share one execution: inside a process the first
+# caller runs and the others wait for its result; across worker processes on the same host
+# a lease row in the cache database elects one runner, and the others poll the cache until
+# the runner's result lands there (or the lease expires and one of them takes over).
+# The runner renews its lease on a heartbeat thread, so the lease can stay short: a crashed
+# runner is taken over within lease_seconds, while a slow one keeps it. Waiting is bounded
+# by wait_seconds; a caller that waits that long (the runner is stuck) runs fn itself.
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent runs per key across threads and, via SQLite leases, processes."""
+
+    def __init__(self, backend: SQLiteCacheBackend, table_name: str = "workflow_inflight",
+                 lease_seconds: float = 60.0, poll_interval: float = 0.5, wait_seconds: float = 900.0):
+        self.backend = backend
+        self.table_name = table_name
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.wait_seconds = wait_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"leader_runs": 0, "coalesced_local": 0, "coalesced_remote": 0, "lease_takeovers": 0,
+                       "wait_timeouts": 0}
+
+        self.sql_acquire = (
+            f"INSERT INTO {table_name} (cache_key, owner, expires_at) VALUES (?, ?, ?) "
+            f"ON CONFLICT(cache_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            f"WHERE {table_name}.expires_at < ?"
+        )
+        self.sql_renew = f"UPDATE {table_name} SET expires_at = ? WHERE cache_key = ? AND owner = ?"
+        self.sql_owner = f"SELECT owner FROM {table_name} WHERE cache_key = ?"
+        self.sql_release = f"DELETE FROM {table_name} WHERE cache_key = ? AND owner = ?"
+
+        conn = backend.connection()
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                cache_key TEXT PRIMARY KEY,
+                owner TEXT,
+                expires_at REAL
+            )
+        ''')
+        conn.commit()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _try_acquire(self, key: str) -> bool:
+        """Take the lease row for the key if it is free or expired."""
+        now = time.time()
+        conn = self.backend.connection()
+        conn.execute(self.sql_acquire, (key, self.owner, now + self.lease_seconds, now))
+        conn.commit()
+        row = conn.execute(self.sql_owner, (key,)).fetchone()
+        return bool(row) and row[0] == self.owner
+
+    def _release(self, key: str):
+        conn = self.backend.connection()
+        conn.execute(self.sql_release, (key, self.owner))
+        conn.commit()
+
+    def _heartbeat(self, key: str, stop: threading.Event):
+        """Extend the lease every third of its length until stopped."""
+        while not stop.wait(self.lease_seconds / 3):
+            try:
+                conn = self.backend.connection()
+                conn.execute(self.sql_renew, (time.time() + self.lease_seconds, key, self.owner))
+                conn.commit()
+            except Exception as e:
+                logger.warning(f"Failed to renew the lease of {key[:12]}: {str(e)}")
+
+    def _run_with_heartbeat(self, key: str, fn: Callable[[], T]) -> T:
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(key, stop), name="lease-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            return fn()
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def _run_after_wait(self, key: str, fn: Callable[[], T], check_cache: Callable[[], Optional[T]]) -> T:
+        """Give up on a run that has not finished within wait_seconds and run fn here."""
+        cached = check_cache()
+        if cached is not None:
+            return cached
+        logger.warning(f"In-flight run of {key[:12]} not finished after {self.wait_seconds:.0f}s; running it here")
+        self._count("wait_timeouts")
+        return fn()
+
+    def do(self, key: str, fn: Callable[[], T], check_cache: Callable[[], Optional[T]]) -> T:
+        """
+        Run fn once per key across concurrent callers.
+
+        Args:
+            key: Coalescing key (the workflow cache key).
+            fn: Does the work and stores its result in the cache.
+            check_cache: Returns the cached result for the key, or None.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["coalesced_local"] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            logger.info(f"Waiting for in-flight run of {key[:12]}")
+            if not call.done.wait(self.wait_seconds):
+                return self._run_after_wait(key, fn, check_cache)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_with_lease(key, fn, check_cache)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run_with_lease(self, key: str, fn: Callable[[], T], check_cache: Callable[[], Optional[T]]) -> T:
+        """Run fn under the cross-process lease, or wait for another process's result."""
+        waited = False
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            if self._try_acquire(key):
+                try:
+                    # Another process may have finished between our cache miss and the lease
+                    cached = check_cache()
+                    if cached is not None:
+                        if waited:
+                            self._count("coalesced_remote")
+                        return cached
+                    if waited:
+                        self._count("lease_takeovers")
+                    self._count("leader_runs")
+                    return self._run_with_heartbeat(key, fn)
+                finally:
+                    self._release(key)
+
+            if not waited:
+                logger.info(f"Run of {key[:12]} is in flight in another process; waiting for its result")
+                waited = True
+            time.sleep(self.poll_interval)
+            cached = check_cache()
+            if cached is not None:
+                self._count("coalesced_remote")
+                return cached
+            if time.monotonic() >= deadline:
+                return self._run_after_wait(key, fn, check_cache)
@@ -0,0 +1,140 @@
+import time
+import base64
+import threading
+from typing import Any, Dict, List, Optional
+import httpx
+from agno.utils.log import logger
+
+# Text-to-speech backends for podcast segments.
+# The segment text is already known, so routing it through a Gemini agent that decides
+# to call ElevenLabsTools.text_to_speech costs two model round trips per segment before
+# any audio is synthesized. DirectTTSBackend posts (voice_id, model_id, text) straight to
+# the ElevenLabs text-to-speech endpoint over one pooled HTTP client and raises on HTTP
+# errors, so callers can retry them. AgentTTSBackend keeps the agent path as an option,
+# with one agent per voice and thread (Agent.run keeps per-run state on the agent).
+# Both record how long each segment took.
+
+TTS_BACKENDS = ("direct", "agent")
+DEFAULT_MODEL_ID = "eleven_multilingual_v2"
+DEFAULT_OUTPUT_FORMAT = "mp3_44100_64"
+ELEVEN_LABS_BASE_URL = "https://api.elevenlabs.io"
+
+
+class _LatencyRecorder:
+    def __init__(self):
+        self._latency_lock = threading.Lock()
+        self._latencies: List[float] = []
+
+    def _record(self, seconds: float, voice_id: str, text: str):
+        with self._latency_lock:
+            self._latencies.append(seconds)
+        logger.info(f"Synthesized {len(text)} chars with voice {voice_id} in {seconds * 1000:.0f} ms")
+
+    def latencies(self) -> List[float]:
+        """Seconds taken by each successful synthesize call, in completion order."""
+        with self._latency_lock:
+            return list(self._latencies)
+
+
+class DirectTTSBackend(_LatencyRecorder):
+    """Synthesizes speech with direct ElevenLabs API calls; no LLM in the loop."""
+
+    def __init__(
+        self,
+        api_key: str,
+        model_id: str = DEFAULT_MODEL_ID,
+        output_format: str = DEFAULT_OUTPUT_FORMAT,
+        base_url: str = ELEVEN_LABS_BASE_URL,
+        timeout: float = 60.0,
+        max_connections: int = 8,
+    ):
+        super().__init__()
+        self.model_id = model_id
+        self.output_format = output_format
+        self.client = httpx.Client(
+            base_url=base_url,
+            headers={"xi-api-key": api_key, "Accept": "audio/mpeg"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        """MP3 bytes of the text spoken with the voice; raises httpx errors on failure."""
+        start = time.perf_counter()
+        response = self.client.post(
+            f"/v1/text-to-speech/{voice_id}",
+            params={"output_format": self.output_format},
+            json={"text": text, "model_id": self.model_id},
+        )
+        response.raise_for_status()
+        self._record(time.perf_counter() - start, voice_id, text)
+        return response.content
+
+    def close(self):
+        self.client.close()
+
+
+class AgentTTSBackend(_LatencyRecorder):
+    """Synthesizes speech through a Gemini agent calling ElevenLabsTools (the previous path)."""
+
+    def __init__(self, api_key: str, model_id: str = DEFAULT_MODEL_ID, target_directory: str = "temp_audio"):
+        super().__init__()
+        self.api_key = api_key
+        self.model_id = model_id
+        self.target_directory = target_directory
+        self._thread_agents = threading.local()
+
+    def _create_agent(self, voice_id: str) -> Any:
+        from agno.agent import Agent
+        from agno.models.google import Gemini
+        from agno.tools.eleven_labs import ElevenLabsTools
+
+        return Agent(
+            name=f"Audio Generator {voice_id}",
+            model=Gemini(),
+            tools=[
+                ElevenLabsTools(
+                    api_key=self.api_key,
+                    voice_id=voice_id,
+                    model_id=self.model_id,
+                    target_directory=self.target_directory,
+                )
+            ],
+            instructions=[
+                "Convert the provided text to speech using the text_to_speech function.",
+                "Use the configured voice for this agent.",
+                "Generate clear, natural-sounding audio."
+            ],
+        )
+
+    def _agent(self, voice_id: str) -> Any:
+        agents: Optional[Dict[str, Any]] = getattr(self._thread_agents, "agents", None)
+        if agents is None:
+            agents = self._thread_agents.agents = {}
+        if voice_id not in agents:
+            agents[voice_id] = self._create_agent(voice_id)
+        return agents[voice_id]
+
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        """MP3 bytes of the text spoken with the voice; empty when the agent returned no audio."""
+        start = time.perf_counter()
+        response = self._agent(voice_id).run(f"Convert this text to speech: {text}")
+        if not response.audio:
+            logger.warning(f"Agent returned no audio for voice {voice_id}")
+            return b""
+        audio = base64.b64decode(response.audio[0].base64_audio)
+        self._record(time.perf_counter() - start, voice_id, text)
+        return audio
+
+    def close(self):
+        pass
+
+
+def create_tts_backend(backend: str, api_key: str, model_id: str = DEFAULT_MODEL_ID) -> Any:
+    """TTS backend for podcast segments: 'direct' (DirectTTSBackend) or 'agent' (AgentTTSBackend)."""
+    if backend == "direct":
+        return DirectTTSBackend(api_key, model_id=model_id)
+    if backend == "agent":
+        return AgentTTSBackend(api_key, model_id=model_id)
+    logger.error(f"Invalid TTS backend: {backend}")
+    raise ValueError(f"Invalid TTS backend: {backend}. Expected one of {TTS_BACKENDS}")
@@ -0,0 +1,216 @@
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+from agno.utils.log import logger
+from utils.tts_backend import DEFAULT_OUTPUT_FORMAT
+
+# Persistent, content-addressed cache of synthesized speech segments, shared by every app
+# that makes podcast audio (AudioUtilsWorkflow, l5-1.py, l5-2.py).
+# A segment is keyed by sha256(voice id, model id, output format, normalized text), so a
+# line like "Great point." is synthesized once per voice and then read from disk. Audio
+# files live under <dir>/<first two hex chars>/<key>.mp3 and a SQLite index records each
+# file's size and last access. Once the files exceed max_bytes, the least recently used
+# go first. Files are written to a temporary name and renamed before their index row
+# commits, so a reader never finds a row without its file.
+
+DEFAULT_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "agno-tts-cache"))
+DEFAULT_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+TTS_CACHE_KEY_VERSION = 1
+EVICTION_BATCH_SIZE = 100
+
+
+def normalize_text(text: str) -> str:
+    """Segment text as it is keyed: NFC, whitespace collapsed. Case and punctuation change the speech, so they stay."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def segment_key(voice_id: str, model_id: str, text: str, output_format: str = DEFAULT_OUTPUT_FORMAT) -> str:
+    parts = (str(TTS_CACHE_KEY_VERSION), voice_id, model_id, output_format, normalize_text(text))
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class TTSSegmentCache:
+    """Disk-backed segment audio store with LRU eviction by total size."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.db")
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_served": 0}
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                size_bytes INTEGER,
+                last_access REAL
+            ) WITHOUT ROWID
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS segments_lru ON segments (last_access, size_bytes, key)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".mp3")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for the key, or None."""
+        conn = self._connection()
+        if conn.execute("SELECT 1 FROM segments WHERE key = ?", (key,)).fetchone() is None:
+            self._count("misses")
+            return None
+        try:
+            with open(self.path_for(key), "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            # Removed behind the index's back (or by another process mid-eviction)
+            conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+            self._count("misses")
+            return None
+        conn.execute("UPDATE segments SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._count("hits")
+        self._count("bytes_served", len(audio))
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """Store a segment's audio, then evict least recently used segments while over max_bytes."""
+        if not audio:
+            return
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        self._connection().execute(
+            "INSERT INTO segments (key, size_bytes, last_access) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET size_bytes = excluded.size_bytes, last_access = excluded.last_access",
+            (key, len(audio), time.time()),
+        )
+        self._count("stored")
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes)
+
+    def evict(self, max_bytes: int) -> int:
+        """Remove least recently used segments until the total size is at most max_bytes; returns how many."""
+        conn = self._connection()
+        evicted = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM segments").fetchone()[0]
+            while total > max_bytes:
+                oldest = conn.execute(
+                    "SELECT key, size_bytes FROM segments ORDER BY last_access LIMIT ?", (EVICTION_BATCH_SIZE,)
+                ).fetchall()
+                if not oldest:
+                    break
+                for key, size in oldest:
+                    if total <= max_bytes:
+                        break
+                    conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+                    try:
+                        os.remove(self.path_for(key))
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    evicted += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if evicted:
+            self._count("evicted", evicted)
+            logger.debug(f"TTS cache evicted {evicted} segments; {total} bytes remain")
+        return evicted
+
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses and hit rate since startup plus segments and bytes on disk."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"], stats["bytes"] = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM segments"
+        ).fetchone()
+        return stats
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class CachedTTSBackend:
+    """Wraps a TTS backend so previously synthesized segments are served from a TTSSegmentCache."""
+
+    def __init__(self, backend: Any, cache: Optional[TTSSegmentCache] = None):
+        self.backend = backend
+        self.cache = cache or TTSSegmentCache()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def __getattr__(self, name: str):
+        # Everything else (model_id, latencies, close, ...) comes from the wrapped backend
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def key(self, text: str, voice_id: str) -> str:
+        return segment_key(voice_id, self.backend.model_id, text,
+                           getattr(self.backend, "output_format", DEFAULT_OUTPUT_FORMAT))
+
+    def synthesize(self, text: str, voice_id: str) -> bytes:
+        """Cached audio for the segment, synthesizing it on a miss. Identical concurrent segments share one call."""
+        key = self.key(text, voice_id)
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self.backend.synthesize(text, voice_id)
+            if call.result:
+                self.cache.put(key, call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, float]:
+        return self.cache.stats()
@@ -0,0 +1,139 @@
+import time
+import random
+import threading
+from functools import partial
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from agno.utils.log import logger
+from utils.rate_limit import TokenBucket
+
+# Concurrent, rate-limited synthesis of podcast segments.
+# Segments used to be synthesized one at a time with a fixed 5 s sleep after each, so a
+# 10-line conversation spent most of its time idle. TTSScheduler runs up to
+# `max_concurrency` segments at once (TTS providers cap concurrent requests per plan),
+# paces request starts with an optional TokenBucket instead of sleeps, and retries each
+# failed segment on its own with jittered exponential backoff. Results come back in
+# segment order, whatever order they finish in, so they can be spliced straight in.
+# synthesize_all takes any iterable, so segments parsed from a streamed script start
+# synthesizing as they arrive.
+
+DEFAULT_MAX_CONCURRENCY = 3
+
+
+class EmptyAudioError(RuntimeError):
+    """The TTS call returned no audio."""
+
+
+class TTSScheduler:
+    """Synthesizes segments concurrently with a concurrency cap, a rate limiter and per-segment retries."""
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, str], bytes],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = 2,
+        retry_delay: float = 2.0,
+    ):
+        """
+        Args:
+            synthesize: (text, speaker) -> audio bytes for one segment; may raise.
+            max_concurrency: Segments synthesized at once.
+            rate_limiter: Bucket each attempt takes a token from before calling synthesize.
+            max_retries: Attempts after the first one, per segment.
+            retry_delay: Backoff before the first retry; doubles on every retry.
+        """
+        if max_concurrency < 1 or max_retries < 0:
+            raise ValueError(f"Invalid max_concurrency={max_concurrency} / max_retries={max_retries}")
+        self.synthesize = synthesize
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="tts")
+        self._lock = threading.Lock()
+        self._stats = {"segments": 0, "attempts": 0, "retries": 0, "failed": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _synthesize_with_retry(self, index: int, text: str, speaker: str) -> bytes:
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            self._count("attempts")
+            try:
+                audio = self.synthesize(text, speaker)
+                if not audio:
+                    raise EmptyAudioError(f"Empty audio for segment {index + 1} ({speaker})")
+                self._count("segments")
+                return audio
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    logger.error(f"Segment {index + 1} ({speaker}) failed after {attempt + 1} attempts: {str(e)}")
+                    raise RuntimeError(f"Failed to generate audio for segment {index + 1} ({speaker}) "
+                                       f"after {attempt + 1} attempts: {str(e)}") from e
+                # Jittered, so segments rejected together do not all retry together
+                backoff = self.retry_delay * 2 ** attempt * random.uniform(0.5, 1.0)
+                self._count("retries")
+                logger.warning(f"Segment {index + 1} ({speaker}) attempt {attempt + 1} failed ({str(e)}); "
+                               f"retrying in {backoff:.1f}s")
+                time.sleep(backoff)
+
+    def submit(self, index: int, text: str, speaker: str) -> Future:
+        """Start synthesizing one segment; the future resolves to its audio bytes."""
+        return self._executor.submit(self._synthesize_with_retry, index, text, speaker)
+
+    def synthesize_all(
+        self,
+        segments: Iterable[Dict[str, str]],
+        on_segment: Optional[Callable[[int, bytes], None]] = None,
+    ) -> List[bytes]:
+        """
+        Synthesize parsed segments ('text' and 'speaker' keys) and return their audio in segment order.
+
+        Each segment is submitted as soon as the iterable yields it. on_segment(index, audio) is
+        called, from a worker thread, as each segment finishes. Raises the first failure, after
+        its retries, and cancels the segments not yet started.
+        """
+        futures: List[Future] = []
+        failed = threading.Event()
+
+        def finished(index: int, future: Future):
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                failed.set()
+            elif on_segment is not None:
+                on_segment(index, future.result())
+
+        try:
+            for index, segment in enumerate(segments):
+                if failed.is_set():
+                    # No point waiting for the rest of the script
+                    break
+                future = self.submit(index, segment["text"], segment["speaker"])
+                future.add_done_callback(partial(finished, index))
+                futures.append(future)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Cancel queued segments and wait for the ones in flight."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
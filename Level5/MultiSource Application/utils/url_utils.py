@@ -0,0 +1,157 @@
+import re
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
+from agno.utils.log import logger
+
+# URL helpers shared by the workflow: the extraction regex and classification rules
+# from l5-1.py, plus canonicalization so equivalent URLs compare equal.
+
+# Same pattern the URL Handler agent is instructed to use
+URL_PATTERN = re.compile(r'(?:https?://|www\.)[^\s<>"\']+|[^\s<>"\']+\.(?:com|org|net|edu|gov|io)[^\s<>"\']*')
+
+# Punctuation that ends a sentence rather than a URL
+TRAILING_PUNCTUATION = ".,;:!?)]}"
+
+# Query parameters that only track where a link was shared from
+TRACKING_PARAMS = {"si", "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "feature", "ref_src"}
+TRACKING_PREFIXES = ("utm_",)
+
+# URL_PATTERN plus youtu.be short links, which the agent also accepts but the pattern misses
+LOCAL_URL_PATTERN = re.compile(URL_PATTERN.pattern + r'|youtu\.be/[^\s<>"\']+')
+
+# Domain-like tokens URL_PATTERN does not catch (other TLDs such as bbc.co.uk or arxiv.ai);
+# finding one means the local extractor may have missed a URL
+LOOSE_DOMAIN_PATTERN = re.compile(r'(?<![\w@/.-])[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}(?:[/?#][^\s<>"\']*)?', re.IGNORECASE)
+
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+
+
+def classify_url(url: str) -> str:
+    """
+    Classify a URL as 'pdf', 'youtube', or 'webpage'.
+
+    Args:
+        url (str): The URL to classify.
+
+    Returns:
+        str: The type of URL ('pdf', 'youtube', or 'webpage').
+    """
+    try:
+        parsed_url = urlparse(url.lower())
+        if not parsed_url.scheme or not parsed_url.netloc:
+            logger.warning(f"Invalid URL format: {url}, treating as webpage")
+            return 'webpage'
+        if parsed_url.path.endswith('.pdf'):
+            return 'pdf'
+        if 'youtube.com' in parsed_url.netloc or 'youtu.be' in parsed_url.netloc:
+            if '/watch' in parsed_url.path and 'v' in parse_qs(parsed_url.query):
+                return 'youtube'
+            if 'youtu.be' in parsed_url.netloc and parsed_url.path.strip('/'):
+                return 'youtube'
+        return 'webpage'
+    except Exception as e:
+        logger.warning(f"Error classifying URL {url}: {e}, treating as webpage")
+        return 'webpage'
+
+
+def find_urls(text: str) -> List[str]:
+    """Return the URLs in the text in order of appearance, without trailing punctuation."""
+    return [match.rstrip(TRAILING_PUNCTUATION) for match in URL_PATTERN.findall(text)]
+
+
+def strip_urls(text: str) -> str:
+    """Remove URLs from the text and collapse the whitespace left behind."""
+    return " ".join(URL_PATTERN.sub(" ", text).split())
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalize a URL so equivalent links produce the same string.
+
+    Adds a missing scheme, lowercases scheme and host, drops default ports, fragments and
+    tracking parameters, sorts the remaining query, and rewrites YouTube links to
+    https://www.youtube.com/watch?v=<id>.
+    """
+    url = url.strip().rstrip(TRAILING_PUNCTUATION)
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return url
+
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port if parsed.port not in (None, 80, 443) else None
+    netloc = f"{host}:{port}" if port else host
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not _is_tracking_param(k)]
+
+    # YouTube has several spellings for the same video; keep only the video id
+    video_id = None
+    if host == "youtu.be" and path.strip("/"):
+        video_id = path.strip("/").split("/")[0]
+    elif host in YOUTUBE_HOSTS and path == "/watch":
+        video_id = dict(query).get("v")
+    if video_id:
+        return f"https://www.youtube.com/watch?v={video_id}"
+
+    return urlunparse((scheme, netloc, path, "", urlencode(sorted(query)), ""))
+
+
+def _prepare_url(url: str) -> str:
+    """Normalize an extracted URL the way the URL Handler agent is instructed to."""
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    if host and "." not in host.removeprefix("www.") and host != "youtu.be":
+        url = urlunparse(parsed._replace(netloc=parsed.netloc.replace(host, host + ".com", 1)))
+    return url
+
+
+def extract_urls_locally(prompt: str) -> Tuple[Dict[str, object], List[str]]:
+    """
+    Extract and classify the URLs in a prompt without calling the URL Handler agent.
+
+    Returns the same structure the URL Handler produces, plus a list of reasons the
+    result may be wrong. An empty list means the result can be used as is; otherwise
+    the caller should fall back to the agents.
+    """
+    result: Dict[str, object] = {"pdf_urls": [], "youtube_urls": [], "web_urls": [], "remaining_text": "", "errors": []}
+    issues: List[str] = []
+    buckets = {"pdf": result["pdf_urls"], "youtube": result["youtube_urls"], "webpage": result["web_urls"]}
+
+    seen = set()
+    for raw in (match.rstrip(TRAILING_PUNCTUATION) for match in LOCAL_URL_PATTERN.findall(prompt)):
+        if "@" in raw.split("/", 3)[2 if "://" in raw else 0]:
+            issues.append(f"Ambiguous URL or email address: {raw}")
+            continue
+        if raw.count("(") != raw.count(")") or raw.count("[") != raw.count("]"):
+            issues.append(f"Unbalanced brackets in URL: {raw}")
+            continue
+        try:
+            url = _prepare_url(raw)
+        except ValueError as e:
+            issues.append(f"Unparseable URL {raw}: {e}")
+            continue
+        if url in seen:
+            continue
+        seen.add(url)
+        buckets[classify_url(url)].append(url)
+
+    remaining_text = " ".join(LOCAL_URL_PATTERN.sub(" ", prompt).split())
+    for token in LOOSE_DOMAIN_PATTERN.findall(remaining_text):
+        issues.append(f"Possible URL not matched by the extractor: {token.rstrip(TRAILING_PUNCTUATION)}")
+
+    result["remaining_text"] = remaining_text
+    if not seen and not issues:
+        result["errors"] = ["No valid URLs found"]
+    return result, issues
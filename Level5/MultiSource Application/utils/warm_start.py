@@ -0,0 +1,113 @@
+import time
+import threading
+from typing import Dict, List, Optional
+from agno.utils.log import logger
+from utils.embedding_pipeline import collection_for
+from utils.pdf_ingest import IncrementalPDFIngestor
+
+# Warm start for a PDF knowledge base on a persistent vector db.
+# Loading at import time makes every process start (and every reload) download and check
+# the PDFs before the app can serve. BackgroundKnowledgeLoader instead starts a thread that
+# validates the ingestion manifest against the stored collection and only ingests URLs that
+# are missing or incomplete, so a restart with an intact store needs no network at all.
+# Requests that arrive during loading are held in wait() (with a short bound) and served once it
+# completes, instead of each one triggering or blocking on a load of its own. A PDF that
+# fails to ingest fails the load, so callers can tell users instead of answering without it.
+# A failed load is retried a few times with backoff, and after that retry() starts it again
+# (e.g. on the next question), so a transient failure at startup does not last until restart.
+
+RETRIES = 2
+RETRY_BACKOFF_SECONDS = 5.0
+
+
+class BackgroundKnowledgeLoader:
+    """Brings a PDF knowledge base up to date on a background thread and signals readiness."""
+
+    def __init__(self, knowledge_base, urls: Optional[List[str]] = None,
+                 ingestor: Optional[IncrementalPDFIngestor] = None, retries: int = RETRIES,
+                 retry_backoff_seconds: float = RETRY_BACKOFF_SECONDS):
+        self.knowledge_base = knowledge_base
+        self.urls = list(urls if urls is not None else knowledge_base.urls)
+        self.ingestor = ingestor or IncrementalPDFIngestor(knowledge_base)
+        self.retries = retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.results: Dict[str, str] = {}
+        self.error: Optional[BaseException] = None
+        self.seconds: Optional[float] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BackgroundKnowledgeLoader":
+        with self._lock:
+            if self._thread is None:
+                self._start_thread()
+        return self
+
+    def _start_thread(self):
+        self._thread = threading.Thread(target=self._run, name="knowledge-loader", daemon=True)
+        self._thread.start()
+
+    def retry(self) -> bool:
+        """Start loading again if the last load failed; returns True if it was restarted."""
+        with self._lock:
+            if self.status != "failed":
+                return False
+            logger.info(f"Retrying knowledge base loading after: {str(self.error)}")
+            # Not done before the error is cleared, so nobody sees "ready" in between
+            self._done.clear()
+            self.error = None
+            self._start_thread()
+            return True
+
+    def _run(self):
+        for attempt in range(self.retries + 1):
+            try:
+                self._load()
+                break
+            except Exception as e:
+                if attempt < self.retries:
+                    delay = self.retry_backoff_seconds * 2 ** attempt
+                    logger.warning(f"Knowledge base loading failed ({str(e)}); retrying in {delay:.0f}s")
+                    time.sleep(delay)
+                    continue
+                self.error = e
+                logger.error(f"Knowledge base loading failed: {str(e)}")
+        self._done.set()
+
+    def _load(self):
+        start = time.perf_counter()
+        self.results = {}
+        stale = self.ingestor.validate(self.urls)
+        if stale:
+            self.results = self.ingestor.ingest(stale)
+            failed = [url for url, status in self.results.items() if status == "failed"]
+            if failed:
+                # ingest() logs and reports failures per URL; without these PDFs the knowledge base is incomplete
+                raise RuntimeError(f"Failed to ingest {len(failed)} of {len(self.urls)} PDFs: {', '.join(failed)}")
+        # Opens the collection (and builds any index kept next to it) before the first question
+        collection_for(self.knowledge_base.vector_db)
+        self.results.update({url: "valid" for url in self.urls if url not in stale})
+        self.seconds = time.perf_counter() - start
+        logger.info(f"Knowledge base ready in {self.seconds:.2f}s: {len(self.urls) - len(stale)} valid, "
+                    f"{len(stale)} ingested")
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self.error is None
+
+    @property
+    def status(self) -> str:
+        if not self._done.is_set():
+            return "loading"
+        return "failed" if self.error is not None else "ready"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until loading has finished, for at most `timeout` seconds.
+
+        Returns:
+            bool: True if the knowledge base is ready, False on timeout or failed loading.
+        """
+        self._done.wait(timeout)
+        return self.ready
@@ -1,26 +1,112 @@
 import os
 import json
-import sqlite3
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
 from agno.workflow.workflow import Workflow
 from agno.utils.log import logger
 from agno.knowledge.pdf_url import PDFUrlKnowledgeBase, PDFUrlReader
-from agno.vectordb.chroma import ChromaDb
 from agno.embedder.google import GeminiEmbedder
 from teams.multi_source_team import create_multi_source_team
+from utils.cache_backend import SQLiteCacheBackend, SourceResultCache
+from utils.cache_eviction import CacheEvictor
+from utils.cache_payload import MissingArtifactError, artifact_refs, decode_payload, encode_payload
+from utils.artifact_store import ArtifactStore
+from utils.cache_keys import canonical_cache_key
+from utils.semantic_cache import SemanticCache
+from utils.single_flight import SingleFlight
+from utils.json_repair import repair_json
+from utils.parallel import run_with_timeouts
+from utils.pdf_extract import DEFAULT_MAX_WORKERS, ParallelPDFExtractor
+from utils.pdf_fetch import PooledPDFFetcher
+from utils.pdf_ingest import IncrementalPDFIngestor
+from utils.embedding_pipeline import EmbeddingPipeline
+from utils.embedding_cache import CachedEmbedder, EmbeddingCache
+from utils.numpy_vectordb import create_vector_db
+from utils.rate_limit import TokenBucket
+from utils.url_utils import extract_urls_locally, normalize_url
 from agno.agent import RunResponse
 
 # This module defines a multi-source workflow that processes various content types,
 # including PDFs, YouTube videos, web pages, and text. It initializes knowledge bases,  
 # creates a team of agents, and manages a SQLite cache for responses.
 
+# Task type for the per-source cache tier: every source is summarized on its own
+SOURCE_TASK = "summary"
+SOURCE_URL_FIELDS = {"pdf": "pdf_urls", "youtube": "youtube_urls", "web": "web_urls"}
+SOURCE_LABELS = {"pdf": "PDF", "youtube": "YouTube video", "web": "webpage"}
+# Team member index of each source's processor agent (see teams/multi_source_team.py)
+SOURCE_AGENT_INDEX = {"pdf": 3, "youtube": 4, "web": 5}
+DISPATCH_MODES = ("concurrent", "route")
+# Agent replies that signal a failed source; these are never cached
+SOURCE_FAILURE_PREFIXES = ("Failed to", "No transcript available")
+
+# Words that carry no request beyond "process these sources" (same idea as l5-1.py)
+TRIVIAL_WORDS = {"summarize", "summary", "summarise", "give", "provide", "create", "generate", "me", "a", "an",
+                 "the", "this", "these", "please", "and", "of", "for", "to", "with", "on", "pdf", "video", "page"}
+
+
+# Requests that need the team leader (it hands them to the podcast and mindmap agents)
+TEAM_REQUEST_WORDS = {"podcast", "mindmap", "mind-map"}
+
+
+def _request_words(text: str) -> list:
+    return [word.strip(".,:;!?").lower() for word in (text or "").split()]
+
+
+def is_trivial_request(text: str) -> bool:
+    """True when the text only asks for the sources to be summarized."""
+    return all(word in TRIVIAL_WORDS for word in _request_words(text) if word)
+
+
+def is_team_request(text: str) -> bool:
+    """True when the text asks for a podcast or mindmap rather than an answer."""
+    return any(word in TEAM_REQUEST_WORDS for word in _request_words(text))
+
 
 class MultiSourceWorkflow(Workflow):
+    # Semantic cache tier (paraphrase matching); off unless SEMANTIC_CACHE=true
+    semantic_cache_enabled: bool = os.getenv("SEMANTIC_CACHE", "false").lower() == "true"
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    # Background eviction: "lru" or "ttl" policy, TTL in days, optional row/byte budgets
+    cache_eviction_policy: str = os.getenv("CACHE_EVICTION_POLICY", "lru")
+    cache_ttl_days: float = float(os.getenv("CACHE_TTL_DAYS", "7"))
+    cache_max_rows: Optional[int] = int(os.getenv("CACHE_MAX_ROWS")) if os.getenv("CACHE_MAX_ROWS") else None
+    cache_max_bytes: Optional[int] = int(os.getenv("CACHE_MAX_BYTES")) if os.getenv("CACHE_MAX_BYTES") else None
+    cache_eviction_interval: float = float(os.getenv("CACHE_EVICTION_INTERVAL", "300"))
+    # "compact" (zlib, artifact references) or "json" (full RunResponse.to_dict())
+    cache_payload_format: str = os.getenv("CACHE_PAYLOAD_FORMAT", "compact")
+    # "concurrent" calls the source processor agents directly in parallel; "route" sends
+    # each source through the team leader one at a time (the previous behaviour)
+    dispatch_mode: str = os.getenv("DISPATCH_MODE", "concurrent")
+    dispatch_max_workers: int = int(os.getenv("DISPATCH_MAX_WORKERS", "4"))
+    source_timeout_seconds: float = float(os.getenv("SOURCE_TIMEOUT_SECONDS", "120"))
+    # Overall limit for a prompt's sources, queueing for a worker included
+    source_total_timeout_seconds: float = float(os.getenv("SOURCE_TOTAL_TIMEOUT_SECONDS", "300"))
+    # Vector store behind the PDF knowledge base: "chroma" or "numpy" (in-process, persisted in tmp/)
+    vector_db_backend: str = os.getenv("VECTOR_DB_BACKEND", "chroma")
+    # Persistent embedding cache shared with the other apps; EMBEDDING_CACHE_DTYPE=float16 halves its size
+    embedding_cache_enabled: bool = os.getenv("EMBEDDING_CACHE", "true").lower() == "true"
+    embedding_cache_dtype: str = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+    # PDF chunk embedding: chunks per request, concurrent requests, optional requests/minute cap
+    embed_batch_size: int = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+    embed_concurrency: int = int(os.getenv("EMBED_CONCURRENCY", "4"))
+    embed_requests_per_minute: Optional[float] = (
+        float(os.getenv("EMBED_REQUESTS_PER_MINUTE")) if os.getenv("EMBED_REQUESTS_PER_MINUTE") else None
+    )
+    # PDF downloads run concurrently over one connection pool: total in flight, and per host
+    pdf_download_concurrency: int = int(os.getenv("PDF_DOWNLOAD_CONCURRENCY", "8"))
+    pdf_downloads_per_host: int = int(os.getenv("PDF_DOWNLOADS_PER_HOST", "4"))
+    # Worker processes extracting PDF page text (0 keeps it on the calling thread)
+    pdf_extract_workers: int = int(os.getenv("PDF_EXTRACT_WORKERS", str(DEFAULT_MAX_WORKERS)))
+    # PDF agent searches only the chunks of the PDF it is summarizing (concurrent dispatch)
+    pdf_scoped_retrieval: bool = os.getenv("PDF_SCOPED_RETRIEVAL", "true").lower() == "true"
+
     def _initialize_knowledge_base(self, agent_name: str, collection_name: str, urls: list = None):
         """Initialize the knowledge base for the specified agent."""
         try:
-            vector_db = ChromaDb(collection=collection_name, embedder=self.embedder)
-            vector_db.client.get_or_create_collection(collection_name)
+            vector_db = create_vector_db(self.vector_db_backend, collection_name, self.embedder)
+            vector_db.create()
             if agent_name == "pdf_agent":
                 return PDFUrlKnowledgeBase(
                     urls=urls or [],
@@ -36,18 +122,46 @@ class MultiSourceWorkflow(Workflow):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Forks its worker processes now, before the workflow's thread pools start
+        self.pdf_extractor = ParallelPDFExtractor(max_workers=self.pdf_extract_workers)
         self.embedder = GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY"))
+        if self.embedding_cache_enabled:
+            # Chunks embedded before (by any knowledge base sharing the cache) cost no API call
+            self.embedder = CachedEmbedder(self.embedder, EmbeddingCache(dtype=self.embedding_cache_dtype))
 
         # Initialize knowledge bases
         self.pdf_knowledge_base = self._initialize_knowledge_base(
             agent_name="pdf_agent",
             collection_name="pdf_content",
         )
+        self.embedding_pipeline = EmbeddingPipeline(
+            self.embedder,
+            batch_size=self.embed_batch_size,
+            max_concurrency=self.embed_concurrency,
+            rate_limiter=TokenBucket.per_minute(self.embed_requests_per_minute) if self.embed_requests_per_minute else None,
+        )
+        self.pdf_ingestor = IncrementalPDFIngestor(
+            self.pdf_knowledge_base,
+            embedding_pipeline=self.embedding_pipeline,
+            fetcher=PooledPDFFetcher(
+                max_connections=max(self.pdf_download_concurrency, self.pdf_downloads_per_host),
+                per_host=self.pdf_downloads_per_host,
+                max_workers=self.pdf_download_concurrency,
+            ),
+            extractor=self.pdf_extractor,
+        )
 
         # Create team
         self.team = create_multi_source_team(self.pdf_knowledge_base)
         self.podcast_conversation_team = self.team.members[-1]  # Podcast team is the last member
         self.mindmap_agent = self.team.members[-2]  # Mindmap agent is the second-to-last member
+        self.source_agents = {kind: self.team.members[index] for kind, index in SOURCE_AGENT_INDEX.items()}
+
+        if self.dispatch_mode not in DISPATCH_MODES:
+            logger.error(f"Invalid dispatch mode: {self.dispatch_mode}")
+            raise ValueError(f"Invalid dispatch mode: {self.dispatch_mode}. Expected one of {DISPATCH_MODES}")
+        # Shared, bounded pool for per-source work across all runs of this workflow
+        self.source_executor = ThreadPoolExecutor(max_workers=self.dispatch_max_workers, thread_name_prefix="source")
 
         # Initialize SQLite cache (inspired by agno's SqliteStorage)
         self.db_file = "tmp/workflow_cache.db"
@@ -58,162 +172,326 @@ class MultiSourceWorkflow(Workflow):
 
     def init_cache(self):
         """Initialize the SQLite cache database, following agno's SqliteStorage approach."""
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-
-        # Connect to the SQLite database
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-
-        # Create the cache table if it doesn't exist
-        cursor.execute(f'''
-            CREATE TABLE IF NOT EXISTS {self.table_name} (
-                prompt TEXT PRIMARY KEY,
-                response TEXT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        # The backend keeps one long-lived connection per thread, so get/save/evict
+        # no longer pay connection setup on every call.
+        # Entries are keyed by canonical_cache_key, so equivalent prompts share one row.
+        self.cache = SQLiteCacheBackend(self.db_file, self.table_name, key_fn=canonical_cache_key)
+        # Generated audio / mindmaps referenced from compact cache rows
+        self.artifact_store = ArtifactStore(os.path.join(os.path.dirname(self.db_file), "artifacts"))
+        # Per-source results (keyed by canonical URL + task) live in the same database
+        self.source_cache = SourceResultCache(self.cache)
+        # Optional paraphrase matching on top of the exact cache
+        self.semantic_cache = None
+        if self.semantic_cache_enabled:
+            self.semantic_cache = SemanticCache(
+                self.embedder, self.cache, threshold=self.semantic_cache_threshold
             )
-        ''')
-
-        # Enable Write-Ahead Logging for better concurrency
-        cursor.execute("PRAGMA journal_mode=WAL")
-
-        conn.commit()
-        conn.close()
+        # Eviction runs on a background thread, off the request path
+        self.cache_evictor = CacheEvictor(
+            self.cache,
+            policy=self.cache_eviction_policy,
+            ttl=timedelta(days=self.cache_ttl_days),
+            max_rows=self.cache_max_rows,
+            max_bytes=self.cache_max_bytes,
+            interval_seconds=self.cache_eviction_interval,
+            source_cache=self.source_cache,
+            artifact_store=self.artifact_store,
+            semantic_cache=self.semantic_cache,
+        )
+        self.cache_evictor.start()
+        # Coalesces concurrent identical runs (threads here, other workers via a lease row)
+        self.single_flight = SingleFlight(self.cache)
         logger.info(f"Initialized SQLite cache at {self.db_file} with table {self.table_name}")
 
     def get_cached_response(self, prompt: str) -> RunResponse:
         """Retrieve a cached response for the given prompt."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT response FROM {self.table_name} WHERE prompt = ?", (prompt,))
-        result = cursor.fetchone()
-        conn.close()
+        result = self.cache.get(prompt)
+        # Only an exact hit was counted; a semantic hit is read without touching the counters
+        exact_hit = bool(result)
+        if not result and self.semantic_cache is not None:
+            # Paraphrase of an earlier prompt with the same URLs?
+            try:
+                cache_key = self.semantic_cache.lookup(prompt)
+                if cache_key:
+                    result = self.cache.get_by_key(cache_key, prompt, record_stats=False)
+                    if result:
+                        logger.info(f"Semantic cache hit for prompt: {prompt}")
+                    else:
+                        self.semantic_cache.discard(cache_key)
+            except Exception as e:
+                logger.error(f"Semantic cache lookup failed; treating as a miss: {str(e)}")
+            logger.debug(f"Semantic cache stats: {self.semantic_cache.stats()}")
         if result:
             logger.info(f"Cache hit for prompt: {prompt}")
-            response_dict = json.loads(result[0])
+            try:
+                response_dict = decode_payload(result, self.artifact_store)
+            except MissingArtifactError as e:
+                return self._stale_hit(str(e), exact_hit)
             response = RunResponse(**response_dict)
             # Check if associated files exist (e.g., mindmap or audio)
-            if response.audio and not os.path.exists(response.audio):
-                logger.warning(f"Audio file {response.audio} not found; treating as cache miss")
-                return None
+            if isinstance(response.audio, str) and not os.path.exists(response.audio):
+                return self._stale_hit(f"Audio file {response.audio} not found", exact_hit)
             # For mindmap, check if the file exists (based on content message)
             if "mindmap_output.png" in response.content and not os.path.exists("mindmap_output.png"):
-                logger.warning("Mindmap file mindmap_output.png not found; treating as cache miss")
-                return None
+                return self._stale_hit("Mindmap file mindmap_output.png not found", exact_hit)
+            logger.debug(f"Cache stats: {self.cache.stats()}")
             return response
         logger.info(f"Cache miss for prompt: {prompt}")
         return None
 
+    def _stale_hit(self, reason: str, counted: bool) -> None:
+        """Treat a hit whose files are gone as a miss, correcting the counters if it was counted as a hit."""
+        logger.warning(f"{reason}; treating as cache miss")
+        if counted:
+            self.cache.record_stale_hit()
+        return None
+
     def save_to_cache(self, prompt: str, response: RunResponse):
         """Save a response to the cache."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute(
-            f"INSERT OR REPLACE INTO {self.table_name} (prompt, response) VALUES (?, ?)",
-            (prompt, json.dumps(response.to_dict()))
-        )
-        conn.commit()
-        conn.close()
+        if self.cache_payload_format == "compact":
+            payload = encode_payload(response, self.artifact_store)
+        else:
+            payload = json.dumps(response.to_dict())
+        # Referenced audio/mindmap files count toward the row's size for the byte budget
+        artifact_sizes = {ref: self.artifact_store.size(ref) for ref in artifact_refs(payload)}
+        self.cache.save(prompt, payload, artifact_sizes=artifact_sizes)
+        if self.semantic_cache is not None:
+            try:
+                self.semantic_cache.add(prompt, canonical_cache_key(prompt))
+            except Exception as e:
+                logger.warning(f"Failed to index prompt in semantic cache: {str(e)}")
         logger.debug(f"Saved response to cache for prompt: {prompt}")
 
     def evict_old_entries(self):
-        """Evict cache entries older than 7 days."""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        expiration_date = datetime.now() - timedelta(days=7)
-        cursor.execute(f"DELETE FROM {self.table_name} WHERE timestamp < ?", (expiration_date,))
-        conn.commit()
-        conn.close()
-        logger.debug("Evicted old cache entries")
+        """Run one eviction pass now (the background evictor normally does this)."""
+        evicted = self.cache_evictor.run_once()
+        logger.debug(f"Evicted cache entries: {evicted}. Eviction stats: {self.cache_evictor.stats()}")
+
+    def _route_source(self, kind: str, url: str) -> str:
+        """Summarize a single source by routing it through the team leader."""
+        task_instruction = (
+            f"Process content: {json.dumps({SOURCE_URL_FIELDS[kind]: [url]})}. "
+            f"Summarize this {SOURCE_LABELS[kind]} only. "
+            f"Route PDFs to PDF Processor, YouTube to YouTube Processor, webpages to Webpage Processor."
+        )
+        logger.debug(f"Routing source task: {task_instruction}")
+        response = self.team.run(task_instruction, stream_intermediate_steps=True)
+        return (response.content or "").strip() if response else ""
+
+    def _run_source_agent(self, kind: str, url: str, question: Optional[str] = None) -> str:
+        """Summarize a single source (or answer a question about it) with its processor agent, skipping the team leader."""
+        # Agents keep per-run state, so concurrent runs each get their own copy
+        agent = self.source_agents[kind].deep_copy()
+        if kind == "pdf" and self.pdf_scoped_retrieval:
+            # The shared pdf_content collection holds every PDF ever ingested
+            agent.retriever = self.pdf_ingestor.retriever([url])
+        if question:
+            response = agent.run(f"{question}\nAnswer from this {SOURCE_LABELS[kind]}: {url}")
+        else:
+            response = agent.run(f"Summarize this {SOURCE_LABELS[kind]}: {url}")
+        return (response.content or "").strip() if response else ""
+
+    def _accept_source_result(self, url: str, result: str, warnings: list) -> str:
+        """Cache a usable source result, or record a warning for a failed one."""
+        if not result or result.startswith(SOURCE_FAILURE_PREFIXES):
+            warnings.append(f"No usable result for {url}")
+            return result
+        self.source_cache.save(normalize_url(url), SOURCE_TASK, result)
+        return result
+
+    def process_source(self, kind: str, url: str, warnings: list) -> str:
+        """Process a single PDF, YouTube or web source via team routing and cache its result."""
+        try:
+            result = self._route_source(kind, url)
+        except Exception as e:
+            warnings.append(f"Failed to process {url}: {str(e)}")
+            return ""
+        return self._accept_source_result(url, result, warnings)
+
+    def process_sources(self, sources: list, warnings: list) -> dict:
+        """
+        Process the given (kind, url) sources and return their results by source.
+
+        In "concurrent" mode every source runs on the shared pool with its own timeout,
+        so a slow source does not hold up the others; results keep the input order.
+        """
+        if self.dispatch_mode == "route":
+            return {(kind, url): self.process_source(kind, url, warnings) for kind, url in sources}
+
+        calls = {(kind, url): (lambda kind=kind, url=url: self._run_source_agent(kind, url)) for kind, url in sources}
+        outcomes = run_with_timeouts(
+            self.source_executor, calls, self.source_timeout_seconds, self.source_total_timeout_seconds
+        )
+        results = {}
+        for (kind, url), (result, error) in outcomes.items():
+            if error is not None:
+                warnings.append(f"Failed to process {url}: {str(error)}")
+                results[(kind, url)] = ""
+            else:
+                results[(kind, url)] = self._accept_source_result(url, result, warnings)
+        return results
+
+    def answer_from_sources(self, sources: list, question: str, warnings: list) -> list:
+        """
+        Ask each source's processor agent the question, concurrently; returns the answers in source order.
+
+        Answers are specific to the question, so they are not cached per source.
+        """
+        calls = {
+            (kind, url): (lambda kind=kind, url=url: self._run_source_agent(kind, url, question))
+            for kind, url in sources
+        }
+        outcomes = run_with_timeouts(
+            self.source_executor, calls, self.source_timeout_seconds, self.source_total_timeout_seconds
+        )
+        answers = []
+        for (kind, url), (answer, error) in outcomes.items():
+            if error is not None:
+                warnings.append(f"Failed to answer from {url}: {str(error)}")
+            elif answer:
+                answers.append(answer)
+        return answers
 
     def run(self, prompt: str) -> RunResponse:
         '''Run the multi-source workflow with the given prompt.
         This method processes the prompt through a series of agents, handling URLs, PDFs, YouTube videos,
         web pages, and text. It also manages caching and error handling.
+        Concurrent runs of an equivalent prompt (same cache key) are coalesced, so only one of them
+        executes the agents and the others receive its result.
         Args:
             prompt (str): The input prompt containing URLs or text to be processed.
             Returns:
             RunResponse: The final response containing processed content, warnings, and any associated audio.
     '''
-        warnings = []
-        run_response = RunResponse(content="", audio=None)
-
         # Check cache first
         cached_response = self.get_cached_response(prompt)
         if cached_response:
             return cached_response
 
-        # Step 1: Route to URL Handler and correct with JSON Corrector
-        max_retries = 2
-        for attempt in range(max_retries + 1):
-            url_response = self.team.members[0].run(prompt)  # URL Handler
-            if not url_response or not url_response.content:
-                warnings.append(f"Attempt {attempt + 1}: Failed to process URLs: No response from URL Handler.")
-                if attempt < max_retries:
-                    continue
-                run_response.content = f"Failed to process input after {max_retries + 1} attempts. Warnings: {warnings}"
-                self.save_to_cache(prompt, run_response)
-                return run_response
+        cache_key = canonical_cache_key(prompt)
 
-            logger.debug(f"Attempt {attempt + 1}: Raw URL Handler response: {json.dumps(url_response.content, ensure_ascii=False)}")
+        def check_cache():
+            # Quiet probe first, so polling does not skew the hit-rate counters
+            if self.cache.get_by_key(cache_key, record_stats=False) is None:
+                return None
+            return self.get_cached_response(prompt)
 
-            corrector_response = self.team.members[1].run(url_response.content)  # JSON Corrector
-            logger.debug(f"Attempt {attempt + 1}: JSON Corrector response: {json.dumps(corrector_response.content, ensure_ascii=False)}")
+        return self.single_flight.do(cache_key, lambda: self.process_prompt(prompt), check_cache)
 
-            corrected_content = corrector_response.content
-            if corrected_content.startswith("```json\n") and corrected_content.endswith("\n```"):
-                corrected_content = corrected_content[8:-4].strip()
+    def process_prompt(self, prompt: str) -> RunResponse:
+        """Process an uncached prompt through the agents and cache the result."""
+        warnings = []
+        run_response = RunResponse(content="", audio=None)
 
-            try:
-                corrected_data = json.loads(corrected_content)
-                if not isinstance(corrected_data, dict) or any(key not in corrected_data for key in ["pdf_urls", "youtube_urls", "web_urls", "remaining_text", "errors"]):
-                    raise ValueError("Invalid JSON structure")
-                pdf_urls = corrected_data.get('pdf_urls', [])
-                youtube_urls = corrected_data.get('youtube_urls', [])
-                web_urls = corrected_data.get('web_urls', [])
-                remaining_text = corrected_data.get('remaining_text', prompt)
-                errors = corrected_data.get('errors', [])
-                if errors:
-                    warnings.extend(errors)
-                break
-            except (json.JSONDecodeError, ValueError) as e:
-                warnings.append(f"Attempt {attempt + 1}: Invalid JSON from JSON Corrector: {str(e)}")
-                if attempt < max_retries:
-                    continue
-                run_response.content = f"Failed to process input after {max_retries + 1} attempts due to invalid JSON. Warnings: {warnings}"
-                self.save_to_cache(prompt, run_response)
-                return run_response
-
-        # Step 2: Update knowledge bases with URLs and load
-        if pdf_urls:
-            try:
-                self.pdf_knowledge_base.urls = pdf_urls
-                self.pdf_knowledge_base.load(recreate=False)
-            except Exception as e:
-                warnings.append(f"Failed to load PDF URLs: {str(e)}")
+        # Step 1: Extract and classify URLs locally; the URL Handler and JSON Corrector
+        # agents only run when the local pass is not confident about the prompt.
+        extracted, issues = extract_urls_locally(prompt)
+        if not issues:
+            pdf_urls = extracted["pdf_urls"]
+            youtube_urls = extracted["youtube_urls"]
+            web_urls = extracted["web_urls"]
+            remaining_text = extracted["remaining_text"]
+            warnings.extend(extracted["errors"])
+        else:
+            logger.info(f"Local URL extraction not confident ({issues}); falling back to URL Handler agent")
+            max_retries = 2
+            for attempt in range(max_retries + 1):
+                url_response = self.team.members[0].run(prompt)  # URL Handler
+                if not url_response or not url_response.content:
+                    warnings.append(f"Attempt {attempt + 1}: Failed to process URLs: No response from URL Handler.")
+                    if attempt < max_retries:
+                        continue
+                    run_response.content = f"Failed to process input after {max_retries + 1} attempts. Warnings: {warnings}"
+                    self.save_to_cache(prompt, run_response)
+                    return run_response
+
+                logger.debug(f"Attempt {attempt + 1}: Raw URL Handler response: {json.dumps(url_response.content, ensure_ascii=False)}")
+
+                # Repair locally; the JSON Corrector agent only runs when that fails
+                corrected_data = repair_json(url_response.content)
+                if corrected_data is None:
+                    corrector_response = self.team.members[1].run(url_response.content)  # JSON Corrector
+                    logger.debug(f"Attempt {attempt + 1}: JSON Corrector response: {json.dumps(corrector_response.content, ensure_ascii=False)}")
+                    corrected_data = repair_json(corrector_response.content or "")
+
+                try:
+                    if corrected_data is None:
+                        raise ValueError("Invalid JSON structure")
+                    pdf_urls = corrected_data['pdf_urls']
+                    youtube_urls = corrected_data['youtube_urls']
+                    web_urls = corrected_data['web_urls']
+                    remaining_text = corrected_data['remaining_text']
+                    errors = corrected_data['errors']
+                    if errors:
+                        warnings.extend(errors)
+                    break
+                except (json.JSONDecodeError, ValueError) as e:
+                    warnings.append(f"Attempt {attempt + 1}: Invalid JSON from JSON Corrector: {str(e)}")
+                    if attempt < max_retries:
+                        continue
+                    run_response.content = f"Failed to process input after {max_retries + 1} attempts due to invalid JSON. Warnings: {warnings}"
+                    self.save_to_cache(prompt, run_response)
+                    return run_response
+
+        # Step 2: Reuse per-source results that earlier prompts already produced
+        sources = (
+            [("pdf", url) for url in pdf_urls]
+            + [("youtube", url) for url in youtube_urls]
+            + [("web", url) for url in web_urls]
+        )
+        source_results = {}
+        for kind, url in sources:
+            cached_result = self.source_cache.get(normalize_url(url), SOURCE_TASK)
+            if cached_result:
+                logger.info(f"Source cache hit for {kind} {url}")
+                source_results[(kind, url)] = cached_result
+        pending_sources = [source for source in sources if source not in source_results]
+
+        # Step 3: Load only the PDFs that still need processing
+        pending_pdf_urls = [url for kind, url in pending_sources if kind == "pdf"]
+        if pending_pdf_urls:
+            # Unchanged PDFs are skipped; changed ones only embed their new chunks
+            for url, status in self.pdf_ingestor.ingest(pending_pdf_urls).items():
+                if status == "failed":
+                    warnings.append(f"Failed to load PDF URL: {url}")
 
-        # Step 3: Process URLs and text via team routing
-        responses = []
-        if pdf_urls or youtube_urls or web_urls or remaining_text:
+        # Step 4: Process each unseen source on its own, so its result can be cached per URL
+        source_results.update(self.process_sources(pending_sources, warnings))
+        responses = [source_results[source] for source in sources if source_results.get(source)]
+
+        # Step 5: Handle the remaining request (question, podcast, mindmap) on top of the source results
+        if not sources and not remaining_text:
+            warnings.append("No valid content provided for processing.")
+        elif sources and is_trivial_request(remaining_text):
+            # A plain "summarize" is answered by the source results alone
+            pass
+        elif sources and self.dispatch_mode == "concurrent" and not is_team_request(remaining_text):
+            # Questions go to each source's agent directly; the PDF Processor searches the knowledge base
+            responses.extend(self.answer_from_sources(sources, remaining_text, warnings))
+        else:
+            # Text-only prompts, podcasts and mindmaps go through the team leader with the source
+            # URLs (so it can route to their processors) and the source results as context
             task_input = {
                 "pdf_urls": pdf_urls,
                 "youtube_urls": youtube_urls,
                 "web_urls": web_urls,
-                "remaining_text": remaining_text
+                "remaining_text": remaining_text,
             }
+            if responses:
+                task_input["source_results"] = responses
             task_instruction = (
                 f"Process content: {json.dumps(task_input)}. "
                 f"Route PDFs to PDF Processor, YouTube to YouTube Processor, webpages to Webpage Processor. "
-                f"Route text to Text Processor unless it’s a podcast or mindmap request."
+                f"Route text to Text Processor unless it’s a podcast or mindmap request. "
+                f"The source results are summaries of the URLs; use them as context and do not summarize the URLs again."
             )
             logger.debug(f"Routing task: {task_instruction}")
             response = self.team.run(task_instruction, stream_intermediate_steps=True)
+            # The routed answer is added after the source results rather than replacing them
             responses.append(response.content)
-        else:
-            warnings.append("No valid content provided for processing.")
 
-        # Step 4: Combine responses
-        combined_response = "\n\n".join([r.strip() for r in responses if r.strip()])
+        # Step 6: Combine responses
+        combined_response = "\n\n".join([r.strip() for r in responses if r and r.strip()])
         if not combined_response:
             run_response.content = f"No content processed. Warnings: {warnings}"
         else:
@@ -222,10 +500,7 @@ class MultiSourceWorkflow(Workflow):
         if warnings:
             logger.warning(f"\n\nWarnings: {warnings}")
 
-        # Save to cache before returning
+        # Save to cache before returning; eviction happens in the background
         self.save_to_cache(prompt, run_response)
 
-        # Periodically evict old entries (e.g., every run)
-        self.evict_old_entries()
-
         return run_response
\ No newline at end of file
@@ -6,6 +6,7 @@ It also includes an optional feature to generate a podcast from the combined sum
 """
 import os
 import re
+import sys
 import time
 import base64
 from uuid import uuid4
@@ -13,15 +14,14 @@ from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 from agno.tools.youtube import YouTubeTools
 from agno.agent import Agent, RunResponse
+from agno.media import AudioArtifact
 from agno.models.google import Gemini
-from agno.tools.eleven_labs import ElevenLabsTools
 from agno.tools.website import WebsiteTools
 from agno.team import Team
 from agno.workflow.workflow import Workflow
 from agno.utils.audio import write_audio_to_file
 from agno.utils.log import logger
 from agno.knowledge.pdf_url import PDFUrlKnowledgeBase, PDFUrlReader
-from agno.vectordb.chroma import ChromaDb
 from agno.embedder.google import GeminiEmbedder
 from agno.playground import Playground, serve_playground_app
 from openinference.instrumentation.agno import AgnoInstrumentor
@@ -30,11 +30,24 @@ from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExport
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 
+# Shared helpers from the MultiSource Application
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "MultiSource Application"))
+from utils.embedding_cache import CachedEmbedder  # noqa: E402
+from utils.numpy_vectordb import create_vector_db  # noqa: E402
+from utils.pdf_ingest import IncrementalPDFIngestor  # noqa: E402
+from utils.tts_backend import create_tts_backend  # noqa: E402
+from utils.tts_cache import CachedTTSBackend  # noqa: E402
+
 # Load environment variables from .env file
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 os.environ["ELEVEN_LABS_API_KEY"] = os.getenv("ELEVEN_LABS_API_KEY")
-embedder = GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY"))
+# Chunks embedded before (by any app sharing the embedding cache) are reused
+embedder = CachedEmbedder(GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY")))
+# Podcast audio comes from the TTS segment cache shared with l5-2.py and the MultiSource Application
+# when the same summary was spoken before; TTS_BACKEND=agent synthesizes through a Gemini agent
+PODCAST_VOICE_ID = "JBFqnCBsd6RMkjVDRZzb"
+podcast_tts = CachedTTSBackend(create_tts_backend(os.getenv("TTS_BACKEND", "direct"), os.getenv("ELEVEN_LABS_API_KEY")))
 
 # Set up Langfuse tracing
 LANGFUSE_AUTH = base64.b64encode(
@@ -91,17 +104,18 @@ class MultiSourceWorkflow(Workflow):
         youtube_agent (Agent): Agent for summarizing YouTube video transcripts.
         web_agent (Agent): Agent for summarizing webpage content.
         text_agent (Agent): Agent for summarizing plain text input.
-        podcast_agent (Agent): Agent for generating podcast audio from summaries.
         team (Team): Team coordinating the agents.
     """
 
     knowledge_base = PDFUrlKnowledgeBase(    
         urls=[],   # URLs will be dynamically updated based on user input
-        vector_db=ChromaDb(collection="pdf_content", embedder=embedder),
+        vector_db=create_vector_db(os.getenv("VECTOR_DB_BACKEND", "chroma"), "pdf_content", embedder),
         embedder=embedder,
         reader=PDFUrlReader(),
     )
-    
+    # Skips PDFs that were already ingested and unchanged since
+    pdf_ingestor = IncrementalPDFIngestor(knowledge_base)
+
     # Scrape the content of the given URL and return the raw text.
     scraper_agent = Agent(
         name="Content Scraper",
@@ -183,28 +197,6 @@ class MultiSourceWorkflow(Workflow):
         debug_mode=True,
     )
 
-    # Agent to generate podcast audio from summaries
-    podcast_agent = Agent(
-        name="Podcast Generator",
-        model=Gemini(),
-        tools=[
-            ElevenLabsTools(
-                api_key=os.getenv("ELEVEN_LABS_API_KEY"),
-                voice_id="JBFqnCBsd6RMkjVDRZzb",
-                model_id="eleven_multilingual_v2",
-                target_directory="audio_generations",
-            )
-        ],
-        instructions=[
-            "Convert the given text into engaging spoken audio.",
-            "Keep the audio natural and clear.",
-            "Use the ElevenLabsTools to convert the summary to audio.",
-            "You don't need to find the appropriate voice first, I already specified the voice to use.",
-            "Ensure the summary is within the 2000 character limit to avoid ElevenLabs API limits.",
-        ],
-        debug_mode=True,
-    )
-
     """
     A team of agents that processes and summarizes content from multiple sources (PDFs, YouTube videos, webpages, and text)
     and optionally generates a podcast from the combined summary.
@@ -218,7 +210,7 @@ class MultiSourceWorkflow(Workflow):
         share_member_interactions=True,
         show_tool_calls=True,
         monitoring=True,
-        members=[scraper_agent, pdf_agent, youtube_agent, web_agent, text_agent, podcast_agent],
+        members=[scraper_agent, pdf_agent, youtube_agent, web_agent, text_agent],
     )
 
     def __init__(self, *args, **kwargs):
@@ -344,9 +336,9 @@ class MultiSourceWorkflow(Workflow):
         for url in pdf_urls:
             # Scrape PDF content
             logger.info(f"Scraping PDF content: {url}")
-            PDFUrlKnowledgeBase.urls = [url]  # Update knowledge base with the current URL
-            self.knowledge_base.urls = PDFUrlKnowledgeBase.urls  # Update knowledge base with new URL
-            self.knowledge_base.load(recreate=False)  # Load the knowledge base with the new URL
+            # Load the PDF into the knowledge base unless it is already there and unchanged
+            if self.pdf_ingestor.ingest([url])[url] == "failed":
+                warnings.append(f"Failed to load PDF content from {url}.")
             logger.info(f"Summarizing PDF content from: {url}")
             summary = attempt_summarization(self.pdf_agent,f"Query the knowledge base to retrieve the content of the PDF at {url} and summarize it.", None, url)
             logger.info(f"PDF summary: {summary}")
@@ -420,24 +412,31 @@ class MultiSourceWorkflow(Workflow):
                 combined_summary = combined_summary[:1997] + "..."
                 logger.warning("Summary truncated to 2000 characters for ElevenLabs API compatibility.")
             
-            # Run the podcast agent with the combined summary
-            logger.debug(f"Input to podcast agent: {combined_summary}") 
-            podcast_response: RunResponse = self.podcast_agent.run(combined_summary)
-            logger.info(f"Podcast generation response: audio={'present' if podcast_response.audio else 'not present'}")
-            if podcast_response.audio:
-                logger.debug(f"Podcast audio details: {podcast_response.audio}")
-            else:
-                logger.debug("No audio returned by podcast agent.")
+            # Synthesize the combined summary (or read it from the TTS segment cache)
+            logger.debug(f"Input to podcast TTS: {combined_summary}")
+            podcast_audio = []
+            try:
+                audio_bytes = podcast_tts.synthesize(combined_summary, PODCAST_VOICE_ID)
+                if audio_bytes:
+                    podcast_audio = [AudioArtifact(
+                        id=str(uuid4()),
+                        base64_audio=base64.b64encode(audio_bytes).decode("utf-8"),
+                        mime_type="audio/mpeg",
+                    )]
+            except Exception as e:
+                logger.error(f"Podcast synthesis failed: {e}")
+            logger.info(f"Podcast generation response: audio={'present' if podcast_audio else 'not present'}, "
+                        f"TTS segment cache: {podcast_tts.stats()}")
             # If podcast audio is generated, save it to a file
-            if podcast_response.audio and len(podcast_response.audio) > 0:
+            if podcast_audio:
                 os.makedirs("audio_generations", exist_ok=True)
-                filename = f"audio_generations/podcast_{uuid4()}.wav"
+                filename = f"audio_generations/podcast_{uuid4()}.mp3"
                 try:
                     write_audio_to_file(
-                        audio=podcast_response.audio[0].base64_audio,
+                        audio=podcast_audio[0].base64_audio,
                         filename=filename,
                     )
-                    run_response.audio = podcast_response.audio
+                    run_response.audio = podcast_audio
                     run_response.metadata["podcast_file"] = filename
                     logger.info(f"Podcast audio saved at: {filename}")
                 except Exception as e:
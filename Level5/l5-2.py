@@ -3,13 +3,14 @@ Level 5 - Multi-Source Processor with Podcast Generation
 This module implements a multi-source content processing workflow that extracts information from PDFs, YouTube videos, webpages, and text inputs. 
 It generates a podcast conversation between two speakers based on the processed content.'''
 import os
+import sys
 import json
+import time
 from uuid import uuid4
 from dotenv import load_dotenv
 from agno.tools.youtube import YouTubeTools
 from agno.agent import Agent, RunResponse
 from agno.models.google import Gemini
-from agno.tools.eleven_labs import ElevenLabsTools
 from agno.tools.website import WebsiteTools
 from agno.team import Team
 from agno.workflow.workflow import Workflow
@@ -20,13 +21,26 @@ from agno.embedder.google import GeminiEmbedder
 from agno.playground import Playground, serve_playground_app
 from pydub import AudioSegment
 from io import BytesIO
-import base64
+
+# Shared helpers from the MultiSource Application
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "MultiSource Application"))
+from utils.conversation_stream import (  # noqa: E402
+    iter_conversation_segments,
+    parse_conversation_segments,
+    team_content_stream,
+)
+from utils.embedding_cache import CachedEmbedder  # noqa: E402
+from utils.mp3_splice import MP3SpliceError, splice_mp3  # noqa: E402
+from utils.tts_backend import create_tts_backend  # noqa: E402
+from utils.tts_cache import CachedTTSBackend  # noqa: E402
+from utils.tts_scheduler import TTSScheduler  # noqa: E402
 
 # Load environment variables
 load_dotenv()
 os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 os.environ["ELEVEN_LABS_API_KEY"] = os.getenv("ELEVEN_LABS_API_KEY")
-embedder = GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY"))
+# Chunks embedded before (by any app sharing the embedding cache) are reused
+embedder = CachedEmbedder(GeminiEmbedder(api_key=os.getenv("GOOGLE_API_KEY")))
 
 PDFUrlReader.separators = ["\n\n", "\n", ".", " "]
 
@@ -298,6 +312,17 @@ class MultiSourceWorkflow(Workflow):
             "SPEAKER_A": "JBFqnCBsd6RMkjVDRZzb",  # Male voice
             "SPEAKER_B": "21m00Tcm4TlvDq8ikWAM",  # Female voice (Rachel)
         }
+        # One TTS backend for all segments: TTS_BACKEND=direct (default) calls ElevenLabs directly,
+        # TTS_BACKEND=agent goes through a Gemini agent with ElevenLabsTools. Segments synthesized
+        # before (by any app sharing the TTS segment cache) are reused
+        self.tts = CachedTTSBackend(
+            create_tts_backend(os.getenv("TTS_BACKEND", "direct"), os.getenv("ELEVEN_LABS_API_KEY"))
+        )
+        # Segments start synthesizing while the conversation is still streaming in
+        self.tts_scheduler = TTSScheduler(
+            lambda text, speaker: self.generate_audio_segment(text, self.voice_configs[speaker], speaker),
+            max_concurrency=int(os.getenv("TTS_CONCURRENCY", "3")),
+        )
 
         # Initialize knowledge bases
         self.pdf_knowledge_base = self._initialize_knowledge_base(
@@ -310,19 +335,20 @@ class MultiSourceWorkflow(Workflow):
         
         logger.info(f"Team Configuration - Name: {self.team.name}, Mode: {self.team.mode}")
 
-    def generate_conversation(self, topic: str) -> str:
-        """Generate the podcast conversation between two speakers based on the given topic.
+    def generate_conversation(self, topic: str):
+        """Stream the podcast conversation between two speakers based on the given topic.
         Args:
-            topic (str): The topic for the podcast conversation.    
-        Returns:
-            str: The generated conversation formatted with speaker labels.
+            topic (str): The topic for the podcast conversation.
+        Yields:
+            str: Pieces of the conversation, formatted with speaker labels, as the team writes them.
         """
         print(f"🎙️ Generating conversation about: {topic}")
-        response = self.podcast_conversation_team.run(
+        events = self.podcast_conversation_team.run(
             f"Create a 30-second podcast episode about {topic}. "
-            f"Make it engaging and ensure both speakers participate equally."
+            f"Make it engaging and ensure both speakers participate equally.",
+            stream=True,
         )
-        return response.content if response else ""
+        yield from team_content_stream(events)
 
     def parse_conversation_segments(self, conversation: str) -> list:
         """Parse conversation into sequential segments with speaker identification.
@@ -330,46 +356,8 @@ class MultiSourceWorkflow(Workflow):
             conversation (str): The conversation text with speaker labels.
         Returns:
             list: A list of segments with speaker, text, and voice_id.
-        Raises:
-            ValueError: If the conversation format is invalid.
         """
-        segments = []
-        lines = conversation.split('\n')
-        current_speaker = None
-        current_text = ""
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("SPEAKER_A:"):
-                if current_speaker and current_text.strip():
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': current_text.strip(),
-                        'voice_id': self.voice_configs[current_speaker]
-                    })
-                current_speaker = "SPEAKER_A"
-                current_text = line.replace("SPEAKER_A:", "").strip()
-            elif line.startswith("SPEAKER_B:"):
-                if current_speaker and current_text.strip():
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': current_text.strip(),
-                        'voice_id': self.voice_configs[current_speaker]
-                    })
-                current_speaker = "SPEAKER_B"
-                current_text = line.replace("SPEAKER_B:", "").strip()
-            elif current_speaker and line:
-                current_text += " " + line
-
-        if current_speaker and current_text.strip():
-            segments.append({
-                'speaker': current_speaker,
-                'text': current_text.strip(),
-                'voice_id': self.voice_configs[current_speaker]
-            })
-
-        logger.debug(f"Parsed {len(segments)} segments: {segments}")
-        return segments
+        return parse_conversation_segments(conversation, self.voice_configs)
 
     def generate_audio_segment(self, text: str, voice_id: str, speaker_name: str) -> bytes:
         """Generate audio for a single segment.
@@ -383,25 +371,8 @@ class MultiSourceWorkflow(Workflow):
             RuntimeError: If audio generation fails.
         """
         logger.info(f"Generating audio for {speaker_name}: {text[:50]}...")
-        audio_agent = Agent(
-            name=f"Audio Generator - {speaker_name}",
-            model=Gemini(),
-            tools=[
-                ElevenLabsTools(
-                    api_key=os.getenv("ELEVEN_LABS_API_KEY"),
-                    voice_id=voice_id,
-                    model_id="eleven_multilingual_v2",
-                    target_directory="temp_audio"
-                )
-            ],
-            instructions=[
-                "Convert the provided text to speech using the assigned voice.",
-                "Generate clear, natural-sounding audio."
-            ]
-        )
-        response = audio_agent.run(f"Convert this text to speech: {text}")
-        if response.audio and len(response.audio) > 0:
-            audio_data = base64.b64decode(response.audio[0].base64_audio)
+        audio_data = self.tts.synthesize(text, voice_id)
+        if audio_data:
             return audio_data
         else:
             logger.error(f"Failed to generate audio for {speaker_name}: {text}")
@@ -417,6 +388,15 @@ class MultiSourceWorkflow(Workflow):
         Raises:
             RuntimeError: If combining audio segments fails.
         """
+        os.makedirs("final_podcast", exist_ok=True)
+        output_path = os.path.join("final_podcast", output_filename)
+        # Copy the segments' MP3 frames when they share one format; decode and re-encode otherwise
+        try:
+            splice_mp3(audio_segments, output_path, pause_ms=500)
+            logger.info(f"Combined audio saved to {output_path}")
+            return output_path
+        except MP3SpliceError as e:
+            logger.info(f"Cannot splice MP3 frames ({str(e)}); combining with pydub")
         combined = AudioSegment.empty()
         pause = AudioSegment.silent(duration=500)  # 500ms pause
         for i, audio_data in enumerate(audio_segments):
@@ -425,8 +405,6 @@ class MultiSourceWorkflow(Workflow):
                 combined += audio_segment
                 if i < len(audio_segments) - 1:
                     combined += pause
-        os.makedirs("final_podcast", exist_ok=True)
-        output_path = os.path.join("final_podcast", output_filename)
         combined.export(output_path, format="mp3")
         logger.info(f"Combined audio saved to {output_path}")
         return output_path
@@ -523,30 +501,32 @@ class MultiSourceWorkflow(Workflow):
             logger.debug(f"Processing podcast request with content: {combined_response}")
             # Use remaining_text as topic if no content was processed
             topic = combined_response or remaining_text
-            conversation = self.generate_conversation(topic)
-            if not conversation:
-                run_response.content += "\nFailed to generate podcast conversation."
-                logger.error("Failed to generate conversation")
-                return run_response
+            # Each segment is synthesized as soon as the next speaker label closes it
+            start = time.perf_counter()
+            segments = []
+
+            def parsed_segments():
+                for segment in iter_conversation_segments(self.generate_conversation(topic), self.voice_configs):
+                    segments.append(segment)
+                    print(f"Processing segment {len(segments)}")
+                    yield segment
 
-            # Log the generated conversation
-            print("✅ Conversation generated successfully")
-            segments = self.parse_conversation_segments(conversation)
+            def on_segment(index, audio):
+                if index == 0:
+                    print(f"🔊 First audio after {time.perf_counter() - start:.1f}s")
+
+            try:
+                audio_segments = self.tts_scheduler.synthesize_all(parsed_segments(), on_segment=on_segment)
+            except RuntimeError as e:
+                run_response.content += "\nFailed to generate podcast audio."
+                logger.error(f"Failed to generate podcast audio: {str(e)}")
+                return run_response
             if not segments:
                 run_response.content += "\nFailed to parse conversation segments."
                 logger.error("Failed to parse conversation segments")
                 return run_response
-            # Generate audio segments for each parsed conversation segment
-            print(f"Parsed {len(segments)} conversation segments")
-            audio_segments = []
-            for i, segment in enumerate(segments):
-                print(f"Processing segment {i+1}/{len(segments)}")
-                audio_data = self.generate_audio_segment(
-                    segment['text'],
-                    segment['voice_id'],
-                    segment['speaker']
-                )
-                audio_segments.append(audio_data)
+            print(f"✅ Conversation generated: {len(segments)} segments")
+            logger.info(f"TTS segment cache: {self.tts.stats()}")
 
             output_path = self.combine_audio_segments(
                 audio_segments,